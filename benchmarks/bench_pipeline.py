@@ -0,0 +1,307 @@
+"""
+Benchmark the ESP pipeline on synthetic inputs at increasing scale.
+
+Each benchmark builds synthetic inputs of ``scale`` rows (see
+``benchmarks/synthetic.py``) and times one pipeline entry point. Outputs are
+kept in an in-memory artifact store, and module paths are pointed at a
+temporary directory, so nothing under ``data/``, ``results/`` or ``.cache/`` is
+touched. Results are written as JSON to ``benchmarks/results/`` tagged with the
+git commit; ``--compare`` reports the ratio against an earlier run.
+
+Usage
+-----
+python -m benchmarks.bench_pipeline [--scales 100,1000,10000] [--only NAME ...]
+                                    [--repeat N] [--compare RESULTS.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from src.analysis import (
+    d1_directed_evolution_esp,
+    e1_nnt_summary,
+    e2_fda_summary,
+    f2_curve_fitting,
+    f3_visualizations,
+    master_esp_table,
+)
+from src.preprocessing import compile_fda_pivotal_trials, extract_thennt_nnt
+from src.utils import esp_uncertainty
+from src.utils.artifacts import ArtifactStore, activate
+from src.utils.esp_kernel import esp_batch
+from src.utils.fit_store import FitStore
+from src.utils.master_index import MasterIndex
+from src.utils.master_table_io import apply_master_schema
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks/results"
+DEFAULT_SCALES = (100, 1_000, 10_000)
+SEED = 20260202
+# Relative slowdown reported as a regression by --compare.
+REGRESSION_THRESHOLD = 1.2
+# Monte Carlo draws per row in the master-table benchmarks (scales with rows, not draws).
+MC_SAMPLES = 10_000
+# Real inputs the master builders read alongside the synthetic tables.
+STATIC_INPUTS = (
+    "data/domain_A_evolution/a2_major_transitions_esp_estimates.csv",
+    "data/domain_c_breeding/speed_breeding_data.json",
+    "data/domain_e/processed/e4_gene_therapy_cart_outcomes.csv",
+)
+
+
+@dataclass
+class BenchResult:
+    name: str
+    scale: int
+    repeat: int
+    best_s: float
+    median_s: float
+
+
+@contextmanager
+def _sandbox() -> Iterator[Path]:
+    """Redirect pipeline paths into a temporary tree and keep outputs in memory."""
+    with tempfile.TemporaryDirectory(prefix="esp-bench-") as tmp, ExitStack() as stack:
+        root = Path(tmp)
+        for rel in STATIC_INPUTS:
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(ROOT / rel, root / rel)
+        fit_store = FitStore(root / "fits.json", f2_curve_fitting.FIT_CODE_VERSION)
+        for target, attribute, value in (
+            (master_esp_table, "ROOT", root),
+            (f3_visualizations, "ROOT", root),
+            (f3_visualizations, "MANIFEST_PATH", root / "figures/manifest.json"),
+            (f3_visualizations, "FIGURE_CACHE_DIR", root / "figures/store"),
+            (f2_curve_fitting, "get_fit_store", lambda **_: fit_store),
+        ):
+            stack.enter_context(mock.patch.object(target, attribute, value))
+        stack.enter_context(activate(ArtifactStore(lambda path: False)))
+        yield root
+
+
+def _bench_apply_pcs(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    rows = synthetic.master_rows(scale, rng)
+    return lambda: master_esp_table._apply_pcs_assignments(rows)
+
+
+def _bench_build_master(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    from src.utils.artifacts import active_store
+
+    store = active_store()
+    share = max(scale // 5, 1)
+    (root / "data/domain_b").mkdir(parents=True, exist_ok=True)
+    (root / "data/domain_b/domestication_data.json").write_text(
+        json.dumps(synthetic.domestication_json(share, rng))
+    )
+    compute = d1_directed_evolution_esp.compute_esp
+    cimmyt = pd.read_csv(
+        ROOT / "results/tables/tbl01_cimmyt_esp.csv",
+        usecols=list(master_esp_table.CIMMYT_DTYPES),
+        dtype=master_esp_table.CIMMYT_DTYPES,
+    )
+    store.put(root / "results/tables/tbl01_cimmyt_esp.csv", cimmyt)
+    store.put(root / "results/tables/tbl_d1_directed_evolution_esp.csv", compute(synthetic.directed_evolution_outcomes(share, rng)))
+    store.put(root / "results/tables/tbl_d2_ml_guided_esp.csv", compute(synthetic.directed_evolution_outcomes(share, rng)))
+    store.put(root / "data/domain_e/processed/nnt_database.csv", synthetic.nnt_database(share, rng))
+    with mock.patch.object(compile_fda_pivotal_trials, "RAW_PATH", _write_csv(root, "fda_raw.csv", synthetic.fda_trial_extracts(share, rng))):
+        fda = compile_fda_pivotal_trials.compile_fda_pivotal_trials()
+    store.put(root / "data/domain_e/processed/fda_pivotal_trials.csv", fda.dropna(subset=["nnt"]))
+    return lambda: master_esp_table.build_master_table(samples=MC_SAMPLES)
+
+
+def _write_csv(root: Path, name: str, df: pd.DataFrame) -> Path:
+    path = root / name
+    df.to_csv(path, index=False)
+    return path
+
+
+def _bench_fit(fit_name: str) -> Callable[[int, np.random.Generator, Path], Callable[[], object]]:
+    def setup(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+        x, y = synthetic.trend_xy(scale, rng)
+        fit = getattr(f2_curve_fitting, fit_name)
+        if fit_name in ("fit_exponential", "fit_wright"):
+            return lambda: fit("Synthetic", x, y, rng=np.random.default_rng(SEED))
+        return lambda: fit("Synthetic", x, y)
+
+    return setup
+
+
+def _bench_compile_fda(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    raw = _write_csv(root, "fda_raw.csv", synthetic.fda_trial_extracts(scale, rng))
+
+    def run() -> object:
+        with mock.patch.object(compile_fda_pivotal_trials, "RAW_PATH", raw):
+            return compile_fda_pivotal_trials.compile_fda_pivotal_trials()
+
+    return run
+
+
+def _bench_esp_kernel(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    outcomes = synthetic.directed_evolution_outcomes(scale, rng)
+    trials = synthetic.fda_trial_extracts(scale, rng)
+    inputs = [
+        (outcomes["experiments_tested"], outcomes["successes"]),
+        (trials["treatment_n"], trials["treatment_response_count"]),
+        (trials["control_n"], trials["control_response_count"]),
+    ]
+    return lambda: esp_batch(inputs)
+
+
+def _bench_esp_uncertainty(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    outcomes = synthetic.directed_evolution_outcomes(scale, rng)
+    trials = outcomes["experiments_tested"].to_numpy()
+    params = np.column_stack([trials, np.minimum(outcomes["successes"].to_numpy() + 1, trials)])
+    return lambda: esp_uncertainty.sample_percentiles("binomial", params, MC_SAMPLES)
+
+
+def _bench_e1(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    from src.utils.artifacts import active_store
+
+    active_store().put(ROOT / "data/domain_e/processed/nnt_database.csv", synthetic.nnt_database(scale, rng))
+    return e1_nnt_summary.main
+
+
+def _bench_e2(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    from src.utils.artifacts import active_store
+
+    raw = _write_csv(root, "fda_raw.csv", synthetic.fda_trial_extracts(scale, rng))
+    with mock.patch.object(compile_fda_pivotal_trials, "RAW_PATH", raw):
+        fda = compile_fda_pivotal_trials.compile_fda_pivotal_trials()
+    active_store().put(e2_fda_summary.INPUT_PATH, fda)
+    return e2_fda_summary.summarize_fda_trials
+
+
+def _bench_thennt_extract(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    pages = synthetic.thennt_pages(scale, rng)
+
+    def run() -> object:
+        return [extract_thennt_nnt.extract_benefit_harm_rows(page) for page in pages]
+
+    return run
+
+
+def _bench_master_index(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    master = apply_master_schema(master_esp_table._apply_pcs_assignments(synthetic.master_rows(scale, rng)))
+
+    def run() -> object:
+        index = MasterIndex.build(master)
+        return index.select(Domain=["Medicine", "Breeding"], Quality_score=[4, 5], year_ce=(1900, 2000))
+
+    return run
+
+
+def _bench_figures(scale: int, rng: np.random.Generator, root: Path) -> Callable[[], object]:
+    master = apply_master_schema(master_esp_table._apply_pcs_assignments(synthetic.master_rows(scale, rng)))
+    df = f3_visualizations._add_time_columns(master)
+    return lambda: f3_visualizations.render_figures(df, workers=None, formats=("png",), dpi=72, force=True)
+
+
+BENCHMARKS: Dict[str, Callable[[int, np.random.Generator, Path], Callable[[], object]]] = {
+    "apply_pcs_assignments": _bench_apply_pcs,
+    "build_master_table": _bench_build_master,
+    "fit_exponential": _bench_fit("fit_exponential"),
+    "fit_wright": _bench_fit("fit_wright"),
+    "fit_logistic": _bench_fit("fit_logistic"),
+    "fit_piecewise": _bench_fit("fit_piecewise"),
+    "compile_fda_pivotal_trials": _bench_compile_fda,
+    "esp_kernel": _bench_esp_kernel,
+    "esp_uncertainty": _bench_esp_uncertainty,
+    "e1_nnt_summary": _bench_e1,
+    "e2_fda_summary": _bench_e2,
+    "thennt_extract": _bench_thennt_extract,
+    "master_index": _bench_master_index,
+    "figures": _bench_figures,
+}
+
+
+def run_benchmarks(names: Sequence[str], scales: Sequence[int], repeat: int) -> List[BenchResult]:
+    results = []
+    for scale in scales:
+        for name in names:
+            with _sandbox() as root:
+                run = BENCHMARKS[name](scale, np.random.default_rng(SEED), root)
+                times = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    run()
+                    times.append(time.perf_counter() - start)
+            result = BenchResult(name, scale, repeat, min(times), statistics.median(times))
+            print(f"{name:<28} {scale:>10,d}  best {result.best_s:9.4f} s  median {result.median_s:9.4f} s")
+            results.append(result)
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results: Sequence[BenchResult], output_dir: Path = RESULTS_DIR) -> Path:
+    commit = _git_commit()
+    payload = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": [asdict(result) for result in results],
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"bench-{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def compare(results: Sequence[BenchResult], baseline_path: Path) -> None:
+    """Print best-time ratios against a saved run; ratios above the threshold are flagged."""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(row["name"], row["scale"]): row["best_s"] for row in baseline["results"]}
+    print(f"\nvs {baseline_path.name} (commit {baseline.get('commit', '?')}):")
+    for result in results:
+        before: Optional[float] = previous.get((result.name, result.scale))
+        if not before:
+            continue
+        ratio = result.best_s / before
+        flag = "  REGRESSION" if ratio > REGRESSION_THRESHOLD else ""
+        print(f"{result.name:<28} {result.scale:>10,d}  {ratio:6.2f}x{flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ESP pipeline on synthetic data.")
+    parser.add_argument(
+        "--scales",
+        default=",".join(str(scale) for scale in DEFAULT_SCALES),
+        help="Comma-separated row counts (e.g. 100,10000,1000000).",
+    )
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best and median reported).")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR, help="Directory for result JSON.")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier result JSON to compare against.")
+    args = parser.parse_args()
+    scales = [int(float(scale)) for scale in args.scales.split(",") if scale.strip()]
+    results = run_benchmarks(args.only or list(BENCHMARKS), scales, args.repeat)
+    print(f"\nSaved {save_results(results, args.output_dir)}")
+    if args.compare is not None:
+        compare(results, args.compare)
@@ -0,0 +1,95 @@
+"""
+Benchmark TheNNT row extraction: the regex path the build uses vs the opt-in
+single-pass parser.
+
+Pages are read from a directory of saved HTML (for example the HTTP cache in
+``.cache/thennt``, whose ``*.body`` files are raw responses). Without a corpus,
+synthetic pages mimicking TheNNT markup are generated.
+
+Usage
+-----
+python -m benchmarks.bench_thennt_extract [--pages-dir DIR] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.preprocessing.extract_thennt_nnt import (
+    BENEFIT_HARM_LABELS,
+    CACHE_DIR,
+    extract_benefit_harm_rows,
+    extract_page_rows,
+)
+
+CHUNK_SIZE = 16_384
+
+
+def _synthetic_page(index: int, n_rows: int = 6, filler_kb: int = 120) -> str:
+    filler = "<p>Lorem ipsum dolor sit amet &amp; consectetur.</p>\n" * (filler_kb * 20)
+    sections = []
+    for label in BENEFIT_HARM_LABELS:
+        rows = "\n".join(
+            f'<div class="row__container">\n  <div><strong>{10 + index + row}</strong></div>\n'
+            f"  <div>Outcome {row} avoided over 5&nbsp;years &#8211; page {index}</div>\n</div>"
+            for row in range(n_rows)
+        )
+        sections.append(
+            f'<article class="ben_har ben_har_{label} card" id="s{label}">\n<h2>Section {label}</h2>\n'
+            f'<div class="info__container">{rows}</div>\n'
+            f"<!-- create info container but with % -->\n<div class=\"pct\">12%</div>\n</article>"
+        )
+    return f"<html><body>{filler}{''.join(sections)}{filler}</body></html>"
+
+
+def _load_corpus(pages_dir: Path) -> List[str]:
+    pages = []
+    for path in sorted(pages_dir.glob("*")):
+        if path.suffix not in {".html", ".htm", ".body"}:
+            continue
+        text = path.read_bytes().decode("utf-8", errors="ignore")
+        if "ben_har" in text:
+            pages.append(text)
+    return pages
+
+
+def _streaming_path(html: str) -> Dict[str, List[dict]]:
+    return extract_page_rows(html[start : start + CHUNK_SIZE] for start in range(0, len(html), CHUNK_SIZE))
+
+
+def _time(func: Callable[[str], Dict[str, List[dict]]], pages: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(pages_dir: Path = CACHE_DIR, repeat: int = 5, n_synthetic: int = 50) -> None:
+    pages = _load_corpus(pages_dir) if pages_dir.exists() else []
+    source = str(pages_dir)
+    if not pages:
+        pages = [_synthetic_page(index) for index in range(n_synthetic)]
+        source = f"{n_synthetic} synthetic pages"
+    mismatches = sum(extract_benefit_harm_rows(page) != _streaming_path(page) for page in pages)
+    total_mb = sum(len(page) for page in pages) / 1e6
+    regex_s = _time(extract_benefit_harm_rows, pages, repeat)
+    stream_s = _time(_streaming_path, pages, repeat)
+    print(f"corpus: {source} ({len(pages)} pages, {total_mb:.1f} MB)")
+    print(f"regex (2 scans/page):     {regex_s:.4f} s")
+    print(f"streaming (1 pass, {CHUNK_SIZE // 1024} KiB chunks): {stream_s:.4f} s")
+    print(f"pages with differing rows: {mismatches}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark TheNNT row extraction.")
+    parser.add_argument("--pages-dir", type=Path, default=CACHE_DIR, help="Directory of saved HTML pages.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported).")
+    parser.add_argument("--synthetic", type=int, default=50, help="Synthetic pages when no corpus exists.")
+    args = parser.parse_args()
+    main(pages_dir=args.pages_dir, repeat=args.repeat, n_synthetic=args.synthetic)
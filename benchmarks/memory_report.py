@@ -0,0 +1,70 @@
+"""
+Memory footprint of the master ESP table layouts at scale.
+
+Rows of the current master table are resampled to ``--rows`` rows and the
+deep memory usage (``DataFrame.memory_usage(deep=True)``) is reported for:
+
+- ``object``: the untyped layout the builder used to return (every column
+  ``object``, missing values as ``None``);
+- ``typed``: ``MASTER_SCHEMA`` dtypes (``apply_master_schema``);
+- ``compact``: ``compact_master_table`` (categoricals, ``log10_ESP`` with a
+  sparse exact-ESP override, without the columns derived from ``ESP`` and
+  ``PCS_score``).
+
+Usage
+-----
+python -m benchmarks.memory_report [--rows 1000000] [--per-column]
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.utils.master_table_io import apply_master_schema, compact_master_table, read_master_table
+
+DEFAULT_ROWS = 1_000_000
+SEED = 20260202
+MIB = 1 << 20
+
+
+def resample_master(rows: int, seed: int = SEED) -> pd.DataFrame:
+    """``rows`` rows drawn with replacement from the master table (typed)."""
+    master = read_master_table()
+    positions = np.random.default_rng(seed).integers(0, len(master), rows)
+    return master.iloc[positions].reset_index(drop=True)
+
+
+def layouts(typed: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    untyped = typed.astype(object)
+    untyped = untyped.where(pd.notna(untyped), None)
+    return {
+        "object": untyped,
+        "typed": apply_master_schema(typed),
+        "compact": compact_master_table(typed),
+    }
+
+
+def main(rows: int = DEFAULT_ROWS, per_column: bool = False) -> None:
+    frames = layouts(resample_master(rows))
+    usage = {name: df.memory_usage(index=False, deep=True) for name, df in frames.items()}
+    print(f"Master table layouts at {rows:,} rows")
+    print(f"{'layout':<10} {'columns':>8} {'MiB':>10} {'bytes/row':>10}")
+    for name, column_bytes in usage.items():
+        total = int(column_bytes.sum())
+        print(f"{name:<10} {len(column_bytes):>8} {total / MIB:>10.1f} {total / rows:>10.1f}")
+    if per_column:
+        table = pd.DataFrame({name: column_bytes / rows for name, column_bytes in usage.items()})
+        print("\nBytes per row by column")
+        print(table.round(2).fillna("-").to_string())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report master-table memory per row for each layout.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--per-column", action="store_true", help="Also break the figures down by column.")
+    args = parser.parse_args()
+    main(args.rows, args.per_column)
@@ -0,0 +1,182 @@
+"""
+Synthetic, scalable stand-ins for the ESP inputs.
+
+Each generator takes a row count and a ``numpy.random.Generator`` and returns
+data shaped like the real file it replaces, so the benchmark harness can run
+the pipeline code unchanged at 10^2 to 10^7 rows. (Domain, Subdomain) pairs
+are sampled from the real master table so PCS matching sees realistic keys.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_thennt_extract import _synthetic_page
+from src.utils.master_table_io import read_master_table
+
+THERAPEUTIC_AREAS = ["cardiovascular", "oncology", "infectious disease", "endocrine", "neurology", "respiratory"]
+FOLLOW_UP_BUCKETS = ["1yr", "5yr", "over_5yr", "missing"]
+# Share of each Time_period form in the synthetic mix (roughly the real table,
+# with more deep-time strings so the slow parser path is exercised).
+TIME_PERIOD_MIX = {
+    "year": 0.45,
+    "year_range": 0.15,
+    "ma_range": 0.08,
+    "ga_range": 0.05,
+    "bp": 0.10,
+    "kya_range": 0.07,
+    "modern": 0.05,
+    "unknown": 0.05,
+}
+
+
+def time_period_strings(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Free-text ``Time_period`` values in the mix of ``TIME_PERIOD_MIX``."""
+    kinds = rng.choice(list(TIME_PERIOD_MIX), size=n, p=list(TIME_PERIOD_MIX.values()))
+    out = np.empty(n, dtype=object)
+    start = rng.integers(1900, 2026, size=n)
+    span = rng.integers(1, 40, size=n)
+    deep = rng.uniform(0.1, 4.0, size=n).round(1)
+    for kind in TIME_PERIOD_MIX:
+        mask = kinds == kind
+        if not mask.any():
+            continue
+        if kind == "year":
+            values = start[mask].astype(str)
+        elif kind == "year_range":
+            values = [f"{a}-{min(a + b, 2026)}" for a, b in zip(start[mask], span[mask])]
+        elif kind == "ma_range":
+            values = [f"~{d * 100:.0f}-{d * 50:.0f} Ma" for d in deep[mask]]
+        elif kind == "ga_range":
+            values = [f"~{d:.1f}-{max(d - 0.5, 0.1):.1f} Ga" for d in deep[mask]]
+        elif kind == "bp":
+            values = [f"{b} BP" for b in rng.integers(3000, 12000, size=mask.sum())]
+        elif kind == "kya_range":
+            values = [f"{a}-{a + 13} kya" for a in rng.integers(10, 60, size=mask.sum())]
+        else:
+            values = [kind] * int(mask.sum())
+        out[mask] = values
+    return out
+
+
+def master_rows(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Pre-PCS master rows (the frame ``_apply_pcs_assignments`` receives)."""
+    pairs = read_master_table()[["Domain", "Subdomain"]].astype(str).drop_duplicates()
+    picks = pairs.iloc[rng.integers(0, len(pairs), size=n)].reset_index(drop=True)
+    log10_esp = rng.uniform(0.0, 12.0, size=n)
+    return pd.DataFrame(
+        {
+            "Domain": picks["Domain"],
+            "Subdomain": picks["Subdomain"],
+            "Time_period": time_period_strings(n, rng),
+            "ESP": 10.0**log10_esp,
+            "log10_ESP": log10_esp,
+            "Quality_score": rng.integers(1, 6, size=n),
+            "Source": "synthetic",
+        }
+    )
+
+
+def directed_evolution_outcomes(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Rows shaped like ``directed_evolution_outcomes.csv`` / ``ml_guided_design_outcomes.csv``."""
+    tested = np.round(10.0 ** rng.uniform(1.0, 7.0, size=n)).astype(int)
+    return pd.DataFrame(
+        {
+            "record_id": [f"SYN-DE-{i}" for i in range(n)],
+            "year": rng.integers(1990, 2026, size=n),
+            "method": "synthetic",
+            "experiments_tested": tested,
+            "successes": rng.integers(0, 50, size=n),
+            "doi": np.where(rng.random(n) < 0.8, "10.0000/synthetic", ""),
+            "source_url": "https://example.org/synthetic",
+            "data_quality_score": rng.integers(1, 6, size=n),
+        }
+    )
+
+
+def fda_trial_extracts(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Rows shaped like ``fda_pivotal_trials_extracted.csv`` (~25% single-arm)."""
+    treatment_n = rng.integers(20, 2000, size=n)
+    control_n = rng.integers(20, 2000, size=n).astype(float)
+    single_arm = rng.random(n) < 0.25
+    control_n[single_arm] = np.nan
+    treatment_rate = rng.uniform(0.2, 0.9, size=n)
+    control_rate = treatment_rate * rng.uniform(0.2, 0.95, size=n)
+    return pd.DataFrame(
+        {
+            "record_id": [f"SYN-FDA-{i}" for i in range(n)],
+            "year": rng.integers(1995, 2026, size=n),
+            "drug": "synthetic",
+            "indication": "synthetic indication",
+            "therapeutic_area": rng.choice(THERAPEUTIC_AREAS, size=n),
+            "trial_name": [f"SYN-TRIAL-{i}" for i in range(n)],
+            "trial_design": np.where(single_arm, "single-arm", "randomized controlled"),
+            "endpoint": "synthetic endpoint",
+            "treatment_n": treatment_n,
+            "control_n": control_n,
+            "treatment_response_count": np.round(treatment_n * treatment_rate),
+            "control_response_count": np.round(control_n * control_rate),
+            "response_rate_treatment": np.nan,
+            "response_rate_control": np.nan,
+            "response_rate_metric": "synthetic response",
+            "source_url": "https://example.org/synthetic",
+            "source_section": "synthetic",
+            "notes": "",
+            "data_quality_score": rng.integers(1, 6, size=n),
+        }
+    )
+
+
+def nnt_database(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Rows shaped like ``nnt_database.csv``."""
+    return pd.DataFrame(
+        {
+            "intervention": [f"Intervention {i}" for i in rng.integers(0, max(n // 5, 1), size=n)],
+            "condition": "synthetic",
+            "outcome": "synthetic outcome",
+            "follow_up_bucket": rng.choice(FOLLOW_UP_BUCKETS, size=n),
+            "nnt": np.round(10.0 ** rng.uniform(0.3, 3.5, size=n)),
+            "nnt_type": rng.choice(["benefit", "harm"], size=n),
+            "therapeutic_area": rng.choice(THERAPEUTIC_AREAS, size=n),
+            "year": rng.integers(2005, 2026, size=n),
+            "source_url": "https://example.org/synthetic",
+            "data_quality_score": rng.integers(1, 6, size=n),
+        }
+    )
+
+
+def thennt_pages(n_rows: int, rng: np.random.Generator, rows_per_section: int = 6) -> List[str]:
+    """Synthetic TheNNT pages holding about ``n_rows`` benefit/harm rows."""
+    n_pages = max(n_rows // (2 * rows_per_section), 1)
+    return [_synthetic_page(int(index), n_rows=rows_per_section, filler_kb=20) for index in range(n_pages)]
+
+
+def domestication_json(n: int, rng: np.random.Generator) -> Dict[str, Any]:
+    """A ``domestication_data.json`` document with ``n`` species."""
+    species: Dict[str, Any] = {}
+    estimates: Dict[str, Any] = {}
+    for index in range(n):
+        key = f"species_{index}"
+        if rng.random() < 0.7:
+            timeline = {"start_date_bp": int(rng.integers(3000, 12000))}
+        else:
+            timeline = {"genetic_estimate_kya": f"{int(rng.integers(10, 40))}-{int(rng.integers(40, 60))}"}
+        species[key] = {
+            "scientific_name": "Synthetica spp.",
+            "domestication_timeline": timeline,
+            "data_quality": {"timeline": int(rng.integers(1, 6)), "population": int(rng.integers(1, 6))},
+            "key_references": [{"authors": "Synthetic et al.", "year": 2026}],
+        }
+        log10_esp = float(rng.uniform(5.0, 10.0))
+        estimates[key] = {"log10_esp": round(log10_esp, 1), "esp": round(10.0**log10_esp)}
+    return {"species": species, "summary": {"esp_estimates": estimates}}
+
+
+def trend_xy(n: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted years and a noisy declining log10 ESP trend for the ``fit_*`` functions."""
+    x = np.sort(rng.uniform(1900.0, 2025.0, size=n))
+    y = 40.0 - 0.015 * x + rng.normal(0.0, 0.5, size=n)
+    return x, y
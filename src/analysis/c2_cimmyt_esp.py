@@ -3,13 +3,28 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 
+from src.utils.artifacts import write_table
+from src.utils.esp_kernel import esp_columns
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INPUT_PATH = PROJECT_ROOT / "data" / "domain_c" / "c2_cimmyt_inputs.csv"
 OUTPUT_PATH = PROJECT_ROOT / "results" / "tables" / "tbl01_cimmyt_esp.csv"
+INPUT_DTYPES = {
+    "program": str,
+    "period_start": "int64",
+    "period_end": "int64",
+    "crosses_per_year": "int64",
+    "years": "int64",
+    "progeny_per_cross": "int64",
+    "selection_cycles": "int64",
+    "released_varieties": "int64",
+    "data_quality": "int64",
+    "sources": str,
+    "notes": str,
+}
 
 
 def compute_esp(df: pd.DataFrame) -> pd.DataFrame:
@@ -24,23 +39,25 @@ def compute_esp(df: pd.DataFrame) -> pd.DataFrame:
     Returns
     -------
     pd.DataFrame
-        Dataframe with derived totals and ESP estimates.
+        Dataframe with derived totals, ESP estimates and ESP confidence bounds.
     """
     df = df.copy()
     df["total_crosses"] = df["crosses_per_year"] * df["years"]
     df["total_experiments"] = (
         df["total_crosses"] * df["progeny_per_cross"] * df["selection_cycles"]
     )
-    df["esp_breeding"] = df["total_experiments"] / df["released_varieties"]
-    df["log10_esp_breeding"] = np.log10(df["esp_breeding"])
+    for column, values in esp_columns(
+        df["total_experiments"], df["released_varieties"], name="esp_breeding"
+    ).items():
+        df[column] = values
     return df
 
 
 def main() -> None:
     """Load inputs, compute ESP values, and write the output table."""
-    df = pd.read_csv(INPUT_PATH)
+    df = pd.read_csv(INPUT_PATH, usecols=list(INPUT_DTYPES), dtype=INPUT_DTYPES)
     df_out = compute_esp(df)
-    df_out.to_csv(OUTPUT_PATH, index=False)
+    write_table(df_out, OUTPUT_PATH)
 
 
 if __name__ == "__main__":
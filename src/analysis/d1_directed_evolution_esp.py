@@ -3,13 +3,32 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 
+from src.utils.artifacts import write_table
+from src.utils.esp_kernel import esp_columns
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INPUT_PATH = PROJECT_ROOT / "data" / "domain_d" / "directed_evolution_outcomes.csv"
 OUTPUT_PATH = PROJECT_ROOT / "results" / "tables" / "tbl_d1_directed_evolution_esp.csv"
+INPUT_DTYPES = {
+    "record_id": str,
+    "year": "int64",
+    "paper_title": str,
+    "method": str,
+    "design_task": str,
+    "experiments_tested": "int64",
+    "successes": "int64",
+    "success_definition": str,
+    "domain": str,
+    "subdomain": str,
+    "notes": str,
+    "doi": str,
+    "pmcid": str,
+    "source_url": str,
+    "data_quality_score": "int64",
+}
 
 
 def compute_esp(df: pd.DataFrame) -> pd.DataFrame:
@@ -24,21 +43,21 @@ def compute_esp(df: pd.DataFrame) -> pd.DataFrame:
     Returns
     -------
     pd.DataFrame
-        Dataset with ESP and log10(ESP) columns added.
+        Dataset with ESP, log10(ESP) and ESP confidence bound columns added.
     """
     df = df.copy()
     df["experiments_tested"] = pd.to_numeric(df["experiments_tested"], errors="coerce")
     df["successes"] = pd.to_numeric(df["successes"], errors="coerce")
-    df["esp"] = df["experiments_tested"] / df["successes"]
-    df["log10_esp"] = np.log10(df["esp"])
+    for column, values in esp_columns(df["experiments_tested"], df["successes"]).items():
+        df[column] = values
     return df
 
 
 def main() -> None:
     """Load inputs, compute ESP values, and write the output table."""
-    df = pd.read_csv(INPUT_PATH)
+    df = pd.read_csv(INPUT_PATH, usecols=list(INPUT_DTYPES), dtype=INPUT_DTYPES)
     df_out = compute_esp(df)
-    df_out.to_csv(OUTPUT_PATH, index=False)
+    write_table(df_out, OUTPUT_PATH)
 
 
 if __name__ == "__main__":
@@ -1,77 +1,317 @@
+"""
+Summarize the historical NNT database by therapeutic area, follow-up and year.
+
+By default the database is loaded whole and the three tables are built by
+``src.utils.summaries`` from one factorization of the data. ``--streaming``
+reads it in chunks and folds each chunk into mergeable per-group aggregates
+(count, sum, min, max, a value histogram for the median, and distinct
+interventions) for all three groupings in one pass. Memory then scales with the number of groups and
+distinct NNT values rather than rows. ``--approximate`` bounds it further by
+log-binning NNT values for the median (within ``MEDIAN_RELATIVE_ERROR``) and
+counting distinct interventions with HyperLogLog sketches.
+"""
+
+import argparse
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from src.utils.artifacts import in_memory, read_table, write_table
+from src.utils.summaries import GroupSpec, summarize
 
-def main() -> None:
-    """Generate summary tables for the historical NNT database."""
-    root = Path(__file__).resolve().parents[2]
-    data_path = root / "data" / "domain_e" / "processed" / "nnt_database.csv"
-    summary_path = root / "results" / "tables" / "tbl_e1_nnt_summary_by_area.csv"
-    summary_time_path = (
-        root / "results" / "tables" / "tbl_e1_nnt_summary_by_area_time.csv"
-    )
-    trend_path = root / "results" / "tables" / "tbl_e1_nnt_by_year.csv"
+ROOT = Path(__file__).resolve().parents[2]
+DATA_PATH = ROOT / "data" / "domain_e" / "processed" / "nnt_database.csv"
+SUMMARY_PATH = ROOT / "results" / "tables" / "tbl_e1_nnt_summary_by_area.csv"
+SUMMARY_TIME_PATH = ROOT / "results" / "tables" / "tbl_e1_nnt_summary_by_area_time.csv"
+TREND_PATH = ROOT / "results" / "tables" / "tbl_e1_nnt_by_year.csv"
+
+CHUNK_SIZE = 250_000
+# Columns the summaries read; follow_up_bucket is optional. NNT and year are
+# read as text and coerced by ``_clean``, so junk values become missing.
+NNT_DTYPES = {
+    "intervention": str,
+    "therapeutic_area": str,
+    "follow_up_bucket": str,
+    "nnt": str,
+    "year": str,
+}
+NUMERIC_COLUMNS = ("nnt", "year")
+# Log-bin width for approximate medians: values are snapped to within 0.1%.
+MEDIAN_RELATIVE_ERROR = 1e-3
+# HyperLogLog precision: 2**12 registers per group, ~1.6% standard error.
+HLL_PRECISION = 12
 
-    df = pd.read_csv(data_path)
-    df["nnt"] = pd.to_numeric(df["nnt"], errors="coerce")
-    df["year"] = pd.to_numeric(df["year"], errors="coerce")
+
+def _clean(df: pd.DataFrame) -> pd.DataFrame:
+    for column in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[column], errors="coerce")
+        # Nullable integers keep whole-number NNTs and years as integers even
+        # when some are missing.
+        if values.dtype.kind == "f" and (values.dropna() % 1 == 0).all():
+            values = values.astype("Int64")
+        df[column] = values
     if "follow_up_bucket" in df.columns:
         df["follow_up_bucket"] = df["follow_up_bucket"].fillna("missing")
+    return df
 
-    summary = (
-        df.groupby("therapeutic_area", dropna=False)
-        .agg(
-            n_entries=("nnt", "count"),
-            n_unique_interventions=("intervention", "nunique"),
-            nnt_mean=("nnt", "mean"),
-            nnt_median=("nnt", "median"),
-            nnt_min=("nnt", "min"),
-            nnt_max=("nnt", "max"),
-            year_min=("year", "min"),
-            year_max=("year", "max"),
-        )
-        .reset_index()
-    )
-    summary["nnt_mean"] = summary["nnt_mean"].round(2)
-    summary["nnt_median"] = summary["nnt_median"].round(2)
-    summary.to_csv(summary_path, index=False)
 
-    if "follow_up_bucket" in df.columns:
-        summary_time = (
-            df.groupby(["therapeutic_area", "follow_up_bucket"], dropna=False)
-            .agg(
-                n_entries=("nnt", "count"),
-                n_unique_interventions=("intervention", "nunique"),
-                nnt_mean=("nnt", "mean"),
-                nnt_median=("nnt", "median"),
-                nnt_min=("nnt", "min"),
-                nnt_max=("nnt", "max"),
-                year_min=("year", "min"),
-                year_max=("year", "max"),
+def _area_stats() -> Dict[str, tuple]:
+    return {
+        "n_entries": ("nnt", "count"),
+        "n_unique_interventions": ("intervention", "nunique"),
+        "nnt_mean": ("nnt", "mean"),
+        "nnt_median": ("nnt", "median"),
+        "nnt_min": ("nnt", "min"),
+        "nnt_max": ("nnt", "max"),
+        "year_min": ("year", "min"),
+        "year_max": ("year", "max"),
+    }
+
+
+ROUNDING = {"nnt_mean": 2, "nnt_median": 2}
+SUMMARY_SPECS = {
+    "area": GroupSpec("area", ["therapeutic_area"], _area_stats(), dropna=False, round=ROUNDING),
+    "area_time": GroupSpec(
+        "area_time", ["therapeutic_area", "follow_up_bucket"], _area_stats(), dropna=False, round=ROUNDING
+    ),
+    "year": GroupSpec(
+        "year",
+        ["year"],
+        {
+            "n_entries": ("nnt", "count"),
+            "nnt_mean": ("nnt", "mean"),
+            "nnt_median": ("nnt", "median"),
+            "nnt_min": ("nnt", "min"),
+            "nnt_max": ("nnt", "max"),
+        },
+        dropna=False,
+        round=ROUNDING,
+    ),
+}
+
+
+def summarize_nnt(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Build the by-area, by-area-and-follow-up and by-year tables in memory."""
+    df = _clean(df)
+    specs = [spec for name, spec in SUMMARY_SPECS.items() if name != "area_time" or "follow_up_bucket" in df.columns]
+    return summarize(df, specs)
+
+
+def _snap_log(values: pd.Series, relative_error: float) -> pd.Series:
+    """Snap positive values to a log grid so the histogram has bounded size."""
+    step = np.log1p(relative_error)
+    positive = values > 0
+    snapped = values.astype(float)
+    snapped[positive] = np.exp(np.round(np.log(values[positive]) / step) * step)
+    return snapped
+
+
+def _hll_registers(keys: pd.DataFrame, items: pd.Series, precision: int) -> pd.DataFrame:
+    """Per-group HyperLogLog register maxima for one chunk."""
+    present = items.notna().to_numpy()
+    hashed = pd.util.hash_array(items[present].astype(str).to_numpy(dtype=object))
+    value_bits = 64 - precision
+    register = (hashed >> np.uint64(value_bits)).astype(np.int64)
+    remainder = hashed & np.uint64((1 << value_bits) - 1)
+    # Rank = position of the leftmost 1-bit in the remaining bits (1-based).
+    bit_length = np.frexp(remainder.astype(np.float64))[1]
+    rank = (value_bits - bit_length + 1).astype(np.int64)
+    frame = keys[present].reset_index(drop=True).assign(register=register, rank=rank)
+    return frame.groupby(list(keys.columns) + ["register"], dropna=False, as_index=False)["rank"].max()
+
+
+def _hll_estimate(registers: pd.DataFrame, keys: List[str], precision: int) -> pd.DataFrame:
+    m = 1 << precision
+    alpha = 0.7213 / (1.0 + 1.079 / m)
+    registers = registers.assign(inverse=np.exp2(-registers["rank"].astype(float)))
+    grouped = registers.groupby(keys, dropna=False).agg(filled=("register", "size"), inverse=("inverse", "sum"))
+    zeros = m - grouped["filled"]
+    raw = alpha * m * m / (grouped["inverse"] + zeros)
+    # Linear counting is more accurate while many registers are still empty.
+    with np.errstate(divide="ignore"):
+        linear = m * np.log(m / zeros.where(zeros > 0))
+    estimate = raw.where((raw > 2.5 * m) | (zeros == 0), linear)
+    return estimate.round().astype("int64").rename("n_unique_interventions").reset_index()
+
+
+class StreamingGroupSummary:
+    """
+    Mergeable NNT aggregates for one grouping, folded in chunk by chunk.
+
+    Parameters
+    ----------
+    keys : list of str
+        Grouping columns.
+    distinct : bool
+        Track distinct interventions per group.
+    years : bool
+        Track the year range per group.
+    approximate : bool
+        Log-bin values for the median and use HyperLogLog for distinct counts.
+    """
+
+    def __init__(self, keys: List[str], distinct: bool, years: bool, approximate: bool = False) -> None:
+        self.keys = keys
+        self.distinct = distinct
+        self.years = years
+        self.approximate = approximate
+        self._stats: Optional[pd.DataFrame] = None
+        self._hist: Optional[pd.Series] = None
+        self._distinct: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        keys = self.keys
+        aggregations = {
+            "count": ("nnt", "count"),
+            "sum": ("nnt", "sum"),
+            "min": ("nnt", "min"),
+            "max": ("nnt", "max"),
+        }
+        if self.years:
+            aggregations.update(year_min=("year", "min"), year_max=("year", "max"))
+        stats = chunk.groupby(keys, dropna=False).agg(**aggregations)
+        if self._stats is not None:
+            stats = pd.concat([self._stats, stats]).groupby(level=keys, dropna=False).agg(
+                {"count": "sum", "sum": "sum", "min": "min", "max": "max", **self._year_merge()}
             )
-            .reset_index()
-        )
-        summary_time["nnt_mean"] = summary_time["nnt_mean"].round(2)
-        summary_time["nnt_median"] = summary_time["nnt_median"].round(2)
-        summary_time.to_csv(summary_time_path, index=False)
-
-    trend = (
-        df.groupby("year", dropna=False)
-        .agg(
-            n_entries=("nnt", "count"),
-            nnt_mean=("nnt", "mean"),
-            nnt_median=("nnt", "median"),
-            nnt_min=("nnt", "min"),
-            nnt_max=("nnt", "max"),
-        )
-        .reset_index()
-        .sort_values("year")
+        self._stats = stats
+
+        values = chunk.loc[chunk["nnt"].notna(), keys + ["nnt"]]
+        if self.approximate:
+            values = values.assign(nnt=_snap_log(values["nnt"], MEDIAN_RELATIVE_ERROR))
+        hist = values.groupby(keys + ["nnt"], dropna=False).size()
+        if self._hist is not None:
+            hist = pd.concat([self._hist, hist]).groupby(level=keys + ["nnt"], dropna=False).sum()
+        self._hist = hist
+
+        if self.distinct:
+            if self.approximate:
+                part = _hll_registers(chunk[keys], chunk["intervention"], HLL_PRECISION)
+                if self._distinct is not None:
+                    part = (
+                        pd.concat([self._distinct, part])
+                        .groupby(keys + ["register"], dropna=False, as_index=False)["rank"]
+                        .max()
+                    )
+            else:
+                part = chunk[keys + ["intervention"]].drop_duplicates()
+                if self._distinct is not None:
+                    part = pd.concat([self._distinct, part]).drop_duplicates()
+            self._distinct = part
+
+    def _year_merge(self) -> Dict[str, str]:
+        return {"year_min": "min", "year_max": "max"} if self.years else {}
+
+    def _medians(self) -> pd.DataFrame:
+        keys = self.keys
+        hist = self._hist.rename("n").reset_index().sort_values(keys + ["nnt"], kind="stable")
+        grouped = hist.groupby(keys, dropna=False)["n"]
+        cumulative = grouped.cumsum()
+        total = grouped.transform("sum")
+        before = cumulative - hist["n"]
+        # Even counts average the two middle values, as pandas' median does.
+        lower = hist[(before <= (total - 1) // 2) & (cumulative > (total - 1) // 2)]
+        upper = hist[(before <= total // 2) & (cumulative > total // 2)]
+        medians = lower[keys].reset_index(drop=True)
+        medians["nnt_median"] = (lower["nnt"].to_numpy() + upper["nnt"].to_numpy()) / 2.0
+        return medians
+
+    def result(self) -> pd.DataFrame:
+        keys = self.keys
+        stats = self._stats.reset_index()
+        table = stats[keys].copy()
+        table["n_entries"] = stats["count"].astype("int64")
+        if self.distinct:
+            if self.approximate:
+                distinct = _hll_estimate(self._distinct, keys, HLL_PRECISION)
+            else:
+                distinct = (
+                    self._distinct.groupby(keys, dropna=False)["intervention"]
+                    .nunique()
+                    .rename("n_unique_interventions")
+                    .reset_index()
+                )
+            table = table.merge(distinct, on=keys, how="left")
+            table["n_unique_interventions"] = table["n_unique_interventions"].fillna(0).astype("int64")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table["nnt_mean"] = (stats["sum"] / stats["count"].where(stats["count"] > 0)).round(2).to_numpy()
+        table = table.merge(self._medians(), on=keys, how="left")
+        table["nnt_median"] = table["nnt_median"].round(2)
+        table["nnt_min"] = stats["min"].to_numpy()
+        table["nnt_max"] = stats["max"].to_numpy()
+        if self.years:
+            table["year_min"] = stats["year_min"].to_numpy()
+            table["year_max"] = stats["year_max"].to_numpy()
+        return table.sort_values(keys, kind="stable").reset_index(drop=True)
+
+
+def _nnt_column(column: str) -> bool:
+    return column in NNT_DTYPES
+
+
+def _iter_chunks(path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield ``path`` in chunks, slicing the in-memory table when one is published."""
+    if in_memory(path):
+        df = read_table(path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start : start + chunksize].copy()
+        return
+    yield from pd.read_csv(
+        path,
+        usecols=_nnt_column,
+        dtype=NNT_DTYPES,
+        chunksize=chunksize,
+        float_precision="round_trip",
     )
-    trend["nnt_mean"] = trend["nnt_mean"].round(2)
-    trend["nnt_median"] = trend["nnt_median"].round(2)
-    trend.to_csv(trend_path, index=False)
+
+
+def summarize_nnt_streaming(
+    chunks: Iterable[pd.DataFrame],
+    approximate: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Build the same tables as ``summarize_nnt`` in a single pass over ``chunks``.
+
+    With ``approximate=False`` the results equal ``summarize_nnt`` (up to
+    floating-point summation order in the means).
+    """
+    groupings: Dict[str, StreamingGroupSummary] = {}
+    for chunk in chunks:
+        chunk = _clean(chunk)
+        if not groupings:
+            groupings["area"] = StreamingGroupSummary(["therapeutic_area"], True, True, approximate)
+            if "follow_up_bucket" in chunk.columns:
+                groupings["area_time"] = StreamingGroupSummary(
+                    ["therapeutic_area", "follow_up_bucket"], True, True, approximate
+                )
+            groupings["year"] = StreamingGroupSummary(["year"], False, False, approximate)
+        for grouping in groupings.values():
+            grouping.update(chunk)
+    return {name: grouping.result() for name, grouping in groupings.items()}
+
+
+def main(streaming: bool = False, chunksize: int = CHUNK_SIZE, approximate: bool = False) -> None:
+    """Generate summary tables for the historical NNT database."""
+    if streaming:
+        tables = summarize_nnt_streaming(_iter_chunks(DATA_PATH, chunksize), approximate=approximate)
+    else:
+        tables = summarize_nnt(read_table(DATA_PATH, usecols=_nnt_column, dtype=NNT_DTYPES))
+    write_table(tables["area"], SUMMARY_PATH)
+    if "area_time" in tables:
+        write_table(tables["area_time"], SUMMARY_TIME_PATH)
+    write_table(tables["year"], TREND_PATH)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--streaming", action="store_true", help="Aggregate the database chunk by chunk.")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="Rows per chunk in streaming mode.")
+    parser.add_argument(
+        "--approximate",
+        action="store_true",
+        help="Bounded-memory sketches for medians and distinct interventions (streaming only).",
+    )
+    args = parser.parse_args()
+    main(streaming=args.streaming, chunksize=args.chunksize, approximate=args.approximate)
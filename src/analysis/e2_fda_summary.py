@@ -1,44 +1,52 @@
-import pandas as pd
+from src.utils.artifacts import read_table
+from src.utils.summaries import GroupSpec, write_summaries
 
 INPUT_PATH = "data/domain_e/processed/fda_pivotal_trials.csv"
 OUT_TRIAL_SIZES = "results/tables/tbl_e2_fda_trial_sizes_by_year.csv"
 OUT_NNT_BY_AREA = "results/tables/tbl_e2_fda_nnt_by_area.csv"
+INPUT_DTYPES = {
+    "record_id": str,
+    "year": "Int64",
+    "therapeutic_area": str,
+    "total_n": "float64",
+    "nnt": "float64",
+}
+
+SUMMARY_SPECS = [
+    GroupSpec(
+        "trial_sizes",
+        ["year"],
+        {
+            "n_trials": ("record_id", "count"),
+            "mean_total_n": ("total_n", "mean"),
+            "median_total_n": ("total_n", "median"),
+            "min_total_n": ("total_n", "min"),
+            "max_total_n": ("total_n", "max"),
+        },
+        require=["total_n"],
+        path=OUT_TRIAL_SIZES,
+    ),
+    GroupSpec(
+        "nnt_by_area",
+        ["therapeutic_area"],
+        {
+            "n_trials": ("record_id", "count"),
+            "mean_nnt": ("nnt", "mean"),
+            "median_nnt": ("nnt", "median"),
+            "min_nnt": ("nnt", "min"),
+            "max_nnt": ("nnt", "max"),
+        },
+        require=["nnt"],
+        path=OUT_NNT_BY_AREA,
+    ),
+]
 
 
 def summarize_fda_trials() -> None:
     """
     Generate summary tables for FDA pivotal trial sizes and NNT values.
     """
-    df = pd.read_csv(INPUT_PATH)
-
-    trial_sizes = (
-        df.dropna(subset=["total_n"])
-        .groupby("year", as_index=False)
-        .agg(
-            n_trials=("record_id", "count"),
-            mean_total_n=("total_n", "mean"),
-            median_total_n=("total_n", "median"),
-            min_total_n=("total_n", "min"),
-            max_total_n=("total_n", "max"),
-        )
-        .sort_values("year")
-    )
-
-    nnt_by_area = (
-        df.dropna(subset=["nnt"])
-        .groupby("therapeutic_area", as_index=False)
-        .agg(
-            n_trials=("record_id", "count"),
-            mean_nnt=("nnt", "mean"),
-            median_nnt=("nnt", "median"),
-            min_nnt=("nnt", "min"),
-            max_nnt=("nnt", "max"),
-        )
-        .sort_values("therapeutic_area")
-    )
-
-    trial_sizes.to_csv(OUT_TRIAL_SIZES, index=False)
-    nnt_by_area.to_csv(OUT_NNT_BY_AREA, index=False)
+    write_summaries(read_table(INPUT_PATH, usecols=list(INPUT_DTYPES), dtype=INPUT_DTYPES), SUMMARY_SPECS)
 
 
 if __name__ == "__main__":
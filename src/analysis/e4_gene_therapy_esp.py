@@ -3,13 +3,32 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 
+from src.utils.artifacts import write_table
+from src.utils.esp_kernel import esp_kernel
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INPUT_PATH = PROJECT_ROOT / "data" / "domain_e" / "processed" / "e4_gene_therapy_cart_outcomes.csv"
 OUTPUT_PATH = PROJECT_ROOT / "results" / "tables" / "tbl_e4_gene_therapy_esp.csv"
+INPUT_DTYPES = {
+    "intervention": str,
+    "modality": str,
+    "indication": str,
+    "trial": str,
+    "study_id": str,
+    "endpoint": str,
+    "n_treated": "int64",
+    "responders_n": "int64",
+    "response_rate": "float64",
+    "esp": "float64",
+    "year": "int64",
+    "source": str,
+    "source_url": str,
+    "data_quality_score": "int64",
+    "notes": str,
+}
 
 
 def compute_gene_therapy_esp(df: pd.DataFrame) -> pd.DataFrame:
@@ -24,26 +43,27 @@ def compute_gene_therapy_esp(df: pd.DataFrame) -> pd.DataFrame:
     Returns
     -------
     pd.DataFrame
-        Dataset with computed response rates and ESP values.
+        Dataset with computed response rates, ESP values and ESP confidence bounds.
     """
     df = df.copy()
     df["n_treated"] = pd.to_numeric(df["n_treated"], errors="coerce")
     df["responders_n"] = pd.to_numeric(df["responders_n"], errors="coerce")
 
-    response_rate = df["responders_n"] / df["n_treated"]
-    df["response_rate"] = df["response_rate"].fillna(response_rate)
-
-    df["esp"] = df["n_treated"] / df["responders_n"].replace(0, np.nan)
-    df["log10_esp"] = np.log10(df["esp"])
+    esp = esp_kernel(df["n_treated"], df["responders_n"])
+    df["response_rate"] = df["response_rate"].fillna(pd.Series(esp["success_rate"], index=df.index))
+    df["esp"] = esp["esp"]
+    df["log10_esp"] = esp["log10_esp"]
+    df["esp_ci_low"] = esp["esp_ci_low"]
+    df["esp_ci_high"] = esp["esp_ci_high"]
     return df
 
 
 def main() -> None:
     """Load inputs, compute ESP values, and write the output table."""
-    df = pd.read_csv(INPUT_PATH)
+    df = pd.read_csv(INPUT_PATH, usecols=list(INPUT_DTYPES), dtype=INPUT_DTYPES)
     df_out = compute_gene_therapy_esp(df)
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df_out.to_csv(OUTPUT_PATH, index=False)
+    write_table(df_out, OUTPUT_PATH)
 
 
 if __name__ == "__main__":
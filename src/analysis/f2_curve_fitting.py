@@ -7,21 +7,76 @@ results/tables/tbl_f2_analysis_dataset.csv
 results/tables/tbl_f2_model_fits.csv
 results/tables/tbl_f2_piecewise_fits.csv
 results/tables/tbl_f2_extrapolations.csv
+
+Every fit is also written to the shared fit store (``src/utils/fit_store.py``)
+so figures can reuse it. ``--hierarchical`` adds the pooled cross-domain model
+(``fit_hierarchical``) to the model table and writes
+results/tables/tbl_f2_hierarchical_diagnostics.csv.
 """
 
 from __future__ import annotations
 
+import argparse
 import math
-import re
-from dataclasses import dataclass
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from src.utils.artifacts import write_table
+from src.utils.ensemble_sampler import gelman_rubin, integrated_autocorr_time, run_ensembles
+from src.utils.fit_store import FitStore, dataset_hash, get_fit_store, source_hash
+from src.utils.master_index import MasterIndex
+from src.utils.master_table_io import (
+    expand_master_table,
+    master_table_available,
+    read_master_index,
+    read_master_table,
+)
+from src.utils.time_periods import parse_time_periods
+from src.utils.tracing import traced
+
 ROOT = Path(__file__).resolve().parents[2]
-RNG = np.random.default_rng(20260202)
+SEED = 20260202
+RNG = np.random.default_rng(SEED)
+N_BOOT = 500
+# Fewest dated points per domain for a fit (with some spread in year).
+MIN_FIT_POINTS = 5
+# Without an explicit worker count, fits use a process pool only from this many
+# rows: below it, pool start-up (~0.05-0.1 s) costs more than the serial fits.
+PARALLEL_MIN_ROWS = 10_000
+# Stored fits are keyed by this module's source, so editing the fitting code
+# invalidates them.
+FIT_CODE_VERSION = source_hash(Path(__file__))
+# Upper bound on array elements held in memory per vectorized chunk.
+MAX_CHUNK_ELEMENTS = 2_000_000
+LOGISTIC_GRID_SIZE = 25
+LOGISTIC_K_BOUNDS = (1e-4, 1e-1)
+LOGISTIC_TOL = 1e-10
+LOGISTIC_MAX_ITER = 200
+# Logistic fits that end within this relative distance of a bound (or with x0
+# this close to the data edge), or whose column-scaled Jacobian has a larger
+# condition number, get NaN CIs: Wald intervals are meaningless there.
+LOGISTIC_BOUND_RTOL = 1e-3
+LOGISTIC_MAX_CONDITION = 1e4
+# Maximum interior breakpoint candidates considered by the multi-segment search.
+PIECEWISE_MAX_CANDIDATES = 400
+HIERARCHICAL_STEPS = 4000
+HIERARCHICAL_ENSEMBLES = 4
+HIERARCHICAL_CHECKPOINT_DIR = ROOT / ".cache/fits/hierarchical"
+# Slopes are sampled per century of domain-centred time, then reported per year.
+HIERARCHICAL_TIME_SCALE = 100.0
+# Weakly informative prior scales (log10 ESP units).
+PRIOR_INTERCEPT_SD = 10.0
+PRIOR_SLOPE_SD = 10.0
+PRIOR_TAU_SCALE = 1.0
+PRIOR_SIGMA_SCALE = 2.0
+PRIOR_GAMMA_SD = 0.5
 
 
 @dataclass
@@ -40,75 +95,23 @@ class FitResult:
     notes: str
 
 
-def _parse_number_range(text: str) -> Optional[Tuple[float, float]]:
-    values = re.findall(r"[-+]?\d*\.\d+|[-+]?\d+", text)
-    if not values:
-        return None
-    numbers = [float(v) for v in values]
-    if len(numbers) == 1:
-        return numbers[0], numbers[0]
-    return min(numbers), max(numbers)
-
-
-def parse_time_period(time_period: str) -> Optional[float]:
-    """
-    Parse time period strings into a calendar year estimate.
-
-    Notes
-    -----
-    - BP/kya/ga/ma are converted to calendar year using the 1950 BP convention.
-    - Returns None for "modern"/"unknown" or unparseable strings.
-    """
+def _prepare_dataset(df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    if df is None:
+        if not master_table_available():
+            from src.analysis.master_esp_table import main as build_master
 
-    if not isinstance(time_period, str):
-        return None
-    text = time_period.strip().lower()
-    if not text or "unknown" in text or "modern" in text:
-        return None
-    if "ga" in text:
-        value_range = _parse_number_range(text)
-        if not value_range:
-            return None
-        mid_ga = sum(value_range) / 2.0
-        return 1950.0 - mid_ga * 1e9
-    if "ma" in text:
-        value_range = _parse_number_range(text)
-        if not value_range:
-            return None
-        mid_ma = sum(value_range) / 2.0
-        return 1950.0 - mid_ma * 1e6
-    if "kya" in text:
-        value_range = _parse_number_range(text)
-        if not value_range:
-            return None
-        mid_kya = sum(value_range) / 2.0
-        return 1950.0 - mid_kya * 1e3
-    if "bp" in text:
-        value_range = _parse_number_range(text)
-        if not value_range:
-            return None
-        mid_bp = sum(value_range) / 2.0
-        return 1950.0 - mid_bp
-    range_match = re.match(r"^\s*(\d{3,4})\s*-\s*(\d{3,4})\s*$", text)
-    if range_match:
-        start = float(range_match.group(1))
-        end = float(range_match.group(2))
-        return (start + end) / 2.0
-    year_match = re.search(r"(19|20)\d{2}", text)
-    if year_match:
-        return float(year_match.group(0))
-    return None
-
-
-def _prepare_dataset() -> pd.DataFrame:
-    path = ROOT / "data/master_esp_table.csv"
-    if not path.exists():
-        from src.analysis.master_esp_table import main as build_master
-
-        build_master()
-    df = pd.read_csv(path)
-    df["year"] = df["Time_period"].apply(parse_time_period)
-    df["log10_ESP"] = df["ESP"].apply(lambda value: float(np.log10(value)))
+            build_master()
+        df = read_master_table()
+    elif "ESP" not in df.columns:
+        # A compact_master_table frame: rebuild ESP from log10_ESP and its overrides.
+        df = expand_master_table(df)
+    else:
+        df = df.copy()
+    # Categoricals keep table order; fits and outputs are ordered by domain name.
+    df["Domain"] = df["Domain"].cat.set_categories(sorted(df["Domain"].cat.categories))
+    df["year"] = parse_time_periods(df["Time_period"])["year_ce"]
+    # Some sources report a rounded log10_ESP; fits use log10 of the ESP value itself.
+    df["log10_ESP"] = np.log10(df["ESP"].to_numpy(dtype=float))
     df["time_note"] = np.where(df["year"].isna(), "unparsed", "ok")
     return df
 
@@ -125,23 +128,66 @@ def _linear_fit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, floa
     return intercept, slope, sse, r2
 
 
-def _bootstrap_linear_ci(x: np.ndarray, y: np.ndarray, n_boot: int = 500) -> Tuple[Dict[str, float], Dict[str, float]]:
-    params = []
-    for _ in range(n_boot):
-        idx = RNG.integers(0, len(x), len(x))
-        x_boot = x[idx]
-        y_boot = y[idx]
-        if np.std(x_boot) <= 0:
-            continue
-        try:
-            intercept, slope, _, _ = _linear_fit(x_boot, y_boot)
-        except np.linalg.LinAlgError:
-            continue
-        params.append([intercept, slope])
-    if not params:
+def _batched_linear_params(x: np.ndarray, y: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """
+    Solve closed-form OLS for every bootstrap replicate in ``idx`` at once.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Observed predictor and response vectors.
+    idx : np.ndarray
+        Resample indices with shape (n_replicates, n).
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_valid, 2) with (intercept, slope) rows; replicates
+        with zero predictor variance are dropped.
+    """
+    x_shift = float(np.mean(x))
+    x_boot = x[idx] - x_shift
+    y_boot = y[idx]
+    x_mean = x_boot.mean(axis=1)
+    y_mean = y_boot.mean(axis=1)
+    x_centered = x_boot - x_mean[:, None]
+    sxx = np.einsum("ij,ij->i", x_centered, x_centered)
+    sxy = np.einsum("ij,ij->i", x_centered, y_boot - y_mean[:, None])
+    valid = sxx > 0
+    slope = sxy[valid] / sxx[valid]
+    intercept = y_mean[valid] - slope * (x_mean[valid] + x_shift)
+    return np.column_stack([intercept, slope])
+
+
+def _bootstrap_linear_ci(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_boot: int = N_BOOT,
+    chunk_size: int = MAX_CHUNK_ELEMENTS,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Percentile bootstrap CIs for the linear fit parameters.
+
+    Resample indices are drawn from ``rng`` (default ``RNG``) in chunks of whole replicates so at
+    most ``chunk_size`` index elements are held in memory; the draws consume
+    the generator in the same order as one (n_boot, n) array, so results are
+    reproducible for a given seed regardless of chunking.
+    """
+    rng = RNG if rng is None else rng
+    n = len(x)
+    rows_per_chunk = max(1, chunk_size // max(n, 1))
+    blocks = []
+    remaining = n_boot
+    while remaining > 0:
+        n_rows = min(rows_per_chunk, remaining)
+        idx = rng.integers(0, n, (n_rows, n))
+        blocks.append(_batched_linear_params(x, y, idx))
+        remaining -= n_rows
+    params = np.concatenate(blocks) if blocks else np.empty((0, 2))
+    if not len(params):
         nan_bounds = {"intercept": math.nan, "slope": math.nan}
         return nan_bounds, nan_bounds
-    params = np.asarray(params)
     lower = np.percentile(params, 2.5, axis=0)
     upper = np.percentile(params, 97.5, axis=0)
     return {"intercept": float(lower[0]), "slope": float(lower[1])}, {
@@ -158,9 +204,16 @@ def _aic_bic_from_sse(sse: float, n: int, k: int) -> Tuple[float, float]:
     return aic, bic
 
 
-def fit_exponential(domain: str, x: np.ndarray, y: np.ndarray) -> FitResult:
+@traced(rows=lambda fit: None if fit is None else fit.n)
+def fit_exponential(
+    domain: str,
+    x: np.ndarray,
+    y: np.ndarray,
+    n_boot: int = N_BOOT,
+    rng: Optional[np.random.Generator] = None,
+) -> FitResult:
     intercept, slope, sse, r2 = _linear_fit(x, y)
-    ci_low, ci_high = _bootstrap_linear_ci(x, y)
+    ci_low, ci_high = _bootstrap_linear_ci(x, y, n_boot=n_boot, rng=rng)
     aic, bic = _aic_bic_from_sse(sse, len(x), 2)
     params = {"intercept": intercept, "slope": slope}
     return FitResult(
@@ -177,13 +230,20 @@ def fit_exponential(domain: str, x: np.ndarray, y: np.ndarray) -> FitResult:
     )
 
 
-def fit_wright(domain: str, x: np.ndarray, y: np.ndarray) -> FitResult:
+@traced(rows=lambda fit: None if fit is None else fit.n)
+def fit_wright(
+    domain: str,
+    x: np.ndarray,
+    y: np.ndarray,
+    n_boot: int = N_BOOT,
+    rng: Optional[np.random.Generator] = None,
+) -> FitResult:
     order = np.argsort(x)
     n = np.arange(1, len(x) + 1)
     x_w = np.log10(n.astype(float))
     y_w = y[order]
     intercept, slope, sse, r2 = _linear_fit(x_w, y_w)
-    ci_low, ci_high = _bootstrap_linear_ci(x_w, y_w)
+    ci_low, ci_high = _bootstrap_linear_ci(x_w, y_w, n_boot=n_boot, rng=rng)
     aic, bic = _aic_bic_from_sse(sse, len(x_w), 2)
     params = {"intercept": intercept, "slope": slope}
     return FitResult(
@@ -200,112 +260,710 @@ def fit_wright(domain: str, x: np.ndarray, y: np.ndarray) -> FitResult:
     )
 
 
-def _logistic_weight(x: np.ndarray, k: float, x0: float) -> np.ndarray:
+def _logistic_weight(x: np.ndarray, k: np.ndarray | float, x0: np.ndarray | float) -> np.ndarray:
     exponent = np.clip(k * (x - x0), -700, 700)
     return 1.0 / (1.0 + np.exp(exponent))
 
 
-def fit_logistic(domain: str, x: np.ndarray, y: np.ndarray) -> Optional[FitResult]:
+def _logistic_grid_search(
+    x: np.ndarray,
+    y: np.ndarray,
+    k_grid: np.ndarray,
+    x0_grid: np.ndarray,
+    chunk_size: int = MAX_CHUNK_ELEMENTS,
+) -> Optional[Dict[str, float]]:
+    """Evaluate SSE over the (k, x0) grid with closed-form ``l_max`` per cell."""
+    best = None
+    k_per_chunk = max(1, chunk_size // max(len(x0_grid) * len(x), 1))
+    for start in range(0, len(k_grid), k_per_chunk):
+        k_block = k_grid[start : start + k_per_chunk]
+        w = _logistic_weight(x[None, None, :], k_block[:, None, None], x0_grid[None, :, None])
+        denom = np.einsum("ijn,ijn->ij", w, w)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            l_max = np.einsum("ijn,n->ij", w, y) / denom
+        sse = np.sum((y - l_max[:, :, None] * w) ** 2, axis=2)
+        sse[(denom == 0) | ~(l_max >= 0)] = np.inf
+        i, j = np.unravel_index(np.argmin(sse), sse.shape)
+        if np.isfinite(sse[i, j]) and (best is None or sse[i, j] < best["sse"]):
+            best = {
+                "sse": float(sse[i, j]),
+                "l_max": float(l_max[i, j]),
+                "k": float(k_block[i]),
+                "x0": float(x0_grid[j]),
+            }
+    return best
+
+
+def _logistic_jacobian(x: np.ndarray, theta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    l_max, k, x0 = theta
+    w = _logistic_weight(x, k, x0)
+    dw = w * (1.0 - w)
+    jac = np.column_stack([w, -l_max * dw * (x - x0), l_max * dw * k])
+    return l_max * w, jac
+
+
+def _refine_logistic(
+    x: np.ndarray,
+    y: np.ndarray,
+    start: Dict[str, float],
+    bounds: Tuple[np.ndarray, np.ndarray],
+    tol: float = LOGISTIC_TOL,
+    max_iter: int = LOGISTIC_MAX_ITER,
+) -> Tuple[np.ndarray, float, np.ndarray]:
+    """
+    Levenberg-Marquardt refinement of (l_max, k, x0) from the best grid cell.
+
+    Steps use Marquardt's diagonal scaling, which copes with ``k`` and ``x0``
+    living on very different scales, and are projected onto ``bounds``.
+    """
+    lower, upper = bounds
+    theta = np.array([start["l_max"], start["k"], start["x0"]], dtype=float)
+    y_pred, jac = _logistic_jacobian(x, theta)
+    sse = float(np.sum((y - y_pred) ** 2))
+    damping = 1e-3
+    for _ in range(max_iter):
+        jtj = jac.T @ jac
+        grad = jac.T @ (y - y_pred)
+        scale = np.diag(np.diag(jtj))
+        try:
+            step = np.linalg.solve(jtj + damping * scale, grad)
+        except np.linalg.LinAlgError:
+            break
+        candidate = np.clip(theta + step, lower, upper)
+        cand_pred, cand_jac = _logistic_jacobian(x, candidate)
+        cand_sse = float(np.sum((y - cand_pred) ** 2))
+        if cand_sse < sse:
+            improvement = sse - cand_sse
+            theta, y_pred, jac, sse = candidate, cand_pred, cand_jac, cand_sse
+            damping = max(damping / 10.0, 1e-12)
+            if improvement <= tol * max(sse, tol):
+                break
+        else:
+            damping *= 10.0
+            if damping > 1e12:
+                break
+    return theta, sse, jac
+
+
+def _wald_ci(jac: np.ndarray, sse: float, theta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n, k = jac.shape
+    nan = np.full(k, math.nan)
+    if n <= k:
+        return nan, nan
+    try:
+        cov = np.linalg.inv(jac.T @ jac) * (sse / (n - k))
+    except np.linalg.LinAlgError:
+        return nan, nan
+    var = np.diag(cov)
+    se = np.where(np.isfinite(var) & (var >= 0), np.sqrt(np.abs(var)), math.nan)
+    return theta - 1.96 * se, theta + 1.96 * se
+
+
+def _logistic_fit_issues(
+    x: np.ndarray,
+    y: np.ndarray,
+    theta: np.ndarray,
+    jac: np.ndarray,
+    bounds: Tuple[np.ndarray, np.ndarray],
+) -> List[str]:
+    """Reasons the Wald CIs of a logistic fit are not meaningful; empty if they are."""
+    l_max, k, x0 = theta
+    lower, upper = bounds
+    issues = []
+    if l_max <= lower[0] + LOGISTIC_BOUND_RTOL * float(np.max(np.abs(y))):
+        issues.append("l_max at its lower bound")
+    if k <= lower[1] * (1 + LOGISTIC_BOUND_RTOL) or k >= upper[1] * (1 - LOGISTIC_BOUND_RTOL):
+        issues.append("k at a bound")
+    margin = LOGISTIC_BOUND_RTOL * float(np.max(x) - np.min(x))
+    if not np.min(x) + margin < x0 < np.max(x) - margin:
+        issues.append("no inflection in range")
+    norms = np.linalg.norm(jac, axis=0)
+    if (
+        not np.all(np.isfinite(jac))
+        or np.any(norms == 0)
+        or np.linalg.cond(jac / norms) > LOGISTIC_MAX_CONDITION
+    ):
+        issues.append("ill-conditioned Jacobian")
+    return issues
+
+
+@traced(rows=lambda fit: None if fit is None else fit.n)
+def fit_logistic(
+    domain: str,
+    x: np.ndarray,
+    y: np.ndarray,
+    grid_size: int = LOGISTIC_GRID_SIZE,
+    tol: float = LOGISTIC_TOL,
+    max_iter: int = LOGISTIC_MAX_ITER,
+) -> Optional[FitResult]:
+    """
+    Fit log10_ESP = L / (1 + exp(k * (year - x0))).
+
+    A ``grid_size`` x ``grid_size`` (k, x0) grid is evaluated in one broadcast
+    pass to pick a starting point, which is then refined by Levenberg-Marquardt
+    until the relative SSE improvement falls below ``tol``. ``x0`` is not
+    bounded, so a fit whose inflection lies outside the data is flagged "no
+    inflection in range" in ``notes`` rather than pinned to the edge.
+
+    Parameter CIs are Wald 95% intervals from the Jacobian at the optimum,
+    truncated to the parameter bounds. They are NaN, with the reason in
+    ``notes``, when a parameter ends at or near a bound, ``x0`` is outside the
+    data, or the Jacobian is ill-conditioned (``_logistic_fit_issues``).
+    """
     if np.any(y < 0):
         return None
-    k_grid = np.logspace(-4, -1, 25)
-    x0_grid = np.linspace(np.min(x), np.max(x), 25)
-    best = None
-    for k in k_grid:
-        for x0 in x0_grid:
-            w = _logistic_weight(x, k, x0)
-            denom = float(np.sum(w * w))
-            if denom == 0:
-                continue
-            l_max = float(np.sum(w * y) / denom)
-            if l_max < 0:
-                continue
-            y_pred = l_max * w
-            sse = float(np.sum((y - y_pred) ** 2))
-            if best is None or sse < best["sse"]:
-                best = {"sse": sse, "l_max": l_max, "k": float(k), "x0": float(x0)}
+    k_lo, k_hi = LOGISTIC_K_BOUNDS
+    k_grid = np.logspace(np.log10(k_lo), np.log10(k_hi), grid_size)
+    x0_grid = np.linspace(np.min(x), np.max(x), grid_size)
+    best = _logistic_grid_search(x, y, k_grid, x0_grid)
     if best is None:
         return None
-    aic, bic = _aic_bic_from_sse(best["sse"], len(x), 3)
+    bounds = (np.array([0.0, k_lo, -np.inf]), np.array([np.inf, k_hi, np.inf]))
+    theta, sse, jac = _refine_logistic(x, y, best, bounds, tol=tol, max_iter=max_iter)
+    notes = "Grid-search + Levenberg-Marquardt logistic fit: log10_ESP = L / (1 + exp(k*(year - x0)))"
+    issues = _logistic_fit_issues(x, y, theta, jac, bounds)
+    if issues:
+        ci_low = ci_high = np.full(len(theta), math.nan)
+        notes = f"{notes}; {'; '.join(issues)}; CIs not reported"
+    else:
+        ci_low, ci_high = _wald_ci(jac, sse, theta)
+        ci_low, ci_high = np.maximum(ci_low, bounds[0]), np.minimum(ci_high, bounds[1])
+    names = ("l_max", "k", "x0")
+    aic, bic = _aic_bic_from_sse(sse, len(x), 3)
     return FitResult(
         domain=domain,
         model="logistic",
         n=len(x),
-        params={"l_max": best["l_max"], "k": best["k"], "x0": best["x0"]},
-        param_ci_low={},
-        param_ci_high={},
+        params={name: float(value) for name, value in zip(names, theta)},
+        param_ci_low={name: float(value) for name, value in zip(names, ci_low)},
+        param_ci_high={name: float(value) for name, value in zip(names, ci_high)},
         r2=None,
         aic=aic,
         bic=bic,
-        notes="Grid-search logistic fit: log10_ESP = L / (1 + exp(k*(year - x0)))",
+        notes=notes,
     )
 
 
-def fit_piecewise(domain: str, x: np.ndarray, y: np.ndarray, min_points: int = 3) -> Optional[FitResult]:
-    order = np.argsort(x)
+class _SegmentSums:
+    """
+    Prefix sums of a sorted series for O(1) OLS fits of any contiguous segment.
+
+    ``x`` is standardized before accumulation so the moment differences stay
+    well conditioned for both calendar years and geological time scales.
+    """
+
+    def __init__(self, x_sorted: np.ndarray, y_sorted: np.ndarray) -> None:
+        self.x_sorted = x_sorted
+        self.x_mean = float(np.mean(x_sorted))
+        self.x_scale = float(np.std(x_sorted)) or 1.0
+        self.y_mean = float(np.mean(y_sorted))
+        xs = (x_sorted - self.x_mean) / self.x_scale
+        ys = y_sorted - self.y_mean
+        moments = np.column_stack([np.ones_like(xs), xs, ys, xs * xs, xs * ys, ys * ys])
+        self.prefix = np.vstack([np.zeros(6), np.cumsum(moments, axis=0)])
+
+    def fit(self, start: np.ndarray, end: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Fit every segment ``[start, end)`` at once.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            Intercepts and slopes on the original scale, and segment SSE. SSE is
+            ``inf`` for segments whose x values are all identical.
+        """
+        start = np.asarray(start)
+        end = np.asarray(end)
+        count, sx, sy, sxx, sxy, syy = (self.prefix[end] - self.prefix[start]).T
+        valid = self.x_sorted[end - 1] != self.x_sorted[start]
+        count = np.where(valid, count, 1.0)
+        mx = sx / count
+        my = sy / count
+        cxx = np.where(valid, sxx - count * mx * mx, 1.0)
+        cxy = sxy - count * mx * my
+        cyy = syy - count * my * my
+        slope = cxy / cxx
+        sse = np.where(valid, np.maximum(cyy - slope * cxy, 0.0), np.inf)
+        slope_orig = slope / self.x_scale
+        intercept = my + self.y_mean - slope * mx - slope_orig * self.x_mean
+        return intercept, slope_orig, sse
+
+
+def _piecewise_candidates(x_sorted: np.ndarray, max_candidates: int) -> np.ndarray:
+    """Interior split positions at distinct-x boundaries, thinned by quantile."""
+    positions = np.flatnonzero(np.diff(x_sorted) != 0) + 1
+    if len(positions) > max_candidates:
+        keep = np.unique(np.linspace(0, len(positions) - 1, max_candidates).round().astype(int))
+        positions = positions[keep]
+    return np.concatenate([[0], positions, [len(x_sorted)]])
+
+
+def _segment_positions(
+    sums: _SegmentSums, n_segments: int, min_points: int, max_candidates: int
+) -> Optional[Tuple[np.ndarray, float]]:
+    """
+    Optimal segment boundaries by dynamic programming over candidate splits.
+
+    Cost is evaluated for every candidate pair from the prefix sums, so the
+    work is O(n) for the sums plus O(n_segments * m^2) for m candidates,
+    independent of the number of rows.
+    """
+    n = len(sums.x_sorted)
+    if n_segments == 2:
+        split = np.arange(min_points, n - min_points + 1)
+        if not len(split):
+            return None
+        zeros = np.zeros_like(split)
+        full = np.full_like(split, n)
+        _, _, left_sse = sums.fit(zeros, split)
+        _, _, right_sse = sums.fit(split, full)
+        total = left_sse + right_sse
+        best = int(np.argmin(total))
+        if not np.isfinite(total[best]):
+            return None
+        return np.array([0, split[best], n]), float(total[best])
+
+    cand = _piecewise_candidates(sums.x_sorted, max_candidates)
+    m = len(cand)
+    i, j = np.triu_indices(m, k=1)
+    ok = cand[j] - cand[i] >= min_points
+    cost = np.full((m, m), np.inf)
+    _, _, sse = sums.fit(cand[i[ok]], cand[j[ok]])
+    cost[i[ok], j[ok]] = sse
+
+    best = cost[0].copy()
+    back = np.zeros((n_segments, m), dtype=int)
+    for seg in range(1, n_segments):
+        total = best[:, None] + cost
+        back[seg] = np.argmin(total, axis=0)
+        best = total[back[seg], np.arange(m)]
+    if not np.isfinite(best[-1]):
+        return None
+    bounds = [m - 1]
+    for seg in range(n_segments - 1, 0, -1):
+        bounds.append(back[seg][bounds[-1]])
+    bounds.append(0)
+    return cand[np.array(bounds[::-1])], float(best[-1])
+
+
+@traced(rows=lambda fit: None if fit is None else fit.n)
+def fit_piecewise(
+    domain: str,
+    x: np.ndarray,
+    y: np.ndarray,
+    min_points: int = 3,
+    n_segments: int = 2,
+    max_candidates: int = PIECEWISE_MAX_CANDIDATES,
+) -> Optional[FitResult]:
+    """
+    Segmented log10_ESP linear fit with breakpoint search.
+
+    Segment SSE comes from cumulative sums, so all breakpoints are scored in
+    one vectorized pass. With ``n_segments == 2`` every split position is
+    searched; with more segments, breakpoints are restricted to at most
+    ``max_candidates`` distinct-year boundaries and chosen by dynamic
+    programming. Each segment holds at least ``min_points`` rows.
+    """
+    if n_segments < 2:
+        raise ValueError(f"n_segments must be at least 2; got {n_segments}")
+    order = np.argsort(x, kind="stable")
     x_sorted = x[order]
-    y_sorted = y[order]
-    best = None
-    for idx in range(min_points, len(x_sorted) - min_points + 1):
-        x_left, y_left = x_sorted[:idx], y_sorted[:idx]
-        x_right, y_right = x_sorted[idx:], y_sorted[idx:]
-        if np.std(x_left) <= 0 or np.std(x_right) <= 0:
-            continue
-        try:
-            left_intercept, left_slope, left_sse, _ = _linear_fit(x_left, y_left)
-            right_intercept, right_slope, right_sse, _ = _linear_fit(x_right, y_right)
-        except np.linalg.LinAlgError:
-            continue
-        sse = left_sse + right_sse
-        aic, bic = _aic_bic_from_sse(sse, len(x_sorted), 4)
-        if best is None or aic < best["aic"]:
-            best = {
-                "aic": aic,
-                "bic": bic,
-                "breakpoint": float(x_sorted[idx]),
-                "left_intercept": left_intercept,
-                "left_slope": left_slope,
-                "right_intercept": right_intercept,
-                "right_slope": right_slope,
-                "sse": sse,
-            }
-    if best is None:
+    sums = _SegmentSums(x_sorted, y[order])
+    found = _segment_positions(sums, n_segments, min_points, max_candidates)
+    if found is None:
         return None
+    positions, sse = found
+    intercepts, slopes, _ = sums.fit(positions[:-1], positions[1:])
+    breakpoints = x_sorted[positions[1:-1]]
+    aic, bic = _aic_bic_from_sse(sse, len(x_sorted), 2 * n_segments)
+    if n_segments == 2:
+        model = "piecewise_exponential"
+        params = {
+            "breakpoint": float(breakpoints[0]),
+            "left_intercept": float(intercepts[0]),
+            "left_slope": float(slopes[0]),
+            "right_intercept": float(intercepts[1]),
+            "right_slope": float(slopes[1]),
+        }
+        notes = "Two-segment log10_ESP linear fit with breakpoint search."
+    else:
+        model = f"piecewise_exponential_{n_segments}seg"
+        params = {f"breakpoint_{idx}": float(value) for idx, value in enumerate(breakpoints, start=1)}
+        for idx, (intercept, slope) in enumerate(zip(intercepts, slopes), start=1):
+            params[f"segment{idx}_intercept"] = float(intercept)
+            params[f"segment{idx}_slope"] = float(slope)
+        notes = f"{n_segments}-segment log10_ESP linear fit with dynamic-programming breakpoint search."
     return FitResult(
         domain=domain,
-        model="piecewise_exponential",
+        model=model,
         n=len(x_sorted),
-        params={
-            "breakpoint": best["breakpoint"],
-            "left_intercept": best["left_intercept"],
-            "left_slope": best["left_slope"],
-            "right_intercept": best["right_intercept"],
-            "right_slope": best["right_slope"],
-        },
+        params=params,
         param_ci_low={},
         param_ci_high={},
         r2=None,
-        aic=best["aic"],
-        bic=best["bic"],
-        notes="Two-segment log10_ESP linear fit with breakpoint search.",
+        aic=aic,
+        bic=bic,
+        notes=notes,
     )
 
 
-def _fit_domain_models(domain: str, df: pd.DataFrame) -> List[FitResult]:
-    fits: List[FitResult] = []
-    x = df["year"].to_numpy(dtype=float)
-    y = df["log10_ESP"].to_numpy(dtype=float)
-    if len(x) < 5 or np.std(x) <= 0:
-        return fits
-    fits.append(fit_exponential(domain, x, y))
-    fits.append(fit_wright(domain, x, y))
-    piecewise = fit_piecewise(domain, x, y)
-    if piecewise:
-        fits.append(piecewise)
-    logistic = fit_logistic(domain, x, y)
-    if logistic:
-        fits.append(logistic)
-    return fits
+_MODEL_FITTERS: Dict[str, Callable[[str, np.ndarray, np.ndarray, np.random.Generator], Optional[FitResult]]] = {
+    "exponential": lambda domain, x, y, rng: fit_exponential(domain, x, y, rng=rng),
+    "wright": lambda domain, x, y, rng: fit_wright(domain, x, y, rng=rng),
+    "piecewise_exponential": lambda domain, x, y, rng: fit_piecewise(domain, x, y),
+    "logistic": lambda domain, x, y, rng: fit_logistic(domain, x, y),
+}
+
+FitTask = Tuple[str, str, np.ndarray, np.ndarray]
+
+
+def _task_rng(domain: str, model: str) -> np.random.Generator:
+    """Derive a per-(domain, model) generator from ``SEED``, stable across processes."""
+    key = zlib.crc32(f"{domain}|{model}".encode("utf-8"))
+    return np.random.default_rng(np.random.SeedSequence([SEED, key]))
+
+
+def _run_fit_task(task: FitTask) -> Optional[FitResult]:
+    domain, model, x, y = task
+    return _MODEL_FITTERS[model](domain, x, y, _task_rng(domain, model))
+
+
+def prepare_analysis_dataset(
+    df: Optional[pd.DataFrame] = None,
+    index: Optional[MasterIndex] = None,
+) -> pd.DataFrame:
+    """
+    Rows with a parsed year, sorted by domain and year.
+
+    Parameters
+    ----------
+    df : pd.DataFrame, optional
+        Master table to use instead of loading it from disk.
+    index : MasterIndex, optional
+        Secondary indexes of ``df``; built if not given (read from disk with
+        the table when ``df`` is not given).
+    """
+    if index is None and df is not None:
+        index = MasterIndex.build(df)
+    df = _prepare_dataset(df)
+    if index is None:
+        index = read_master_index(df)
+    analysis_df = df.iloc[index.select(year_ce=None)].copy()
+    analysis_df["year"] = analysis_df["year"].astype(float)
+    return analysis_df.sort_values(["Domain", "year"]).reset_index(drop=True)
+
+
+def _domain_xy(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    return df["year"].to_numpy(dtype=float), df["log10_ESP"].to_numpy(dtype=float)
+
+
+def cached_fit(
+    domain: str,
+    model: str,
+    x: np.ndarray,
+    y: np.ndarray,
+    store: Optional[FitStore] = None,
+) -> Optional[FitResult]:
+    """
+    Return the stored fit for exactly this (x, y) data, fitting on a miss.
+
+    Misses are fitted with the same per-task generator as ``fit_all_domains``,
+    so the stored result matches what f2 would produce.
+    """
+    store = store or get_fit_store(code_version=FIT_CODE_VERSION)
+    data_key = dataset_hash(x, y)
+    record = store.get(domain, model, data_key)
+    if record is not None:
+        return FitResult(**record)
+    fit = _run_fit_task((domain, model, x, y))
+    if fit is not None:
+        store.put(domain, model, data_key, asdict(fit))
+        store.save()
+    return fit
+
+
+def _store_fits(analysis_df: pd.DataFrame, fits: Iterable[FitResult], store: FitStore) -> None:
+    data_keys = {
+        domain: dataset_hash(*_domain_xy(group))
+        for domain, group in analysis_df.groupby("Domain", observed=True)
+    }
+    for fit in fits:
+        store.put(fit.domain, fit.model, data_keys[fit.domain], asdict(fit))
+    store.save()
+
+
+def is_fittable(x: np.ndarray) -> bool:
+    """True if a domain with years ``x`` has enough spread-out points to fit."""
+    return len(x) >= MIN_FIT_POINTS and bool(np.std(x) > 0)
+
+
+def _domain_fit_tasks(domain: str, df: pd.DataFrame) -> List[FitTask]:
+    x, y = _domain_xy(df)
+    if not is_fittable(x):
+        return []
+    return [(domain, model, x, y) for model in _MODEL_FITTERS]
+
+
+def fit_all_domains(analysis_df: pd.DataFrame, workers: Optional[int] = None) -> List[FitResult]:
+    """
+    Fit every candidate model for every domain.
+
+    Parameters
+    ----------
+    analysis_df : pd.DataFrame
+        Dataset with ``Domain``, ``year`` and ``log10_ESP`` columns.
+    workers : int, optional
+        Number of worker processes; ``1`` runs serially in-process. ``None``
+        (default) runs serially below ``PARALLEL_MIN_ROWS`` rows and on all
+        cores above it.
+
+    Returns
+    -------
+    List[FitResult]
+        Fits ordered by domain then model. Each (domain, model) pair draws from
+        its own seeded generator, so results do not depend on ``workers``.
+    """
+    tasks: List[FitTask] = []
+    for domain, group in analysis_df.groupby("Domain", observed=True):
+        tasks.extend(_domain_fit_tasks(domain, group))
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(analysis_df) >= PARALLEL_MIN_ROWS else 1
+    if workers <= 1 or len(tasks) <= 1:
+        fits = [_run_fit_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            fits = list(executor.map(_run_fit_task, tasks))
+    return [fit for fit in fits if fit]
+
+
+class HierarchicalLogProb:
+    """
+    Log-posterior of the pooled exponential model, vectorized over walkers.
+
+    ``log10_ESP_i ~ Normal(a_d + b_d * t_i, sigma0 * exp(gamma * (3 - Quality_score_i)))``
+    with domain slopes ``b_d ~ Normal(mu, tau)`` and ``t_i`` the years since
+    the domain's mean year, in centuries. ``theta`` rows are
+    ``(a_1..a_D, b_1..b_D, mu, log tau, log sigma0, gamma)``.
+    """
+
+    def __init__(
+        self,
+        domain_index: np.ndarray,
+        t: np.ndarray,
+        y: np.ndarray,
+        quality_offset: np.ndarray,
+        intercept_center: np.ndarray,
+    ) -> None:
+        self.domain_index = domain_index
+        self.t = t
+        self.y = y
+        self.quality_offset = quality_offset
+        self.intercept_center = intercept_center
+        self.n_domains = len(intercept_center)
+
+    @property
+    def n_dim(self) -> int:
+        return 2 * self.n_domains + 4
+
+    def __call__(self, theta: np.ndarray) -> np.ndarray:
+        n_domains = self.n_domains
+        a = theta[:, :n_domains]
+        b = theta[:, n_domains : 2 * n_domains]
+        mu, log_tau, log_sigma, gamma = theta[:, 2 * n_domains :].T
+        mean = a[:, self.domain_index] + b[:, self.domain_index] * self.t
+        log_scale = log_sigma[:, None] + gamma[:, None] * self.quality_offset
+        z = (self.y - mean) * np.exp(-log_scale)
+        log_like = -0.5 * np.einsum("ij,ij->i", z, z) - log_scale.sum(axis=1)
+
+        tau = np.exp(log_tau)
+        sigma = np.exp(log_sigma)
+        slope_z = (b - mu[:, None]) / tau[:, None]
+        intercept_z = (a - self.intercept_center) / PRIOR_INTERCEPT_SD
+        log_prior = (
+            -0.5 * np.einsum("ij,ij->i", slope_z, slope_z)
+            - n_domains * log_tau
+            - 0.5 * np.einsum("ij,ij->i", intercept_z, intercept_z)
+            - 0.5 * (mu / PRIOR_SLOPE_SD) ** 2
+            # Half-Cauchy priors on tau and sigma0, with the log-scale Jacobians.
+            + log_tau
+            - np.log1p((tau / PRIOR_TAU_SCALE) ** 2)
+            + log_sigma
+            - np.log1p((sigma / PRIOR_SIGMA_SCALE) ** 2)
+            - 0.5 * (gamma / PRIOR_GAMMA_SD) ** 2
+        )
+        total = log_like + log_prior
+        return np.where(np.isfinite(total), total, -np.inf)
+
+
+def _hierarchical_inputs(analysis_df: pd.DataFrame) -> Tuple[List[str], HierarchicalLogProb, np.ndarray]:
+    """Domains, the log-posterior and per-domain mean years for domains with >= 2 distinct years."""
+    groups = [
+        (domain, group)
+        for domain, group in analysis_df.groupby("Domain", observed=True)
+        if len(group) >= 2 and np.std(group["year"].to_numpy(dtype=float)) > 0
+    ]
+    domains = [domain for domain, _ in groups]
+    x_mean = np.array([group["year"].mean() for _, group in groups])
+    frame = pd.concat([group for _, group in groups])
+    domain_index = np.repeat(np.arange(len(groups)), [len(group) for _, group in groups])
+    x = frame["year"].to_numpy(dtype=float)
+    y = frame["log10_ESP"].to_numpy(dtype=float)
+    quality = pd.to_numeric(frame["Quality_score"]).to_numpy(dtype=float)
+    quality_offset = np.nan_to_num(3.0 - quality)
+    t = (x - x_mean[domain_index]) / HIERARCHICAL_TIME_SCALE
+    intercept_center = np.array([group["log10_ESP"].mean() for _, group in groups])
+    return domains, HierarchicalLogProb(domain_index, t, y, quality_offset, intercept_center), x_mean
+
+
+def _hierarchical_start(model: HierarchicalLogProb, n_walkers: int, rng: np.random.Generator) -> np.ndarray:
+    """Walkers in a small ball around per-domain least-squares estimates."""
+    n_domains = model.n_domains
+    a = np.empty(n_domains)
+    b = np.empty(n_domains)
+    b_se = np.empty(n_domains)
+    residuals = []
+    for domain in range(n_domains):
+        mask = model.domain_index == domain
+        t, y = model.t[mask], model.y[mask]
+        b[domain] = np.sum(t * (y - y.mean())) / np.sum(t * t)
+        a[domain] = y.mean()
+        resid = y - a[domain] - b[domain] * t
+        residuals.append(resid)
+        b_se[domain] = max(np.std(resid), 1e-3) / math.sqrt(np.sum(t * t))
+    sigma = max(float(np.std(np.concatenate(residuals))), 1e-2)
+    center = np.concatenate([a, b, [b.mean(), math.log(max(np.std(b), 1e-3)), math.log(sigma), 0.0]])
+    scale = np.concatenate([np.full(n_domains, 0.01 * sigma), 0.01 * b_se, [0.01 * b_se.mean(), 0.01, 0.01, 0.01]])
+    return center + scale * rng.standard_normal((n_walkers, model.n_dim))
+
+
+def fit_hierarchical(
+    analysis_df: pd.DataFrame,
+    n_steps: int = HIERARCHICAL_STEPS,
+    n_ensembles: int = HIERARCHICAL_ENSEMBLES,
+    workers: Optional[int] = None,
+    checkpoint_dir: Optional[Path] = HIERARCHICAL_CHECKPOINT_DIR,
+) -> Tuple[List[FitResult], pd.DataFrame]:
+    """
+    Fit the pooled cross-domain exponential model with ensemble MCMC.
+
+    Parameters
+    ----------
+    analysis_df : pd.DataFrame
+        Dataset with ``Domain``, ``year``, ``log10_ESP`` and ``Quality_score``.
+    n_steps : int
+        Steps per ensemble; the first half is discarded as burn-in.
+    n_ensembles : int
+        Independent ensembles, run in up to ``workers`` processes.
+    checkpoint_dir : Path, optional
+        Where chains are checkpointed; an interrupted run with the same data
+        resumes from there. ``None`` disables checkpointing.
+
+    Returns
+    -------
+    fits : list of FitResult
+        One ``hierarchical_exponential`` fit per domain (posterior medians and
+        95% intervals of the per-year intercept and slope) and one for the
+        population-level parameters.
+    diagnostics : pd.DataFrame
+        Per-parameter posterior summary, autocorrelation time, effective
+        samples, effective samples per second of sampling (counting time
+        spent before a checkpoint resume) and R-hat.
+    """
+    domains, model, x_mean = _hierarchical_inputs(analysis_df)
+    n_walkers = 4 * model.n_dim
+    rng = np.random.default_rng(np.random.SeedSequence([SEED, zlib.crc32(b"hierarchical")]))
+    initial = [_hierarchical_start(model, n_walkers, rng) for _ in range(n_ensembles)]
+    checkpoints = None
+    if checkpoint_dir is not None:
+        key = dataset_hash(np.column_stack([model.t, model.domain_index, model.quality_offset]), model.y)
+        checkpoints = [checkpoint_dir / f"ensemble{index}-{key}-w{n_walkers}.npz" for index in range(n_ensembles)]
+
+    runs = run_ensembles(model, initial, n_steps, [SEED, n_walkers], workers, checkpoints)
+    # EnsembleRun.seconds accumulates across checkpoint resumes; ensembles run
+    # side by side in worker processes and one after another otherwise.
+    run_seconds = [run.seconds for run in runs]
+    concurrent = (os.cpu_count() or 1) if workers is None else workers
+    sampling_seconds = max(run_seconds) if concurrent > 1 else sum(run_seconds)
+    kept = [run.chain[n_steps // 2 :] for run in runs]
+    samples = np.concatenate([chain.reshape(-1, model.n_dim) for chain in kept])
+    tau_int = np.mean([integrated_autocorr_time(chain) for chain in kept], axis=0)
+    ess = len(samples) / tau_int
+    rhat = gelman_rubin(kept)
+    acceptance = float(np.mean([run.accepted.mean() / n_steps for run in runs]))
+
+    # Back to per-year units: slope_year = b / scale, intercept at year 0.
+    n_domains = model.n_domains
+    slopes = samples[:, n_domains : 2 * n_domains] / HIERARCHICAL_TIME_SCALE
+    intercepts = samples[:, :n_domains] - slopes * x_mean
+    population = {
+        "mu_slope": samples[:, 2 * n_domains] / HIERARCHICAL_TIME_SCALE,
+        "tau_slope": np.exp(samples[:, 2 * n_domains + 1]) / HIERARCHICAL_TIME_SCALE,
+        "sigma0": np.exp(samples[:, 2 * n_domains + 2]),
+        "quality_noise_gamma": samples[:, 2 * n_domains + 3],
+    }
+
+    def summary(values: np.ndarray) -> Tuple[float, float, float]:
+        low, median, high = np.percentile(values, [2.5, 50.0, 97.5])
+        return float(median), float(low), float(high)
+
+    notes = "Hierarchical pooled exponential (ensemble MCMC): slope_d ~ Normal(mu, tau)"
+    fits = []
+    counts = np.bincount(model.domain_index, minlength=n_domains)
+    for index, domain in enumerate(domains):
+        estimates = {"intercept": summary(intercepts[:, index]), "slope": summary(slopes[:, index])}
+        fits.append(
+            FitResult(
+                domain=domain,
+                model="hierarchical_exponential",
+                n=int(counts[index]),
+                params={key: value[0] for key, value in estimates.items()},
+                param_ci_low={key: value[1] for key, value in estimates.items()},
+                param_ci_high={key: value[2] for key, value in estimates.items()},
+                r2=None,
+                aic=None,
+                bic=None,
+                notes=notes,
+            )
+        )
+    estimates = {key: summary(values) for key, values in population.items()}
+    fits.append(
+        FitResult(
+            domain="All domains",
+            model="hierarchical_exponential",
+            n=len(model.y),
+            params={key: value[0] for key, value in estimates.items()},
+            param_ci_low={key: value[1] for key, value in estimates.items()},
+            param_ci_high={key: value[2] for key, value in estimates.items()},
+            r2=None,
+            aic=None,
+            bic=None,
+            notes=f"{notes}; sigma_i = sigma0 * exp(gamma * (3 - Quality_score_i))",
+        )
+    )
+
+    names = (
+        [f"intercept_century[{domain}]" for domain in domains]
+        + [f"slope_century[{domain}]" for domain in domains]
+        + ["mu_slope_century", "log_tau_slope_century", "log_sigma0", "quality_noise_gamma"]
+    )
+    low, median, high = np.percentile(samples, [2.5, 50.0, 97.5], axis=0)
+    diagnostics = pd.DataFrame(
+        {
+            "parameter": names,
+            "median": median,
+            "ci_low": low,
+            "ci_high": high,
+            "autocorr_time": tau_int,
+            "ess": ess,
+            "ess_per_second": ess / sampling_seconds,
+            "rhat": rhat,
+            "acceptance_fraction": acceptance,
+            "n_walkers": n_walkers,
+            "n_steps": n_steps,
+            "n_ensembles": n_ensembles,
+        }
+    )
+    return fits, diagnostics
 
 
 def _fit_extrapolations(df: pd.DataFrame, fits: Iterable[FitResult]) -> pd.DataFrame:
@@ -363,24 +1021,24 @@ def _results_to_frame(fits: Iterable[FitResult]) -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
-def main() -> None:
-    df = _prepare_dataset()
-    analysis_df = df[df["year"].notna()].copy()
-    analysis_df["year"] = analysis_df["year"].astype(float)
-    analysis_df = analysis_df.sort_values(["Domain", "year"]).reset_index(drop=True)
+def main(workers: Optional[int] = None, hierarchical: bool = False, mcmc_steps: int = HIERARCHICAL_STEPS) -> None:
+    analysis_df = prepare_analysis_dataset()
     output_dir = ROOT / "results/tables"
     output_dir.mkdir(parents=True, exist_ok=True)
-    analysis_df.to_csv(output_dir / "tbl_f2_analysis_dataset.csv", index=False)
+    write_table(analysis_df, output_dir / "tbl_f2_analysis_dataset.csv")
 
-    fits = []
-    for domain, group in analysis_df.groupby("Domain"):
-        fits.extend(_fit_domain_models(domain, group))
+    fits = fit_all_domains(analysis_df, workers=workers)
+    _store_fits(analysis_df, fits, get_fit_store(code_version=FIT_CODE_VERSION))
+    if hierarchical:
+        hierarchical_fits, diagnostics = fit_hierarchical(analysis_df, n_steps=mcmc_steps, workers=workers)
+        fits.extend(hierarchical_fits)
+        write_table(diagnostics, output_dir / "tbl_f2_hierarchical_diagnostics.csv")
 
     fits_df = _results_to_frame(fits)
-    fits_df.to_csv(output_dir / "tbl_f2_model_fits.csv", index=False)
+    write_table(fits_df, output_dir / "tbl_f2_model_fits.csv")
 
     extrap_df = _fit_extrapolations(analysis_df, fits)
-    extrap_df.to_csv(output_dir / "tbl_f2_extrapolations.csv", index=False)
+    write_table(extrap_df, output_dir / "tbl_f2_extrapolations.csv")
 
     piecewise_rows = []
     for fit in fits:
@@ -398,8 +1056,27 @@ def main() -> None:
                 "bic": fit.bic,
             }
         )
-    pd.DataFrame(piecewise_rows).to_csv(output_dir / "tbl_f2_piecewise_fits.csv", index=False)
+    write_table(pd.DataFrame(piecewise_rows), output_dir / "tbl_f2_piecewise_fits.csv")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Worker processes for model fitting (0 = serial below PARALLEL_MIN_ROWS rows, else all cores).",
+    )
+    parser.add_argument(
+        "--hierarchical",
+        action="store_true",
+        help="Also fit the pooled cross-domain model with ensemble MCMC.",
+    )
+    parser.add_argument(
+        "--mcmc-steps",
+        type=int,
+        default=HIERARCHICAL_STEPS,
+        help="Steps per MCMC ensemble (first half discarded as burn-in).",
+    )
+    args = parser.parse_args()
+    main(workers=args.workers or None, hierarchical=args.hierarchical, mcmc_steps=args.mcmc_steps)
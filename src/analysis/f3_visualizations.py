@@ -11,118 +11,93 @@ results/figures/fig05_medicine_esp_vs_time.(png|pdf)
 results/figures/fig06_unified_curve_overlay.(png|pdf)
 results/figures/fig07_doubling_time_analysis.(png|pdf)
 results/figures/fig08_projection_to_esp1.(png|pdf)
+
+Figures are rendered in a process pool. Each figure is keyed by a hash of the
+slice of the master table it plots, its render options, the theme and its
+drawing code. A figure is skipped when its key matches the last render, copied
+from the content-addressed store in ``.cache/figures/store`` when that key was
+rendered before, and drawn otherwise.
 """
 
 from __future__ import annotations
 
-import re
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
 from matplotlib.patches import FancyBboxPatch
 
+from src.analysis.f2_curve_fitting import cached_fit, is_fittable, prepare_analysis_dataset
+from src.utils.master_index import MasterIndex
+from src.utils.master_table_io import master_table_available, read_master_index, read_master_table
+from src.utils.time_periods import parse_time_periods
+from src.utils.tracing import span
+
 ROOT = Path(__file__).resolve().parents[2]
 PRESENT_YEAR = 2026
+THEME = {"style": "whitegrid", "font_scale": 1.0}
+DEFAULT_FORMATS = ("png", "pdf")
+DEFAULT_DPI = 300
+RASTER_FORMATS = {"png", "jpg", "jpeg", "tif", "tiff"}
+MANIFEST_PATH = ROOT / ".cache/figures/render_manifest.json"
+# Content-addressed store: one directory per figure key holding its outputs.
+FIGURE_CACHE_DIR = ROOT / ".cache/figures/store"
 
 
-def _extract_numbers(text: str) -> Iterable[float]:
-    return [float(value) for value in re.findall(r"\d+\.\d+|\d+", text)]
-
-
-def _parse_range(values: Iterable[float]) -> Optional[Tuple[float, float]]:
-    vals = list(values)
-    if not vals:
-        return None
-    if len(vals) == 1:
-        return vals[0], vals[0]
-    return vals[0], vals[1]
-
-
-def _parse_time_period(value: str) -> Dict[str, Optional[float]]:
-    if not isinstance(value, str):
-        return {"year_ce": None, "years_bp": None}
-    text = value.strip()
-    if not text or text.lower() in {"unknown", "modern"}:
-        return {"year_ce": None, "years_bp": None}
-
-    cleaned = text.replace("~", "").replace("ca.", "").strip()
-
-    year_range = re.search(r"(\d{4})\s*-\s*(\d{4})", cleaned)
-    if year_range:
-        start = float(year_range.group(1))
-        end = float(year_range.group(2))
-        year = (start + end) / 2.0
-        return {"year_ce": year, "years_bp": PRESENT_YEAR - year}
-
-    if re.fullmatch(r"\d{4}", cleaned):
-        year = float(cleaned)
-        return {"year_ce": year, "years_bp": PRESENT_YEAR - year}
-
-    if "BP" in cleaned:
-        numbers = _extract_numbers(cleaned)
-        parsed = _parse_range(numbers)
-        if parsed:
-            years_bp = sum(parsed) / 2.0
-            return {"year_ce": PRESENT_YEAR - years_bp, "years_bp": years_bp}
-
-    if "kya" in cleaned.lower():
-        numbers = _extract_numbers(cleaned)
-        parsed = _parse_range(numbers)
-        if parsed:
-            years_bp = (sum(parsed) / 2.0) * 1_000.0
-            return {"year_ce": PRESENT_YEAR - years_bp, "years_bp": years_bp}
-
-    if "Ma" in cleaned:
-        numbers = _extract_numbers(cleaned)
-        parsed = _parse_range(numbers)
-        if parsed:
-            years_bp = (sum(parsed) / 2.0) * 1_000_000.0
-            return {"year_ce": PRESENT_YEAR - years_bp, "years_bp": years_bp}
-
-    if "Ga" in cleaned:
-        numbers = _extract_numbers(cleaned)
-        parsed = _parse_range(numbers)
-        if parsed:
-            years_bp = (sum(parsed) / 2.0) * 1_000_000_000.0
-            return {"year_ce": PRESENT_YEAR - years_bp, "years_bp": years_bp}
-
-    return {"year_ce": None, "years_bp": None}
+def _load_master_table() -> pd.DataFrame:
+    if not master_table_available():
+        from src.analysis.master_esp_table import main as build_master
 
+        build_master()
+    # Figures plot log10_ESP only, so the compact layout (no ESP column) is enough.
+    return read_master_table(compact=True)
 
-def _load_master_table() -> pd.DataFrame:
-    path = ROOT / "data/master_esp_table.csv"
-    if not path.exists():
-        from src.analysis.master_esp_table import build_master_table
 
-        df = build_master_table()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(path, index=False)
-    return pd.read_csv(path)
+def _select(df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """Take rows and drop unused categories so legends list only plotted levels."""
+    subset = df.iloc[rows]
+    for column in subset.select_dtypes("category").columns:
+        subset = subset.assign(**{column: subset[column].cat.remove_unused_categories()})
+    return subset
 
 
 def _add_time_columns(df: pd.DataFrame) -> pd.DataFrame:
-    parsed = df["Time_period"].apply(_parse_time_period)
+    parsed = parse_time_periods(df["Time_period"], present_year=PRESENT_YEAR)
     df = df.copy()
-    df["year_ce"] = parsed.apply(lambda record: record["year_ce"])
-    df["years_bp"] = parsed.apply(lambda record: record["years_bp"])
+    df["year_ce"] = parsed["year_ce"]
+    df["years_bp"] = parsed["years_bp"]
     return df
 
 
-def _save_figure(fig: plt.Figure, name: str) -> None:
+def _save_figure(fig: plt.Figure, name: str, formats: Sequence[str], dpi: int) -> List[Path]:
     output_dir = ROOT / "results/figures"
     output_dir.mkdir(parents=True, exist_ok=True)
-    png_path = output_dir / f"{name}.png"
-    pdf_path = output_dir / f"{name}.pdf"
-    fig.savefig(png_path, dpi=300, bbox_inches="tight")
-    fig.savefig(pdf_path, bbox_inches="tight")
+    paths = []
+    for fmt in formats:
+        path = output_dir / f"{name}.{fmt}"
+        # Vector formats ignore dpi except for embedded rasters; keep their default.
+        if fmt in RASTER_FORMATS:
+            fig.savefig(path, dpi=dpi, bbox_inches="tight")
+        else:
+            fig.savefig(path, bbox_inches="tight")
+        paths.append(path)
     plt.close(fig)
+    return paths
 
 
-def _figure_framework_diagram() -> None:
+def _figure_framework_diagram(_: pd.DataFrame) -> Optional[plt.Figure]:
     fig, ax = plt.subplots(figsize=(9, 4))
     ax.axis("off")
 
@@ -164,13 +139,12 @@ def _figure_framework_diagram() -> None:
         fontsize=12,
         weight="bold",
     )
-    _save_figure(fig, "fig01_esp_framework_diagram")
+    return fig
 
 
-def _figure_evolution(df: pd.DataFrame) -> None:
-    subset = df[(df["Domain"] == "Evolution") & df["years_bp"].notna()]
+def _figure_evolution(subset: pd.DataFrame) -> Optional[plt.Figure]:
     if subset.empty:
-        return
+        return None
     fig, ax = plt.subplots(figsize=(7, 4.5))
     sns.scatterplot(
         data=subset,
@@ -184,13 +158,12 @@ def _figure_evolution(df: pd.DataFrame) -> None:
     ax.set_xlabel("Years before present (log scale)")
     ax.set_ylabel("log10(ESP)")
     ax.set_title("Evolution: ESP vs. time")
-    _save_figure(fig, "fig02_evolution_esp_vs_time")
+    return fig
 
 
-def _figure_domestication_breeding(df: pd.DataFrame) -> None:
-    subset = df[df["Domain"].isin(["Domestication", "Breeding"]) & df["year_ce"].notna()]
+def _figure_domestication_breeding(subset: pd.DataFrame) -> Optional[plt.Figure]:
     if subset.empty:
-        return
+        return None
     fig, ax = plt.subplots(figsize=(7, 4.5))
     sns.scatterplot(
         data=subset,
@@ -205,13 +178,12 @@ def _figure_domestication_breeding(df: pd.DataFrame) -> None:
     ax.set_ylabel("log10(ESP)")
     ax.set_title("Domestication and breeding: ESP vs. time")
     ax.legend(title="Domain", frameon=False)
-    _save_figure(fig, "fig03_domestication_breeding_esp_vs_time")
+    return fig
 
 
-def _figure_molecular(df: pd.DataFrame) -> None:
-    subset = df[(df["Domain"] == "Protein engineering") & df["year_ce"].notna()]
+def _figure_molecular(subset: pd.DataFrame) -> Optional[plt.Figure]:
     if subset.empty:
-        return
+        return None
     fig, ax = plt.subplots(figsize=(7, 4.5))
     sns.scatterplot(
         data=subset,
@@ -226,13 +198,12 @@ def _figure_molecular(df: pd.DataFrame) -> None:
     ax.set_ylabel("log10(ESP)")
     ax.set_title("Molecular biotechnology: ESP vs. time")
     ax.legend(title="Subdomain", frameon=False)
-    _save_figure(fig, "fig04_molecular_biotech_esp_vs_time")
+    return fig
 
 
-def _figure_medicine(df: pd.DataFrame) -> None:
-    subset = df[(df["Domain"] == "Medicine") & df["year_ce"].notna()]
+def _figure_medicine(subset: pd.DataFrame) -> Optional[plt.Figure]:
     if subset.empty:
-        return
+        return None
     fig, ax = plt.subplots(figsize=(7, 4.5))
     sns.scatterplot(
         data=subset,
@@ -247,13 +218,12 @@ def _figure_medicine(df: pd.DataFrame) -> None:
     ax.set_ylabel("log10(ESP)")
     ax.set_title("Clinical medicine: ESP vs. time")
     ax.legend(title="Subdomain", frameon=False)
-    _save_figure(fig, "fig05_medicine_esp_vs_time")
+    return fig
 
 
-def _figure_unified_curve(df: pd.DataFrame) -> None:
-    subset = df[df["years_bp"].notna()]
+def _figure_unified_curve(subset: pd.DataFrame) -> Optional[plt.Figure]:
     if subset.empty:
-        return
+        return None
     fig, ax = plt.subplots(figsize=(7.5, 4.8))
     sns.scatterplot(
         data=subset,
@@ -269,36 +239,50 @@ def _figure_unified_curve(df: pd.DataFrame) -> None:
     ax.set_ylabel("log10(ESP)")
     ax.set_title("Unified ESP learning curve")
     ax.legend(title="Domain", frameon=False)
-    _save_figure(fig, "fig06_unified_curve_overlay")
+    return fig
 
 
-def _fit_domain_trend(df: pd.DataFrame, domain: str) -> Optional[Tuple[float, float]]:
-    subset = df[(df["Domain"] == domain) & df["year_ce"].notna()]
-    if len(subset) < 3:
-        return None
-    x = subset["year_ce"].to_numpy(dtype=float)
-    y = subset["log10_ESP"].to_numpy(dtype=float)
-    slope, intercept = np.polyfit(x, y, 1)
-    return slope, intercept
-
+def _domain_trends(df: pd.DataFrame, index: MasterIndex) -> pd.DataFrame:
+    """
+    Exponential trend per domain, read from the shared f2 fit store.
 
-def _figure_doubling_time(df: pd.DataFrame) -> None:
-    domains = sorted(df["Domain"].dropna().unique())
+    Uses the same dataset preparation and minimum data as f2, so the fits
+    (and their bootstrap CIs) are the ones in ``tbl_f2_model_fits.csv``; a
+    domain missing from the store is fitted once and stored.
+    """
     records = []
-    for domain in domains:
-        trend = _fit_domain_trend(df, domain)
-        if not trend:
+    analysis_df = prepare_analysis_dataset(df, index)
+    for domain, group in analysis_df.groupby("Domain", observed=True):
+        x = group["year"].to_numpy(dtype=float)
+        y = group["log10_ESP"].to_numpy(dtype=float)
+        if not is_fittable(x):
             continue
-        slope, _ = trend
-        if slope >= 0:
-            continue
-        halving_years = np.log10(0.5) / slope
-        if halving_years <= 0:
-            continue
-        records.append({"Domain": domain, "Halving_time_years": halving_years})
-    if not records:
-        return
-    plot_df = pd.DataFrame(records).sort_values("Halving_time_years")
+        fit = cached_fit(str(domain), "exponential", x, y)
+        records.append(
+            {
+                "Domain": str(domain),
+                "slope": fit.params["slope"],
+                "intercept": fit.params["intercept"],
+                "slope_ci_low": fit.param_ci_low.get("slope"),
+                "slope_ci_high": fit.param_ci_high.get("slope"),
+            }
+        )
+    columns = ["Domain", "slope", "intercept", "slope_ci_low", "slope_ci_high"]
+    return pd.DataFrame(records, columns=columns).astype({name: float for name in columns[1:]})
+
+
+def _figure_doubling_time(trends: pd.DataFrame) -> Optional[plt.Figure]:
+    plot_df = trends[trends["slope"] < 0].copy()
+    if plot_df.empty:
+        return None
+    plot_df["Halving_time_years"] = np.log10(0.5) / plot_df["slope"]
+    # Steepest CI slope gives the shortest halving time; a non-negative upper
+    # slope leaves the long end unbounded, so no bar is drawn for it.
+    plot_df["halving_low"] = np.log10(0.5) / plot_df["slope_ci_low"]
+    plot_df["halving_high"] = np.where(
+        plot_df["slope_ci_high"] < 0, np.log10(0.5) / plot_df["slope_ci_high"], np.nan
+    )
+    plot_df = plot_df.sort_values("Halving_time_years").reset_index(drop=True)
     fig, ax = plt.subplots(figsize=(7, 4.5))
     sns.barplot(
         data=plot_df,
@@ -309,27 +293,34 @@ def _figure_doubling_time(df: pd.DataFrame) -> None:
         legend=False,
         ax=ax,
     )
-    ax.set_xlabel("Years to halve ESP")
+    bounded = plot_df[plot_df[["halving_low", "halving_high"]].notna().all(axis=1)]
+    if not bounded.empty:
+        ax.errorbar(
+            bounded["Halving_time_years"].to_numpy(),
+            bounded.index.to_numpy(),
+            xerr=np.vstack(
+                [
+                    (bounded["Halving_time_years"] - bounded["halving_low"]).to_numpy(),
+                    (bounded["halving_high"] - bounded["Halving_time_years"]).to_numpy(),
+                ]
+            ),
+            fmt="none",
+            ecolor="#333333",
+            capsize=3,
+            linewidth=1,
+        )
+    ax.set_xlabel("Years to halve ESP (95% bootstrap CI)")
     ax.set_ylabel("Domain")
     ax.set_title("ESP improvement rates by domain")
-    _save_figure(fig, "fig07_doubling_time_analysis")
+    return fig
 
 
-def _figure_projection(df: pd.DataFrame) -> None:
-    domains = sorted(df["Domain"].dropna().unique())
-    records = []
-    for domain in domains:
-        trend = _fit_domain_trend(df, domain)
-        if not trend:
-            continue
-        slope, intercept = trend
-        if slope >= 0:
-            continue
-        year_esp1 = -intercept / slope
-        records.append({"Domain": domain, "Year_ESP1": year_esp1})
-    if not records:
-        return
-    plot_df = pd.DataFrame(records).sort_values("Year_ESP1")
+def _figure_projection(trends: pd.DataFrame) -> Optional[plt.Figure]:
+    plot_df = trends[trends["slope"] < 0].copy()
+    if plot_df.empty:
+        return None
+    plot_df["Year_ESP1"] = -plot_df["intercept"] / plot_df["slope"]
+    plot_df = plot_df.sort_values("Year_ESP1")
     fig, ax = plt.subplots(figsize=(7, 4.5))
     sns.barplot(
         data=plot_df,
@@ -344,21 +335,217 @@ def _figure_projection(df: pd.DataFrame) -> None:
     ax.set_xlabel("Projected year for ESP = 1 (linear trend)")
     ax.set_ylabel("Domain")
     ax.set_title("Projected convergence to ESP = 1")
-    _save_figure(fig, "fig08_projection_to_esp1")
-
-
-def main() -> None:
-    sns.set_theme(style="whitegrid", font_scale=1.0)
+    return fig
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """A figure, the slice of the master table it plots, and how to draw it."""
+
+    name: str
+    select: Callable[[pd.DataFrame, MasterIndex], pd.DataFrame]
+    draw: Callable[[pd.DataFrame], Optional[plt.Figure]]
+
+
+def _no_data(df: pd.DataFrame, _: MasterIndex) -> pd.DataFrame:
+    return df.iloc[0:0, 0:0]
+
+
+def _domain_slice(
+    domains: Sequence[str], time_column: str, columns: Sequence[str]
+) -> Callable[[pd.DataFrame, MasterIndex], pd.DataFrame]:
+    def select(df: pd.DataFrame, index: MasterIndex) -> pd.DataFrame:
+        # Rows with a parsed time; which rows parse does not depend on PRESENT_YEAR.
+        criteria = {time_column: None, **({"Domain": list(domains)} if domains else {})}
+        return _select(df, index.select(**criteria))[list(columns)]
+
+    return select
+
+
+FIGURES: Tuple[FigureSpec, ...] = (
+    FigureSpec("fig01_esp_framework_diagram", _no_data, _figure_framework_diagram),
+    FigureSpec(
+        "fig02_evolution_esp_vs_time",
+        _domain_slice(["Evolution"], "years_bp", ["years_bp", "log10_ESP"]),
+        _figure_evolution,
+    ),
+    FigureSpec(
+        "fig03_domestication_breeding_esp_vs_time",
+        _domain_slice(["Domestication", "Breeding"], "year_ce", ["year_ce", "log10_ESP", "Domain"]),
+        _figure_domestication_breeding,
+    ),
+    FigureSpec(
+        "fig04_molecular_biotech_esp_vs_time",
+        _domain_slice(["Protein engineering"], "year_ce", ["year_ce", "log10_ESP", "Subdomain"]),
+        _figure_molecular,
+    ),
+    FigureSpec(
+        "fig05_medicine_esp_vs_time",
+        _domain_slice(["Medicine"], "year_ce", ["year_ce", "log10_ESP", "Subdomain"]),
+        _figure_medicine,
+    ),
+    FigureSpec(
+        "fig06_unified_curve_overlay",
+        _domain_slice([], "years_bp", ["years_bp", "log10_ESP", "Domain"]),
+        _figure_unified_curve,
+    ),
+    FigureSpec("fig07_doubling_time_analysis", _domain_trends, _figure_doubling_time),
+    FigureSpec("fig08_projection_to_esp1", _domain_trends, _figure_projection),
+)
+_FIGURES_BY_NAME = {spec.name: spec for spec in FIGURES}
+
+
+def _slice_key(spec: FigureSpec, subset: pd.DataFrame, formats: Sequence[str], dpi: int) -> str:
+    """Hash the plotted slice, render options and drawing code of a figure."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([spec.name, list(formats), dpi, THEME]).encode("utf-8"))
+    digest.update(inspect.getsource(spec.draw).encode("utf-8"))
+    digest.update(repr(list(subset.dtypes.astype(str).items())).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(subset, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _restore_cached(name: str, key: str, formats: Sequence[str], output_dir: Path) -> bool:
+    """Copy a figure's outputs from the content-addressed store, if present."""
+    entry = FIGURE_CACHE_DIR / key
+    cached = [entry / f"{name}.{fmt}" for fmt in formats]
+    if not all(path.exists() for path in cached):
+        return False
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for path in cached:
+        shutil.copyfile(path, output_dir / path.name)
+    return True
+
+
+def _store_cached(key: str, paths: Sequence[Path]) -> None:
+    entry = FIGURE_CACHE_DIR / key
+    entry.mkdir(parents=True, exist_ok=True)
+    for path in paths:
+        shutil.copyfile(path, entry / path.name)
+
+
+def _init_worker() -> None:
+    matplotlib.use("Agg")
+    sns.set_theme(**THEME)
+
+
+def _render(name: str, subset: pd.DataFrame, formats: Sequence[str], dpi: int) -> List[str]:
+    with span(f"figure:{name}", rows=len(subset)):
+        fig = _FIGURES_BY_NAME[name].draw(subset)
+        if fig is None:
+            return []
+        return [str(path) for path in _save_figure(fig, name, formats, dpi)]
+
+
+def render_figures(
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    dpi: int = DEFAULT_DPI,
+    force: bool = False,
+    index: Optional[MasterIndex] = None,
+) -> Dict[str, str]:
+    """
+    Render every figure in ``FIGURES``, each in its own worker process.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Master table with time columns added.
+    workers : int, optional
+        Process pool size; ``None`` uses all cores and ``1`` renders in-process.
+    formats : sequence of str
+        Output formats, e.g. ``("png",)`` for previews or ``("png", "pdf")``.
+    dpi : int
+        Resolution for raster formats.
+    force : bool
+        Render even if the figure's slice and options match the last render
+        or a cached copy.
+    index : MasterIndex, optional
+        Secondary indexes of ``df`` used to select each figure's slice; built
+        from ``df`` if not given.
+
+    Returns
+    -------
+    Dict[str, str]
+        Figure name to status: ``rendered``, ``cached``, ``skipped`` or ``empty``.
+    """
+    manifest = json.loads(MANIFEST_PATH.read_text()) if MANIFEST_PATH.exists() else {}
+    output_dir = ROOT / "results/figures"
+    status: Dict[str, str] = {}
+    jobs = []
+    index = index if index is not None else MasterIndex.build(df)
+    # Figures sharing a select function (fig07/fig08 trends) compute it once.
+    selections: Dict[Callable, pd.DataFrame] = {}
+    for spec in FIGURES:
+        if spec.select not in selections:
+            selections[spec.select] = spec.select(df, index)
+        subset = selections[spec.select]
+        key = _slice_key(spec, subset, formats, dpi)
+        up_to_date = manifest.get(spec.name) == key and all(
+            (output_dir / f"{spec.name}.{fmt}").exists() for fmt in formats
+        )
+        if not force and up_to_date:
+            status[spec.name] = "skipped"
+            continue
+        if not force and _restore_cached(spec.name, key, formats, output_dir):
+            status[spec.name] = "cached"
+            manifest[spec.name] = key
+            continue
+        jobs.append((spec.name, subset, key))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    args = ([name for name, _, _ in jobs], [subset for _, subset, _ in jobs])
+    if workers <= 1 or len(jobs) <= 1:
+        _init_worker()
+        results = [_render(name, subset, formats, dpi) for name, subset in zip(*args)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker) as executor:
+            results = list(
+                executor.map(_render, *args, [formats] * len(jobs), [dpi] * len(jobs))
+            )
+
+    for (name, _, key), paths in zip(jobs, results):
+        status[name] = "rendered" if paths else "empty"
+        if paths:
+            _store_cached(key, [Path(path) for path in paths])
+            manifest[name] = key
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    partial = MANIFEST_PATH.with_name(f"{MANIFEST_PATH.name}.{os.getpid()}.partial")
+    partial.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(partial, MANIFEST_PATH)
+    return status
+
+
+def main(
+    workers: Optional[int] = None,
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    dpi: int = DEFAULT_DPI,
+    force: bool = False,
+) -> None:
     df = _add_time_columns(_load_master_table())
-    _figure_framework_diagram()
-    _figure_evolution(df)
-    _figure_domestication_breeding(df)
-    _figure_molecular(df)
-    _figure_medicine(df)
-    _figure_unified_curve(df)
-    _figure_doubling_time(df)
-    _figure_projection(df)
+    render_figures(df, workers=workers, formats=formats, dpi=dpi, force=force, index=read_master_index(df))
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=0, help="Render processes (0 = all cores).")
+    parser.add_argument(
+        "--formats",
+        default=",".join(DEFAULT_FORMATS),
+        help="Comma-separated output formats (e.g. 'png' for previews).",
+    )
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI, help="Raster output resolution.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render figures even if unchanged or cached.",
+    )
+    args = parser.parse_args()
+    main(
+        workers=args.workers or None,
+        formats=[fmt.strip() for fmt in args.formats.split(",") if fmt.strip()],
+        dpi=args.dpi,
+        force=args.force,
+    )
@@ -4,21 +4,103 @@ Build the master ESP table by consolidating all domain datasets.
 Outputs
 -------
 data/master_esp_table.csv
+data/master_esp_table.parquet
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import math
+import os
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 import numpy as np
 import pandas as pd
 
+from src.utils import artifacts, esp_uncertainty
+from src.utils.artifacts import read_table, table_digest
+from src.utils.esp_uncertainty import N_SAMPLES, PERCENTILE_COLUMNS, esp_percentiles
+from src.utils.master_table_io import apply_master_schema, normalize_esp, write_master_table
+from src.utils.tracing import span, traced
+
 ROOT = Path(__file__).resolve().parents[2]
 PCS_ASSIGNMENTS_PATH = ROOT / "data/pcs_assignments.csv"
+CACHE_DIR = ROOT / ".cache/master_esp_table"
+
+# Columns (and dtypes) each row builder reads from its input tables. Counts
+# are read as floats: the builders convert them with int()/float() and some
+# may be missing.
+PCS_ASSIGNMENT_DTYPES = {
+    "Domain": str,
+    "Subdomain_pattern": str,
+    "PCS_level": "int64",
+    "PCS_score": "float64",
+    "PCS_method": str,
+    "PCS_notes": str,
+}
+MAJOR_TRANSITION_DTYPES = {
+    "transition": str,
+    "time_window_notes": str,
+    "esp_low": "float64",
+    "esp_high": "float64",
+    "log10_esp_low": "float64",
+    "log10_esp_high": "float64",
+}
+CIMMYT_DTYPES = {
+    "program": str,
+    "period_start": "int64",
+    "period_end": "int64",
+    "total_experiments": "float64",
+    "released_varieties": "float64",
+    "esp_breeding": "float64",
+    "log10_esp_breeding": "float64",
+    "data_quality": "int64",
+    "sources": str,
+}
+PROTEIN_DTYPES = {
+    "year": "float64",
+    "experiments_tested": "float64",
+    "successes": "float64",
+    "esp": "float64",
+    "log10_esp": "float64",
+    "data_quality_score": "float64",
+    "doi": str,
+    "source_url": str,
+}
+NNT_DTYPES = {
+    "nnt": "float64",
+    "year": "float64",
+    "data_quality_score": "float64",
+    "source_url": str,
+}
+FDA_DTYPES = {
+    **NNT_DTYPES,
+    "nnt_type": str,
+    "treatment_n": "float64",
+    "treatment_response_count": "float64",
+    "control_n": "float64",
+    "control_response_count": "float64",
+}
+GENE_THERAPY_DTYPES = {
+    "esp": "float64",
+    "year": "float64",
+    "data_quality_score": "float64",
+    "n_treated": "float64",
+    "responders_n": "float64",
+    "source_url": str,
+}
+
+
+def _read_columns(path: Path, dtypes: Dict[str, Any], through_store: bool = True) -> pd.DataFrame:
+    """Read the ``dtypes`` columns of ``path`` (through the artifact store unless ``through_store`` is False)."""
+    if through_store:
+        return read_table(path, usecols=list(dtypes), dtype=dtypes)
+    return pd.read_csv(path, usecols=list(dtypes), dtype=dtypes)
 
 
 def _log10(value: float) -> float:
@@ -44,10 +126,27 @@ def _extract_year(text: str) -> str:
     return match.group(0) if match else "unknown"
 
 
+def _binomial_dist(trials: Any, successes: Any) -> Dict[str, Any]:
+    """ESP sampling distribution fields for a counts-based row (empty unless 0 <= successes <= trials)."""
+    if pd.isna(trials) or pd.isna(successes) or not 0 <= float(successes) <= float(trials):
+        return {}
+    return {"ESP_dist": "binomial", "ESP_dist_params": (float(trials), float(successes))}
+
+
+def _fda_dist(row: pd.Series) -> Dict[str, Any]:
+    counts = row[["treatment_n", "treatment_response_count", "control_n", "control_response_count"]]
+    valid = counts.notna().all() and 0 <= counts.iloc[1] <= counts.iloc[0] and 0 <= counts.iloc[3] <= counts.iloc[2]
+    if row["nnt_type"] == "difference-based" and valid:
+        return {"ESP_dist": "binomial_difference", "ESP_dist_params": tuple(float(value) for value in counts)}
+    if row["nnt_type"] == "single-arm (assumes 0 baseline)":
+        return _binomial_dist(row["treatment_n"], row["treatment_response_count"])
+    return {}
+
+
 def _load_pcs_assignments() -> List[Dict[str, Any]]:
     if not PCS_ASSIGNMENTS_PATH.exists():
         raise FileNotFoundError(f"Missing PCS assignments: {PCS_ASSIGNMENTS_PATH}")
-    df = pd.read_csv(PCS_ASSIGNMENTS_PATH)
+    df = _read_columns(PCS_ASSIGNMENTS_PATH, PCS_ASSIGNMENT_DTYPES, through_store=False)
     assignments: List[Dict[str, Any]] = []
     for _, row in df.iterrows():
         domain = str(row.get("Domain", "")).strip()
@@ -67,53 +166,63 @@ def _load_pcs_assignments() -> List[Dict[str, Any]]:
     return assignments
 
 
-def _match_pcs(domain: str, subdomain: str, assignments: List[Dict[str, Any]]) -> Dict[str, Any] | None:
-    for assignment in assignments:
-        assignment_domain = assignment["domain"]
-        if assignment_domain not in {"*", "ANY", "Any", "any"} and assignment_domain != domain:
+_ANY_DOMAIN = {"*", "ANY", "Any", "any"}
+
+
+def _match_pcs_pairs(pairs: pd.DataFrame, assignments: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Return the index of the first matching assignment for each unique pair.
+
+    Assignments are applied in priority order, each as one vectorized
+    ``str.contains`` over the pairs still unmatched, so the first match wins.
+    Unmatched pairs get -1.
+    """
+    match_idx = np.full(len(pairs), -1, dtype=int)
+    domains = pairs["Domain"]
+    subdomains = pairs["Subdomain"]
+    for position, assignment in enumerate(assignments):
+        pending = match_idx < 0
+        if not pending.any():
+            break
+        if assignment["domain"] not in _ANY_DOMAIN:
+            pending &= (domains == assignment["domain"]).to_numpy()
+        if not pending.any():
             continue
-        if assignment["pattern"].search(subdomain):
-            return assignment
-    return None
+        hits = subdomains[pending].str.contains(assignment["pattern"], regex=True).to_numpy(dtype=bool)
+        match_idx[np.flatnonzero(pending)[hits]] = position
+    return match_idx
 
 
+@traced()
 def _apply_pcs_assignments(df: pd.DataFrame) -> pd.DataFrame:
     assignments = _load_pcs_assignments()
-    pcs_levels: List[int | None] = []
-    pcs_scores: List[float | None] = []
-    pcs_methods: List[str | None] = []
-    pcs_notes: List[str | None] = []
-    esp_normalized: List[float | None] = []
-    log10_esp_normalized: List[float | None] = []
+    keys = pd.MultiIndex.from_arrays([df["Domain"].astype(str), df["Subdomain"].astype(str)])
+    codes, unique_keys = pd.factorize(keys)
+    pairs = unique_keys.to_frame(index=False, name=["Domain", "Subdomain"])
+    row_match = _match_pcs_pairs(pairs, assignments)[codes]
 
-    for _, row in df.iterrows():
-        match = _match_pcs(str(row["Domain"]), str(row["Subdomain"]), assignments)
-        if match is None:
-            pcs_levels.append(None)
-            pcs_scores.append(None)
-            pcs_methods.append(None)
-            pcs_notes.append(None)
-            esp_normalized.append(None)
-            log10_esp_normalized.append(None)
-            continue
-        pcs_score = float(match["pcs_score"])
-        pcs_levels.append(int(match["pcs_level"]))
-        pcs_scores.append(pcs_score)
-        pcs_methods.append(match["pcs_method"])
-        pcs_notes.append(match["pcs_notes"])
-        if pcs_score > 0:
-            esp_norm = float(row["ESP"]) / pcs_score
-            esp_normalized.append(esp_norm)
-            log10_esp_normalized.append(_log10(esp_norm))
-        else:
-            esp_normalized.append(None)
-            log10_esp_normalized.append(None)
+    # Trailing all-missing entry is selected by unmatched rows (index -1).
+    lookup = pd.DataFrame(
+        {
+            "PCS_level": pd.array([a["pcs_level"] for a in assignments] + [None], dtype="Int64"),
+            "PCS_score": [a["pcs_score"] for a in assignments] + [np.nan],
+            "PCS_method": [a["pcs_method"] for a in assignments] + [None],
+            "PCS_notes": [a["pcs_notes"] for a in assignments] + [None],
+        }
+    )
+    matched = lookup.iloc[row_match].set_axis(df.index)
+    score = matched["PCS_score"].to_numpy(dtype=float)
+    esp = pd.to_numeric(df["ESP"]).to_numpy(dtype=float)
+    esp_normalized, log10_esp_normalized = normalize_esp(esp, score)
+    bad = esp_normalized <= 0
+    if bad.any():
+        raise ValueError(f"ESP must be positive; got {esp_normalized[bad][0]}")
 
     return df.assign(
-        PCS_level=pcs_levels,
-        PCS_score=pcs_scores,
-        PCS_method=pcs_methods,
-        PCS_notes=pcs_notes,
+        PCS_level=matched["PCS_level"],
+        PCS_score=matched["PCS_score"],
+        PCS_method=matched["PCS_method"],
+        PCS_notes=matched["PCS_notes"],
         ESP_normalized=esp_normalized,
         log10_ESP_normalized=log10_esp_normalized,
     )
@@ -121,7 +230,7 @@ def _apply_pcs_assignments(df: pd.DataFrame) -> pd.DataFrame:
 
 def _rows_domain_a_major_transitions() -> List[Dict[str, Any]]:
     path = ROOT / "data/domain_A_evolution/a2_major_transitions_esp_estimates.csv"
-    df = pd.read_csv(path)
+    df = _read_columns(path, MAJOR_TRANSITION_DTYPES, through_store=False)
     rows: List[Dict[str, Any]] = []
     for _, row in df.iterrows():
         log10_low = row.get("log10_esp_low")
@@ -129,6 +238,7 @@ def _rows_domain_a_major_transitions() -> List[Dict[str, Any]]:
         if pd.notna(log10_low) and pd.notna(log10_high):
             log10_esp = float((log10_low + log10_high) / 2.0)
             esp = 10 ** log10_esp
+            bounds = (float(log10_low), float(log10_high))
         else:
             esp_low = row.get("esp_low")
             esp_high = row.get("esp_high")
@@ -136,6 +246,7 @@ def _rows_domain_a_major_transitions() -> List[Dict[str, Any]]:
                 continue
             esp = math.sqrt(float(esp_low) * float(esp_high))
             log10_esp = _log10(esp)
+            bounds = (_log10(float(esp_low)), _log10(float(esp_high)))
         rows.append(
             {
                 "Domain": "Evolution",
@@ -145,6 +256,8 @@ def _rows_domain_a_major_transitions() -> List[Dict[str, Any]]:
                 "log10_ESP": log10_esp,
                 "Quality_score": 2,
                 "Source": "Maynard Smith & Szathmary 1995; A2 major transitions",
+                "ESP_dist": "log_uniform",
+                "ESP_dist_params": bounds,
             }
         )
     return rows
@@ -240,7 +353,7 @@ def _rows_domain_b_domestication() -> List[Dict[str, Any]]:
 def _rows_domain_c_breeding() -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
     c2_path = ROOT / "results/tables/tbl01_cimmyt_esp.csv"
-    df = pd.read_csv(c2_path)
+    df = _read_columns(c2_path, CIMMYT_DTYPES)
     for _, row in df.iterrows():
         rows.append(
             {
@@ -251,6 +364,8 @@ def _rows_domain_c_breeding() -> List[Dict[str, Any]]:
                 "log10_ESP": float(row["log10_esp_breeding"]),
                 "Quality_score": int(row["data_quality"]),
                 "Source": row["sources"],
+                "ESP_dist": "binomial",
+                "ESP_dist_params": (float(row["total_experiments"]), float(row["released_varieties"])),
             }
         )
     rows.extend(
@@ -282,9 +397,10 @@ def _rows_domain_c_speed_breeding() -> List[Dict[str, Any]]:
     data_path = ROOT / "data/domain_c_breeding/speed_breeding_data.json"
     data = json.loads(data_path.read_text())
     cimmyt_path = ROOT / "results/tables/tbl01_cimmyt_esp.csv"
-    cimmyt = pd.read_csv(cimmyt_path)
+    cimmyt = _read_columns(cimmyt_path, CIMMYT_DTYPES)
     wheat_row = cimmyt[cimmyt["program"].str.contains("wheat", case=False)].iloc[0]
     baseline_esp = float(wheat_row["esp_breeding"])
+    baseline_counts = (float(wheat_row["total_experiments"]), float(wheat_row["released_varieties"]))
     rows: List[Dict[str, Any]] = []
     for record in data.get("records", []):
         if record.get("crop") != "wheat":
@@ -303,6 +419,8 @@ def _rows_domain_c_speed_breeding() -> List[Dict[str, Any]]:
                 "log10_ESP": _log10(esp),
                 "Quality_score": 3,
                 "Source": source,
+                "ESP_dist": "speedup",
+                "ESP_dist_params": baseline_counts + (float(speedup["min"]), float(speedup["max"])),
             }
         )
     return rows
@@ -311,7 +429,7 @@ def _rows_domain_c_speed_breeding() -> List[Dict[str, Any]]:
 def _rows_domain_d_protein_engineering() -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
     d1_path = ROOT / "results/tables/tbl_d1_directed_evolution_esp.csv"
-    d1 = pd.read_csv(d1_path)
+    d1 = _read_columns(d1_path, PROTEIN_DTYPES)
     for _, row in d1.iterrows():
         source = row.get("doi")
         if pd.isna(source) or not str(source).strip():
@@ -325,10 +443,11 @@ def _rows_domain_d_protein_engineering() -> List[Dict[str, Any]]:
                 "log10_ESP": float(row["log10_esp"]),
                 "Quality_score": int(row["data_quality_score"]),
                 "Source": source,
+                **_binomial_dist(row["experiments_tested"], row["successes"]),
             }
         )
     d2_path = ROOT / "results/tables/tbl_d2_ml_guided_esp.csv"
-    d2 = pd.read_csv(d2_path)
+    d2 = _read_columns(d2_path, PROTEIN_DTYPES)
     for _, row in d2.iterrows():
         source = row.get("doi")
         if pd.isna(source) or not str(source).strip():
@@ -342,6 +461,7 @@ def _rows_domain_d_protein_engineering() -> List[Dict[str, Any]]:
                 "log10_ESP": float(row["log10_esp"]),
                 "Quality_score": int(row["data_quality_score"]),
                 "Source": source,
+                **_binomial_dist(row["experiments_tested"], row["successes"]),
             }
         )
     return rows
@@ -350,7 +470,7 @@ def _rows_domain_d_protein_engineering() -> List[Dict[str, Any]]:
 def _rows_domain_e_medicine() -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
     nnt_path = ROOT / "data/domain_e/processed/nnt_database.csv"
-    nnt = pd.read_csv(nnt_path)
+    nnt = _read_columns(nnt_path, NNT_DTYPES)
     for _, row in nnt.iterrows():
         esp = float(row["nnt"])
         rows.append(
@@ -365,7 +485,7 @@ def _rows_domain_e_medicine() -> List[Dict[str, Any]]:
             }
         )
     fda_path = ROOT / "data/domain_e/processed/fda_pivotal_trials.csv"
-    fda = pd.read_csv(fda_path)
+    fda = _read_columns(fda_path, FDA_DTYPES)
     for _, row in fda.iterrows():
         esp = float(row["nnt"])
         rows.append(
@@ -377,10 +497,11 @@ def _rows_domain_e_medicine() -> List[Dict[str, Any]]:
                 "log10_ESP": _log10(esp),
                 "Quality_score": int(row["data_quality_score"]),
                 "Source": row.get("source_url", ""),
+                **_fda_dist(row),
             }
         )
     e4_path = ROOT / "data/domain_e/processed/e4_gene_therapy_cart_outcomes.csv"
-    e4 = pd.read_csv(e4_path)
+    e4 = _read_columns(e4_path, GENE_THERAPY_DTYPES, through_store=False)
     for _, row in e4.iterrows():
         esp = float(row["esp"])
         rows.append(
@@ -392,49 +513,175 @@ def _rows_domain_e_medicine() -> List[Dict[str, Any]]:
                 "log10_ESP": _log10(esp),
                 "Quality_score": int(row["data_quality_score"]),
                 "Source": row.get("source_url", ""),
+                **_binomial_dist(row["n_treated"], row["responders_n"]),
             }
         )
     return rows
 
 
-def build_master_table() -> pd.DataFrame:
-    rows: List[Dict[str, Any]] = []
-    rows.extend(_rows_domain_a_major_transitions())
-    rows.extend(_rows_domain_a_mutation_rates())
-    rows.extend(_rows_domain_b_domestication())
-    rows.extend(_rows_domain_c_breeding())
-    rows.extend(_rows_domain_c_speed_breeding())
-    rows.extend(_rows_domain_d_protein_engineering())
-    rows.extend(_rows_domain_e_medicine())
-    df = pd.DataFrame(rows)
-    df = _apply_pcs_assignments(df)
-    df = df[
-        [
-            "Domain",
-            "Subdomain",
-            "Time_period",
-            "ESP",
-            "log10_ESP",
-            "PCS_level",
-            "PCS_score",
-            "PCS_method",
-            "PCS_notes",
-            "ESP_normalized",
-            "log10_ESP_normalized",
-            "Quality_score",
-            "Source",
-        ]
-    ]
-    df = df.replace({np.nan: None})
+@dataclass(frozen=True)
+class DomainBlock:
+    """A domain row builder and the input files its rows are derived from."""
+
+    name: str
+    builder: Callable[[], List[Dict[str, Any]]]
+    inputs: Tuple[str, ...]
+
+
+DOMAIN_BLOCKS: Tuple[DomainBlock, ...] = (
+    DomainBlock(
+        "a_major_transitions",
+        _rows_domain_a_major_transitions,
+        ("data/domain_A_evolution/a2_major_transitions_esp_estimates.csv",),
+    ),
+    DomainBlock("a_mutation_rates", _rows_domain_a_mutation_rates, ()),
+    DomainBlock("b_domestication", _rows_domain_b_domestication, ("data/domain_b/domestication_data.json",)),
+    DomainBlock("c_breeding", _rows_domain_c_breeding, ("results/tables/tbl01_cimmyt_esp.csv",)),
+    DomainBlock(
+        "c_speed_breeding",
+        _rows_domain_c_speed_breeding,
+        ("data/domain_c_breeding/speed_breeding_data.json", "results/tables/tbl01_cimmyt_esp.csv"),
+    ),
+    DomainBlock(
+        "d_protein_engineering",
+        _rows_domain_d_protein_engineering,
+        ("results/tables/tbl_d1_directed_evolution_esp.csv", "results/tables/tbl_d2_ml_guided_esp.csv"),
+    ),
+    DomainBlock(
+        "e_medicine",
+        _rows_domain_e_medicine,
+        (
+            "data/domain_e/processed/nnt_database.csv",
+            "data/domain_e/processed/fda_pivotal_trials.csv",
+            "data/domain_e/processed/e4_gene_therapy_cart_outcomes.csv",
+        ),
+    ),
+)
+
+MASTER_COLUMNS = [
+    "Domain",
+    "Subdomain",
+    "Time_period",
+    "ESP",
+    "log10_ESP",
+    *PERCENTILE_COLUMNS,
+    "PCS_level",
+    "PCS_score",
+    "PCS_method",
+    "PCS_notes",
+    "ESP_normalized",
+    "log10_ESP_normalized",
+    "Quality_score",
+    "Source",
+]
+
+
+def _block_fingerprint(block: DomainBlock, samples: int = N_SAMPLES) -> str:
+    """
+    Hash the block code, its input files, the PCS rubric and the sampling setup.
+
+    The code is this whole module (builders, their helpers and read dtypes)
+    plus the modules that read inputs and sample percentiles, so an edit to any
+    helper a builder calls invalidates the cached block.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{block.name}|{samples}".encode("utf-8"))
+    for source in (__file__, esp_uncertainty.__file__, artifacts.__file__):
+        digest.update(Path(source).read_bytes())
+    for path in [ROOT / rel for rel in block.inputs] + [PCS_ASSIGNMENTS_PATH]:
+        digest.update(str(path.relative_to(ROOT)).encode("utf-8"))
+        digest.update(table_digest(path))
+    return digest.hexdigest()
+
+
+def _build_block(block: DomainBlock, samples: int = N_SAMPLES) -> pd.DataFrame:
+    with span(f"master.rows:{block.name}") as current:
+        rows = block.builder()
+        current.rows = len(rows)
+    if not rows:
+        return pd.DataFrame()
+    df = _apply_pcs_assignments(pd.DataFrame(rows))
+    with span(f"master.uncertainty:{block.name}", rows=len(df)):
+        return df.join(esp_percentiles(df, samples))
+
+
+def _cached_block(block: DomainBlock, cache_dir: Path, samples: int = N_SAMPLES) -> pd.DataFrame:
+    """
+    Load a block from ``cache_dir`` if its fingerprint matches, else rebuild it.
+
+    Blocks are cached as Parquet fragments typed by ``MASTER_SCHEMA``. A rebuilt
+    fragment is written under a temporary name and moved into place with
+    ``os.replace`` before the block's stale fragments are deleted, so an
+    interrupted build never leaves a partial fragment under a valid name.
+    """
+    fingerprint = _block_fingerprint(block, samples)[:16]
+    path = cache_dir / f"{block.name}-{fingerprint}.parquet"
+    if path.exists():
+        return pd.read_parquet(path)
+    df = _build_block(block, samples)
+    if not df.empty:
+        df = apply_master_schema(df[MASTER_COLUMNS])
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+    df.to_parquet(partial, index=False)
+    os.replace(partial, path)
+    for stale in cache_dir.glob(f"{block.name}-*"):
+        if stale != path and stale.suffix in (".parquet", ".pkl"):
+            stale.unlink()
     return df
 
 
-def main() -> None:
-    df = build_master_table()
-    output_path = ROOT / "data/master_esp_table.csv"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+@traced()
+def build_master_table(
+    incremental: bool = False,
+    cache_dir: Path = CACHE_DIR,
+    samples: int = N_SAMPLES,
+) -> pd.DataFrame:
+    """
+    Build the master ESP table from every domain block.
+
+    Parameters
+    ----------
+    incremental : bool
+        Reuse cached domain blocks whose builder code, input files and PCS
+        assignments are unchanged; only stale blocks are recomputed.
+    cache_dir : Path
+        Location of the per-block cache used in incremental mode.
+    samples : int
+        Monte Carlo draws per row for the log10 ESP percentile columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Master table with PCS and uncertainty columns applied, typed by
+        ``MASTER_SCHEMA``.
+    """
+    blocks = []
+    for block in DOMAIN_BLOCKS:
+        df = _cached_block(block, cache_dir, samples) if incremental else _build_block(block, samples)
+        if not df.empty:
+            blocks.append(df)
+    df = pd.concat(blocks, ignore_index=True)
+    return apply_master_schema(df[MASTER_COLUMNS])
+
+
+def main(incremental: bool = False, samples: int = N_SAMPLES) -> None:
+    df = build_master_table(incremental=incremental, samples=samples)
+    write_master_table(df)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse cached domain blocks whose inputs are unchanged.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=N_SAMPLES,
+        help="Monte Carlo draws per row for the log10 ESP percentiles.",
+    )
+    args = parser.parse_args()
+    main(incremental=args.incremental, samples=args.samples)
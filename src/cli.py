@@ -0,0 +1,146 @@
+"""
+Single-process command-line entry point for the ESP pipeline.
+
+Usage: ``python -m src.cli <command>`` (aliased as ``esp`` in the README).
+
+Stages (see ``src/pipeline.py``) are registered by module path and imported
+only when they run, so ``validate`` never loads pandas and ``fit`` never loads
+matplotlib. Running ``build``/``all`` executes every stage in one interpreter:
+heavy libraries are imported once, independent stages run concurrently with
+``--jobs``, and each stage's import and run time is reported on stderr.
+
+Commands
+--------
+build     Preprocessing and per-domain analysis (the ``make build`` outputs).
+master    Rebuild the master ESP table.
+fit       Fit learning-curve models (f2).
+plot      Render figures (f3).
+validate  Check generated outputs.
+compute   Run named stages regardless of timestamps (e.g. ``compute c2 e1``).
+all       build, master, fit, plot and validate; validate runs after every
+          table it checks is written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+from src.pipeline import (
+    BUILD_STAGES,
+    CHECK_MODES,
+    FIT_STAGE,
+    MASTER_STAGE,
+    PLOT_STAGE,
+    STAGES,
+    VALIDATE_STAGE,
+    Stage,
+    StageTiming,
+    final_outputs,
+    run_pipeline,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+COMMANDS: Dict[str, Tuple[Stage, ...]] = {
+    "build": BUILD_STAGES,
+    "master": (MASTER_STAGE,),
+    "fit": (FIT_STAGE,),
+    "plot": (PLOT_STAGE,),
+    "validate": (VALIDATE_STAGE,),
+    "all": BUILD_STAGES + (MASTER_STAGE, FIT_STAGE, PLOT_STAGE, VALIDATE_STAGE),
+}
+
+
+def _option_values(args: argparse.Namespace) -> Dict[str, object]:
+    """Translate parsed arguments into stage keyword arguments."""
+    return {
+        "offline": args.offline,
+        "incremental": args.incremental,
+        "workers": args.workers or None,
+        "formats": [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()],
+        "dpi": args.dpi,
+        "force": args.force,
+    }
+
+
+def _report(timings: Sequence[StageTiming], total_seconds: float) -> None:
+    width = max([len(timing.name) for timing in timings] + [5])
+    print(f"{'stage':<{width}}  {'status':<10}  {'import s':>8}  {'run s':>8}", file=sys.stderr)
+    for timing in timings:
+        print(
+            f"{timing.name:<{width}}  {timing.status:<10}  "
+            f"{timing.import_seconds:>8.3f}  {timing.run_seconds:>8.3f}",
+            file=sys.stderr,
+        )
+    print(f"{'total':<{width}}  {'':<10}  {'':>8}  {total_seconds:>8.3f}", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="esp", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=sorted(COMMANDS) + ["compute"])
+    parser.add_argument("stages", nargs="*", help="Stage names for 'compute'.")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Run build stages even if their outputs are up to date.",
+    )
+    parser.add_argument("--jobs", type=int, default=1, help="Stages run concurrently.")
+    parser.add_argument(
+        "--check",
+        choices=CHECK_MODES,
+        default="hash",
+        help="Up-to-date test: content hash of inputs (default) or make-style mtimes.",
+    )
+    parser.add_argument(
+        "--sinks",
+        choices=("all", "final"),
+        default="all",
+        help="Write every output, or only outputs no other selected stage reads.",
+    )
+    parser.add_argument("--offline", action="store_true", help="TheNNT pages from cache only.")
+    parser.add_argument("--incremental", action="store_true", help="Reuse cached master blocks.")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = automatic).")
+    parser.add_argument("--formats", default="png,pdf", help="Comma-separated figure formats.")
+    parser.add_argument("--dpi", type=int, default=300, help="Raster figure resolution.")
+    parser.add_argument("--force", action="store_true", help="Re-render unchanged figures.")
+    parser.add_argument("--quiet", action="store_true", help="Do not print the timing report.")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "compute":
+        unknown = [name for name in args.stages if name not in STAGES]
+        if not args.stages or unknown:
+            parser.error(f"compute needs stage names from: {', '.join(STAGES)}")
+        stages: Sequence[Stage] = [STAGES[name] for name in args.stages]
+        rebuild = True
+    else:
+        if args.stages:
+            parser.error(f"'{args.command}' takes no stage names")
+        stages = COMMANDS[args.command]
+        rebuild = args.rebuild
+
+    # Several stages resolve paths relative to the working directory.
+    os.chdir(ROOT)
+    start = time.perf_counter()
+    timings = run_pipeline(
+        stages,
+        _option_values(args),
+        jobs=args.jobs,
+        sinks=final_outputs(stages) if args.sinks == "final" else None,
+        check=args.check,
+        rebuild=rebuild,
+    )
+    if not args.quiet:
+        _report(timings, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
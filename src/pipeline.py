@@ -0,0 +1,413 @@
+"""
+In-process DAG runner for the ESP pipeline.
+
+Each ``Stage`` names a ``module:function`` and the repo-relative files it
+reads and writes (mirroring the Makefile rules). Dependencies are derived from
+those paths: a stage runs after every stage that produces one of its inputs.
+Independent stages (the Domain A-E computations) run concurrently in a thread
+pool, and tables are handed between stages in memory through
+``src/utils/artifacts.py``. Only sink paths are written to disk.
+
+Stages are skipped when their outputs exist and are up to date, either by
+mtime (as make does) or by a content hash of inputs and stage source recorded
+in ``.cache/pipeline/state.json``. The stage source is the stage module plus
+every ``src`` module it imports, directly or through other ``src`` modules,
+found by parsing the imports (stage modules are not imported for the check).
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from src.utils.tracing import span
+
+ROOT = Path(__file__).resolve().parents[1]
+STATE_PATH = ROOT / ".cache/pipeline/state.json"
+CHECK_MODES = ("hash", "mtime")
+PACKAGE = "src"
+
+
+def _module_path(module: str) -> Optional[Path]:
+    path = ROOT / (module.replace(".", "/") + ".py")
+    return path if path.exists() else None
+
+
+@lru_cache(maxsize=None)
+def _imported_modules(path: Path) -> Tuple[str, ...]:
+    """``src`` modules imported anywhere in ``path`` (including function-level imports)."""
+    found = []
+    for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+        if isinstance(node, ast.Import):
+            candidates = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            # ``from src.utils import esp_uncertainty`` imports a module by name.
+            candidates = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        found.extend(
+            name for name in candidates if name.split(".")[0] == PACKAGE and _module_path(name) is not None
+        )
+    return tuple(sorted(set(found)))
+
+
+def module_sources(module: str) -> Tuple[Path, ...]:
+    """Source files of ``module`` and of every ``src`` module it imports, transitively."""
+    seen: Dict[str, Path] = {}
+    pending = [module]
+    while pending:
+        name = pending.pop()
+        path = _module_path(name)
+        if name in seen or path is None:
+            continue
+        seen[name] = path
+        pending.extend(_imported_modules(path))
+    return tuple(seen[name] for name in sorted(seen))
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A pipeline step resolved lazily from ``module:function``.
+
+    ``options`` names run options forwarded to the function as keyword
+    arguments. A stage without outputs always runs.
+    """
+
+    name: str
+    target: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    options: Tuple[str, ...] = ()
+
+    @property
+    def module(self) -> str:
+        return self.target.split(":")[0]
+
+    @property
+    def source(self) -> Path:
+        return ROOT / (self.module.replace(".", "/") + ".py")
+
+    @property
+    def sources(self) -> Tuple[Path, ...]:
+        """The stage module and every ``src`` module it depends on."""
+        return module_sources(self.module)
+
+    def load(self) -> Callable[..., object]:
+        module_name, function_name = self.target.split(":")
+        return getattr(importlib.import_module(module_name), function_name)
+
+    def outputs_exist(self) -> bool:
+        return bool(self.outputs) and all((ROOT / path).exists() for path in self.outputs)
+
+    def is_current(self) -> bool:
+        """Make-style check: every output is newer than every input and source file."""
+        if not self.outputs_exist():
+            return False
+        inputs = [ROOT / path for path in self.inputs] + list(self.sources)
+        newest_input = max(path.stat().st_mtime for path in inputs if path.exists())
+        return min((ROOT / path).stat().st_mtime for path in self.outputs) >= newest_input
+
+    def digest(self) -> str:
+        """Hash of the stage sources and the on-disk bytes of its inputs."""
+        digest = hashlib.sha256()
+        digest.update(self.target.encode("utf-8"))
+        for source in self.sources:
+            digest.update(source.relative_to(ROOT).as_posix().encode("utf-8"))
+            digest.update(source.read_bytes())
+        for path in self.inputs:
+            digest.update(path.encode("utf-8"))
+            if (ROOT / path).exists():
+                digest.update((ROOT / path).read_bytes())
+        return digest.hexdigest()
+
+
+BUILD_STAGES: Tuple[Stage, ...] = (
+    Stage(
+        "mutation_rates",
+        "src.preprocessing.compile_mutation_rates:compile_mutation_rates",
+        ("data/domain_A_evolution/mutation_rates_compilation.md",),
+        (
+            "data/domain_A_evolution/processed/mutation_rates_per_bp.csv",
+            "data/domain_A_evolution/processed/mutation_rates_per_genome.csv",
+        ),
+    ),
+    Stage(
+        "major_transitions",
+        "src.preprocessing.compile_major_transitions_esp:compile_major_transitions",
+        ("data/domain_A_evolution/a2_major_transitions_esp_estimates.csv",),
+        ("data/domain_A_evolution/processed/a2_major_transitions_esp_estimates.csv",),
+    ),
+    Stage(
+        "domestication",
+        "src.preprocessing.compile_domestication_timeline:compile_domestication_timeline",
+        ("data/domain_b/domestication_data.json",),
+        ("data/domain_b/processed/domestication_timeline_compilation.csv",),
+    ),
+    Stage(
+        "c2",
+        "src.analysis.c2_cimmyt_esp:main",
+        ("data/domain_c/c2_cimmyt_inputs.csv",),
+        ("results/tables/tbl01_cimmyt_esp.csv",),
+    ),
+    Stage(
+        "d1",
+        "src.analysis.d1_directed_evolution_esp:main",
+        ("data/domain_d/directed_evolution_outcomes.csv",),
+        ("results/tables/tbl_d1_directed_evolution_esp.csv",),
+    ),
+    Stage(
+        "d2",
+        "src.analysis.d2_ml_guided_esp:main",
+        ("data/domain_d/ml_guided_design_outcomes.csv",),
+        ("results/tables/tbl_d2_ml_guided_esp.csv",),
+    ),
+    Stage(
+        "thennt",
+        "src.preprocessing.extract_thennt_nnt:main",
+        ("data/domain_e/raw/thennt_pages.csv",),
+        (
+            "data/domain_e/raw/thennt_nnt_extracted.csv",
+            "data/domain_e/processed/nnt_database.csv",
+        ),
+        options=("offline",),
+    ),
+    Stage(
+        "fda",
+        "src.preprocessing.compile_fda_pivotal_trials:compile_fda_pivotal_trials",
+        ("data/domain_e/raw/fda_pivotal_trials_extracted.csv",),
+        ("data/domain_e/processed/fda_pivotal_trials.csv",),
+    ),
+    Stage(
+        "e1",
+        "src.analysis.e1_nnt_summary:main",
+        ("data/domain_e/processed/nnt_database.csv",),
+        (
+            "results/tables/tbl_e1_nnt_summary_by_area.csv",
+            "results/tables/tbl_e1_nnt_summary_by_area_time.csv",
+            "results/tables/tbl_e1_nnt_by_year.csv",
+        ),
+    ),
+    Stage(
+        "e2",
+        "src.analysis.e2_fda_summary:summarize_fda_trials",
+        ("data/domain_e/processed/fda_pivotal_trials.csv",),
+        (
+            "results/tables/tbl_e2_fda_trial_sizes_by_year.csv",
+            "results/tables/tbl_e2_fda_nnt_by_area.csv",
+        ),
+    ),
+    Stage(
+        "e4",
+        "src.analysis.e4_gene_therapy_esp:main",
+        ("data/domain_e/processed/e4_gene_therapy_cart_outcomes.csv",),
+        ("results/tables/tbl_e4_gene_therapy_esp.csv",),
+    ),
+)
+
+MASTER_STAGE = Stage(
+    "master",
+    "src.analysis.master_esp_table:main",
+    (
+        "data/pcs_assignments.csv",
+        "data/domain_A_evolution/a2_major_transitions_esp_estimates.csv",
+        "data/domain_b/domestication_data.json",
+        "data/domain_c_breeding/speed_breeding_data.json",
+        "results/tables/tbl01_cimmyt_esp.csv",
+        "results/tables/tbl_d1_directed_evolution_esp.csv",
+        "results/tables/tbl_d2_ml_guided_esp.csv",
+        "data/domain_e/processed/nnt_database.csv",
+        "data/domain_e/processed/fda_pivotal_trials.csv",
+        "data/domain_e/processed/e4_gene_therapy_cart_outcomes.csv",
+    ),
+    ("data/master_esp_table.csv",),
+    options=("incremental",),
+)
+FIT_STAGE = Stage(
+    "fit",
+    "src.analysis.f2_curve_fitting:main",
+    ("data/master_esp_table.csv",),
+    (
+        "results/tables/tbl_f2_analysis_dataset.csv",
+        "results/tables/tbl_f2_model_fits.csv",
+        "results/tables/tbl_f2_extrapolations.csv",
+        "results/tables/tbl_f2_piecewise_fits.csv",
+    ),
+    options=("workers",),
+)
+# f3 keeps its own per-figure cache, so the stage declares no outputs and runs
+# every time; the f2 input only orders it after the fits it reads.
+PLOT_STAGE = Stage(
+    "plot",
+    "src.analysis.f3_visualizations:main",
+    ("data/master_esp_table.csv", "results/tables/tbl_f2_model_fits.csv"),
+    options=("workers", "formats", "dpi", "force"),
+)
+# Validation reads every table written before it, so it runs last.
+VALIDATE_STAGE = Stage(
+    "validate",
+    "src.utils.validate_outputs:main",
+    tuple(path for stage in BUILD_STAGES + (MASTER_STAGE, FIT_STAGE) for path in stage.outputs),
+)
+
+STAGES: Dict[str, Stage] = {
+    stage.name: stage
+    for stage in BUILD_STAGES + (MASTER_STAGE, FIT_STAGE, PLOT_STAGE, VALIDATE_STAGE)
+}
+
+
+@dataclass
+class StageTiming:
+    name: str
+    status: str
+    import_seconds: float = 0.0
+    run_seconds: float = 0.0
+
+
+def stage_dependencies(stages: Sequence[Stage]) -> Dict[str, Set[str]]:
+    """Map each stage name to the names of stages in ``stages`` producing its inputs."""
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    return {
+        stage.name: {producers[path] for path in stage.inputs if path in producers} - {stage.name}
+        for stage in stages
+    }
+
+
+def final_outputs(stages: Sequence[Stage]) -> Set[str]:
+    """
+    Outputs of ``stages`` that no other stage in ``stages`` reads.
+
+    Reads by stages without outputs (``validate`` checks files on disk,
+    ``plot`` lists its inputs only for ordering) do not count.
+    """
+    consumed = {path for stage in stages if stage.outputs for path in stage.inputs}
+    return {path for stage in stages for path in stage.outputs if path not in consumed}
+
+
+def _load_state(path: Path) -> Dict[str, str]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save_state(path: Path, state: Mapping[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(state), indent=2, sort_keys=True))
+
+
+def run_pipeline(
+    stages: Sequence[Stage],
+    options: Mapping[str, object],
+    jobs: int = 1,
+    sinks: Optional[Iterable[str]] = None,
+    check: str = "hash",
+    rebuild: bool = False,
+    state_path: Path = STATE_PATH,
+) -> List[StageTiming]:
+    """
+    Run ``stages`` in dependency order in the current process.
+
+    Parameters
+    ----------
+    stages : sequence of Stage
+        Stages to run; dependencies outside this set are read from disk.
+    options : mapping
+        Values for each stage's ``options`` keyword arguments.
+    jobs : int
+        Threads used to run independent stages concurrently.
+    sinks : iterable of str, optional
+        Output paths written to disk. Other outputs live only in memory for
+        downstream stages. Defaults to every output.
+    check : {"hash", "mtime"}
+        How to decide that a stage with existing outputs is up to date.
+    rebuild : bool
+        Run every stage regardless of the up-to-date check.
+
+    Returns
+    -------
+    list of StageTiming
+        One entry per stage, in completion order, with status ``ran`` or
+        ``up-to-date``.
+    """
+    from src.utils.artifacts import ArtifactStore, activate
+
+    if check not in CHECK_MODES:
+        raise ValueError(f"check must be one of {CHECK_MODES}, got {check!r}")
+    by_name = {stage.name: stage for stage in stages}
+    dependencies = stage_dependencies(stages)
+    pending = {name: set(deps) for name, deps in dependencies.items()}
+    sink_paths = None if sinks is None else {(ROOT / path).resolve() for path in sinks}
+    store = ArtifactStore(None if sink_paths is None else sink_paths.__contains__)
+    state = _load_state(state_path)
+    digests: Dict[str, str] = {}
+    timings: List[StageTiming] = []
+    ran: Set[str] = set()
+
+    def up_to_date(stage: Stage) -> bool:
+        # Anything downstream of a stage that ran this time must run too.
+        if rebuild or ran & dependencies[stage.name]:
+            return False
+        if check == "mtime":
+            return stage.is_current()
+        return stage.outputs_exist() and state.get(stage.name) == digests[stage.name]
+
+    def writes_all_outputs(stage: Stage) -> bool:
+        return sink_paths is None or all((ROOT / path).resolve() in sink_paths for path in stage.outputs)
+
+    def finish(name: str) -> None:
+        for deps in pending.values():
+            deps.discard(name)
+
+    def execute(stage: Stage) -> StageTiming:
+        start = time.perf_counter()
+        function = stage.load()
+        imported = time.perf_counter()
+        for path in stage.outputs:
+            (ROOT / path).parent.mkdir(parents=True, exist_ok=True)
+        with span(f"stage:{stage.name}", profile=True):
+            function(**{name: options[name] for name in stage.options})
+        return StageTiming(stage.name, "ran", imported - start, time.perf_counter() - imported)
+
+    error: Optional[BaseException] = None
+    with activate(store), ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        running: Dict[Future, Stage] = {}
+        while pending or running:
+            ready = [name for name, deps in pending.items() if not deps] if error is None else []
+            for name in ready:
+                del pending[name]
+                stage = by_name[name]
+                digests[name] = stage.digest()
+                if up_to_date(stage):
+                    timings.append(StageTiming(name, "up-to-date"))
+                    finish(name)
+                    continue
+                running[executor.submit(execute, stage)] = stage
+            if not running:
+                if error is not None or not pending:
+                    break
+                if not ready:
+                    raise RuntimeError(f"Dependency cycle among stages: {', '.join(pending)}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                timings.append(future.result())
+                ran.add(stage.name)
+                # Only record stages whose outputs all reached disk; a stage with
+                # in-memory outputs must rerun to reproduce them.
+                if writes_all_outputs(stage):
+                    state[stage.name] = digests[stage.name]
+                finish(stage.name)
+    _save_state(state_path, state)
+    if error is not None:
+        raise error
+    return timings
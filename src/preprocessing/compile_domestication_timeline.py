@@ -7,6 +7,8 @@ from typing import Any
 
 import pandas as pd
 
+from src.utils.artifacts import write_table
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INPUT_PATH = PROJECT_ROOT / "data" / "domain_b" / "domestication_data.json"
@@ -195,7 +197,7 @@ def compile_domestication_timeline() -> None:
             "key_references",
         ]
     ]
-    df.to_csv(OUTPUT_PATH, index=False)
+    write_table(df, OUTPUT_PATH)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,34 @@
+from typing import Dict, Tuple
+
 import numpy as np
 import pandas as pd
 
+from src.utils.artifacts import write_table
+from src.utils.esp_kernel import esp_batch
+
 RAW_PATH = "data/domain_e/raw/fda_pivotal_trials_extracted.csv"
 OUT_PATH = "data/domain_e/processed/fda_pivotal_trials.csv"
+RAW_DTYPES = {
+    "record_id": str,
+    "year": "int64",
+    "drug": str,
+    "indication": str,
+    "therapeutic_area": str,
+    "trial_name": str,
+    "trial_design": str,
+    "endpoint": str,
+    "treatment_n": "int64",
+    "control_n": "float64",
+    "treatment_response_count": "float64",
+    "control_response_count": "float64",
+    "response_rate_treatment": "float64",
+    "response_rate_control": "float64",
+    "response_rate_metric": str,
+    "source_url": str,
+    "source_section": str,
+    "notes": str,
+    "data_quality_score": "int64",
+}
 
 
 def _safe_divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
@@ -26,6 +52,31 @@ def _safe_divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
     return numerator.where(denominator.notna() & (denominator != 0)) / denominator
 
 
+def _nnt_interval(
+    nnt_type: pd.Series, treatment: Dict[str, np.ndarray], control: Dict[str, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Confidence bounds on NNT from the per-arm response-rate intervals.
+
+    Difference-based NNTs invert Newcombe's hybrid score interval for the rate
+    difference (upper bound infinite when it includes zero); single-arm NNTs
+    use the treatment-arm ESP bounds. Rows without counts get NaN.
+    """
+    p_t, low_t, high_t = treatment["success_rate"], treatment["rate_ci_low"], treatment["rate_ci_high"]
+    p_c, low_c, high_c = control["success_rate"], control["rate_ci_low"], control["rate_ci_high"]
+    diff = p_t - p_c
+    diff_low = diff - np.sqrt((p_t - low_t) ** 2 + (high_c - p_c) ** 2)
+    diff_high = diff + np.sqrt((high_t - p_t) ** 2 + (p_c - low_c) ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nnt_low = np.where(diff > 0, 1.0 / diff_high, np.nan)
+        nnt_high = np.where(diff > 0, np.where(diff_low > 0, 1.0 / diff_low, np.inf), np.nan)
+    difference = (nnt_type == "difference-based").to_numpy()
+    single_arm = (nnt_type == "single-arm (assumes 0 baseline)").to_numpy()
+    low = np.where(difference, nnt_low, np.where(single_arm, treatment["esp_ci_low"], np.nan))
+    high = np.where(difference, nnt_high, np.where(single_arm, treatment["esp_ci_high"], np.nan))
+    return low, high
+
+
 def compile_fda_pivotal_trials() -> pd.DataFrame:
     """
     Compile FDA pivotal trial data with derived response rates and NNT.
@@ -35,7 +86,7 @@ def compile_fda_pivotal_trials() -> pd.DataFrame:
     pd.DataFrame
         Processed FDA pivotal trial dataset.
     """
-    df = pd.read_csv(RAW_PATH)
+    df = pd.read_csv(RAW_PATH, usecols=list(RAW_DTYPES), dtype=RAW_DTYPES)
 
     numeric_cols = [
         "treatment_n",
@@ -48,11 +99,19 @@ def compile_fda_pivotal_trials() -> pd.DataFrame:
     for col in numeric_cols:
         df[col] = pd.to_numeric(df[col], errors="coerce")
 
+    # Both arms go through the ESP kernel in one call: count-based response
+    # rates, their Wilson intervals and the single-arm ESP bounds.
+    treatment, control = esp_batch(
+        [
+            (df["treatment_n"], df["treatment_response_count"]),
+            (df["control_n"], df["control_response_count"]),
+        ]
+    )
     df["response_rate_treatment"] = df["response_rate_treatment"].fillna(
-        _safe_divide(df["treatment_response_count"], df["treatment_n"])
+        pd.Series(treatment["success_rate"], index=df.index)
     )
     df["response_rate_control"] = df["response_rate_control"].fillna(
-        _safe_divide(df["control_response_count"], df["control_n"])
+        pd.Series(control["success_rate"], index=df.index)
     )
 
     df["response_rate_diff"] = df["response_rate_treatment"] - df["response_rate_control"]
@@ -74,10 +133,12 @@ def compile_fda_pivotal_trials() -> pd.DataFrame:
         ),
     )
 
+    df["nnt_ci_low"], df["nnt_ci_high"] = _nnt_interval(df["nnt_type"], treatment, control)
+
     df["total_n"] = df["treatment_n"].fillna(0) + df["control_n"].fillna(0)
     df.loc[df["total_n"] == 0, "total_n"] = np.nan
 
-    df.to_csv(OUT_PATH, index=False)
+    write_table(df, OUT_PATH)
     return df
 
 
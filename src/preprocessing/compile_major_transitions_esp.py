@@ -5,18 +5,36 @@ from pathlib import Path
 
 import pandas as pd
 
+from src.utils.artifacts import write_table
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INPUT_PATH = PROJECT_ROOT / "data" / "domain_A_evolution" / "a2_major_transitions_esp_estimates.csv"
 OUT_DIR = PROJECT_ROOT / "data" / "domain_A_evolution" / "processed"
 OUTPUT_PATH = OUT_DIR / "a2_major_transitions_esp_estimates.csv"
+INPUT_DTYPES = {
+    "transition": str,
+    "time_window_notes": str,
+    "duration_low_myr": "float64",
+    "duration_high_myr": "float64",
+    "ne_low": "float64",
+    "ne_high": "float64",
+    "gen_time_low_yr": "float64",
+    "gen_time_high_yr": "float64",
+    "generations_low": "float64",
+    "generations_high": "float64",
+    "esp_low": "float64",
+    "esp_high": "float64",
+    "log10_esp_low": "float64",
+    "log10_esp_high": "float64",
+}
 
 
 def compile_major_transitions() -> None:
     """Copy and normalize major transitions ESP estimates into processed data."""
-    df = pd.read_csv(INPUT_PATH)
+    df = pd.read_csv(INPUT_PATH, usecols=list(INPUT_DTYPES), dtype=INPUT_DTYPES)
     OUT_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUTPUT_PATH, index=False)
+    write_table(df, OUTPUT_PATH)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ import re
 
 import pandas as pd
 
+from src.utils.artifacts import write_table
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INPUT_PATH = PROJECT_ROOT / "data" / "domain_A_evolution" / "mutation_rates_compilation.md"
@@ -91,8 +93,8 @@ def compile_mutation_rates() -> None:
     ]
 
     OUT_DIR.mkdir(parents=True, exist_ok=True)
-    per_bp_df.to_csv(OUT_PER_BP, index=False)
-    per_genome_df.to_csv(OUT_PER_GENOME, index=False)
+    write_table(per_bp_df, OUT_PER_BP)
+    write_table(per_genome_df, OUT_PER_GENOME)
 
 
 if __name__ == "__main__":
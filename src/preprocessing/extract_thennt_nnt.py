@@ -1,33 +1,50 @@
-import json
+import argparse
 import re
-import urllib.request
 from html import unescape
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
 import pandas as pd
 
+from src.utils.artifacts import write_table
+from src.utils.http_cache import CachedFetcher
 
-def fetch_html(url: str) -> str:
-    """Fetch HTML content with a standard browser user-agent."""
-    request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with urllib.request.urlopen(request) as response:
-        return response.read().decode("utf-8", errors="ignore")
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DIR = ROOT / ".cache" / "thennt"
+META_URL = "https://thennt.com/wp-json/wp/v2/nnt-review?slug={slug}"
 
 
-def fetch_page_meta(slug: str) -> dict:
-    """Fetch TheNNT page metadata from the WordPress JSON API."""
-    url = f"https://thennt.com/wp-json/wp/v2/nnt-review?slug={slug}"
-    request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with urllib.request.urlopen(request) as response:
-        data = json.load(response)
+def _default_fetcher() -> CachedFetcher:
+    return CachedFetcher(CACHE_DIR)
+
+
+def fetch_html(url: str, fetcher: Optional[CachedFetcher] = None) -> str:
+    """Fetch HTML content through the cached fetcher."""
+    fetcher = fetcher or _default_fetcher()
+    return fetcher.fetch(url).text()
+
+
+def _parse_meta(data: object) -> dict:
     if not data:
         return {}
     return data[0]
 
 
+def fetch_page_meta(slug: str, fetcher: Optional[CachedFetcher] = None) -> dict:
+    """Fetch TheNNT page metadata from the WordPress JSON API."""
+    fetcher = fetcher or _default_fetcher()
+    return _parse_meta(fetcher.fetch(META_URL.format(slug=slug)).json())
+
+
 def extract_rows(html: str, label: str) -> list[dict]:
-    """Extract NNT rows from the Benefits (A) or Harms (B) section."""
+    """
+    Extract NNT rows from the Benefits (A) or Harms (B) section.
+
+    This is the path ``main`` uses on whole downloaded pages. The single-pass
+    ``extract_page_rows`` gives the same rows and can be fed chunks as they
+    arrive, but on a page already in memory it is about 2x slower.
+    """
     section_match = re.search(
         rf'<article class="ben_har ben_har_{label} .*?>.*?</article>',
         html,
@@ -63,6 +80,155 @@ def extract_rows(html: str, label: str) -> list[dict]:
     return extracted
 
 
+BENEFIT_HARM_LABELS = {"A": "benefit", "B": "harm"}
+PAGE_COLUMNS = [
+    "page_slug",
+    "url",
+    "intervention",
+    "condition",
+    "comparator",
+    "therapeutic_area",
+    "time_horizon",
+    "notes",
+]
+
+
+def extract_benefit_harm_rows(html: str) -> Dict[str, List[dict]]:
+    """Extract benefit and harm rows from a whole page, keyed by label."""
+    return {label: extract_rows(html, label) for label in BENEFIT_HARM_LABELS}
+
+
+class NNTSectionParser(HTMLParser):
+    """
+    Single-pass extractor for TheNNT benefit (A) and harm (B) rows.
+
+    Tracks the first ``ben_har_{label}`` article per label, its first
+    ``info__container`` div, and the two cell divs of each ``row__container``.
+    Input may be fed in arbitrary chunks, so pages can be parsed as they
+    arrive; rows accumulate in ``rows`` keyed by label.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.rows: Dict[str, List[dict]] = {label: [] for label in BENEFIT_HARM_LABELS}
+        self._seen_labels: set = set()
+        self._label: Optional[str] = None
+        self._container_done = False
+        self._div_depth = 0
+        self._container_depth: Optional[int] = None
+        self._row_depth: Optional[int] = None
+        self._cell_depth: Optional[int] = None
+        self._cells: List[List[str]] = []
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        classes = (dict(attrs).get("class") or "").split()
+        if tag == "article" and self._label is None and "ben_har" in classes:
+            for label in BENEFIT_HARM_LABELS:
+                if f"ben_har_{label}" in classes and label not in self._seen_labels:
+                    self._label = label
+                    self._seen_labels.add(label)
+                    self._container_done = False
+            return
+        if tag != "div" or self._label is None:
+            return
+        self._div_depth += 1
+        if self._container_depth is None:
+            if not self._container_done and "info__container" in classes:
+                self._container_depth = self._div_depth
+        elif self._row_depth is None:
+            if "row__container" in classes:
+                self._row_depth = self._div_depth
+                self._cells = []
+        elif self._cell_depth is None and self._div_depth == self._row_depth + 1:
+            self._cell_depth = self._div_depth
+            self._cells.append([])
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "article" and self._label is not None:
+            self._label = None
+            self._div_depth = 0
+            self._container_depth = self._row_depth = self._cell_depth = None
+            return
+        if tag != "div" or self._label is None:
+            return
+        if self._cell_depth == self._div_depth:
+            self._cell_depth = None
+        elif self._row_depth == self._div_depth:
+            self._emit_row()
+            self._row_depth = None
+        elif self._container_depth == self._div_depth:
+            self._container_depth = None
+            self._container_done = True
+        self._div_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._cell_depth is not None:
+            self._cells[-1].append(data)
+
+    def _emit_row(self) -> None:
+        if len(self._cells) != 2:
+            return
+        nnt_text = "".join(self._cells[0]).strip()
+        outcome_text = normalize_ascii("".join(self._cells[1]).strip())
+        if nnt_text.isdigit():
+            self.rows[self._label].append({"nnt_value": int(nnt_text), "outcome_text": outcome_text})
+
+
+class NNTPageStream:
+    """
+    Chunk-fed front end for ``NNTSectionParser``.
+
+    Scans incoming chunks for ``<article`` elements with ``str.find`` and
+    hands only complete article elements to the event parser, so the bulk of
+    the page is skipped at C speed while still being read exactly once.
+    """
+
+    _OPEN = "<article"
+    _CLOSE = "</article>"
+
+    def __init__(self) -> None:
+        self.parser = NNTSectionParser()
+        self._buffer = ""
+        self._in_article = False
+
+    @property
+    def rows(self) -> Dict[str, List[dict]]:
+        return self.parser.rows
+
+    def feed(self, chunk: str) -> None:
+        self._buffer += chunk
+        while True:
+            if not self._in_article:
+                start = self._buffer.find(self._OPEN)
+                if start < 0:
+                    self._buffer = self._buffer[-(len(self._OPEN) - 1) :]
+                    return
+                self._buffer = self._buffer[start:]
+                self._in_article = True
+            end = self._buffer.find(self._CLOSE)
+            if end < 0:
+                return
+            end += len(self._CLOSE)
+            self.parser.feed(self._buffer[:end])
+            self._buffer = self._buffer[end:]
+            self._in_article = False
+
+    def close(self) -> None:
+        if self._in_article:
+            self.parser.feed(self._buffer)
+        self._buffer = ""
+        self.parser.close()
+
+
+def extract_page_rows(chunks: Iterable[str] | str) -> Dict[str, List[dict]]:
+    """Extract benefit and harm rows from a page (or its chunks) in one pass."""
+    stream = NNTPageStream()
+    for chunk in [chunks] if isinstance(chunks, str) else chunks:
+        stream.feed(chunk)
+    stream.close()
+    return stream.rows
+
+
 def normalize_ascii(text: str) -> str:
     """Normalize common non-ASCII punctuation for consistent CSV output."""
     replacements = {
@@ -139,28 +305,46 @@ def bucket_follow_up(months: Optional[float]) -> str:
     return "over_5yr"
 
 
-def main() -> None:
-    """Extract NNT data from TheNNT pages listed in the raw pages CSV."""
-    root = Path(__file__).resolve().parents[2]
+def main(
+    offline: bool = False,
+    workers: int = 8,
+    cache_dir: Path = CACHE_DIR,
+    streaming: bool = False,
+) -> None:
+    """
+    Extract NNT data from TheNNT pages listed in the raw pages CSV.
+
+    Pages are fetched whole, so rows are extracted with the regex path
+    (``extract_benefit_harm_rows``); ``streaming`` switches to the single-pass
+    ``extract_page_rows`` parser instead.
+    """
+    root = ROOT
     pages_path = root / "data" / "domain_e" / "raw" / "thennt_pages.csv"
     raw_output_path = root / "data" / "domain_e" / "raw" / "thennt_nnt_extracted.csv"
     processed_output_path = root / "data" / "domain_e" / "processed" / "nnt_database.csv"
 
-    pages_df = pd.read_csv(pages_path)
+    pages_df = pd.read_csv(pages_path, usecols=PAGE_COLUMNS, dtype=str)
     rows = []
 
-    for _, row in pages_df.iterrows():
+    fetcher = CachedFetcher(cache_dir, offline=offline, max_workers=workers)
+    page_urls = pages_df["url"].tolist()
+    meta_urls = [META_URL.format(slug=slug) for slug in pages_df["page_slug"]]
+    responses = fetcher.fetch_many(page_urls + meta_urls)
+    html_pages = [response.text() for response in responses[: len(page_urls)]]
+    metas = [_parse_meta(response.json()) for response in responses[len(page_urls) :]]
+    extract = extract_page_rows if streaming else extract_benefit_harm_rows
+
+    for (_, row), html, meta in zip(pages_df.iterrows(), html_pages, metas):
         slug = row["page_slug"]
         page_url = row["url"]
-        html = fetch_html(page_url)
-        meta = fetch_page_meta(slug)
         page_title = normalize_ascii(meta.get("title", {}).get("rendered", "") or "")
         year = ""
         if meta.get("date"):
             year = meta["date"].split("-")[0]
 
-        for nnt_type, label in (("benefit", "A"), ("harm", "B")):
-            for entry in extract_rows(html, label):
+        page_rows = extract(html)
+        for label, nnt_type in BENEFIT_HARM_LABELS.items():
+            for entry in page_rows[label]:
                 follow_up_months = parse_follow_up_months(row["time_horizon"])
                 follow_up_source = "time_horizon" if follow_up_months is not None else ""
                 if follow_up_months is None:
@@ -192,7 +376,7 @@ def main() -> None:
                 )
 
     raw_df = pd.DataFrame(rows)
-    raw_df.to_csv(raw_output_path, index=False)
+    write_table(raw_df, raw_output_path)
 
     processed_df = raw_df.rename(
         columns={
@@ -232,8 +416,22 @@ def main() -> None:
         "page_url",
     ]
     processed_df = processed_df[ordered_cols]
-    processed_df.to_csv(processed_output_path, index=False)
+    write_table(processed_df, processed_output_path)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Extract NNT rows from TheNNT pages.")
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve pages only from the local HTTP cache.",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetch workers.")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="HTTP cache directory.")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Extract rows with the single-pass HTML parser instead of the regex path.",
+    )
+    args = parser.parse_args()
+    main(offline=args.offline, workers=args.workers, cache_dir=args.cache_dir, streaming=args.streaming)
@@ -0,0 +1,122 @@
+"""
+In-memory hand-off of tables between pipeline stages.
+
+Stage scripts read and write their CSV tables through ``read_table`` and
+``write_table``. Outside a pipeline run these are plain ``pd.read_csv`` /
+``DataFrame.to_csv`` calls. While an ``ArtifactStore`` is active (see
+``src/pipeline.py``) written tables are kept in memory for downstream stages
+and only paths configured as sinks are written to disk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _key(path: Path | str) -> Path:
+    path = Path(path)
+    return (path if path.is_absolute() else ROOT / path).resolve()
+
+
+class ArtifactStore:
+    """
+    Thread-safe mapping from output path to the DataFrame written there.
+
+    Parameters
+    ----------
+    is_sink : callable, optional
+        Returns True for paths that must also be written to disk. Defaults to
+        writing every table.
+    """
+
+    def __init__(self, is_sink: Optional[Callable[[Path], bool]] = None) -> None:
+        self._tables: Dict[Path, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self._is_sink = is_sink or (lambda path: True)
+
+    def put(self, path: Path | str, df: pd.DataFrame) -> None:
+        with self._lock:
+            self._tables[_key(path)] = df.copy()
+
+    def get(self, path: Path | str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            df = self._tables.get(_key(path))
+        # Consumers may mutate what they read; hand out copies.
+        return None if df is None else df.copy()
+
+    def __contains__(self, path: object) -> bool:
+        with self._lock:
+            return _key(path) in self._tables  # type: ignore[arg-type]
+
+    def is_sink(self, path: Path | str) -> bool:
+        return self._is_sink(_key(path))
+
+
+_ACTIVE: Optional[ArtifactStore] = None
+
+
+@contextmanager
+def activate(store: ArtifactStore) -> Iterator[ArtifactStore]:
+    """Route ``read_table``/``write_table`` through ``store`` within the block."""
+    global _ACTIVE
+    previous, _ACTIVE = _ACTIVE, store
+    try:
+        yield store
+    finally:
+        _ACTIVE = previous
+
+
+def active_store() -> Optional[ArtifactStore]:
+    return _ACTIVE
+
+
+def in_memory(path: Path | str) -> bool:
+    """True when the active store holds a table for ``path``."""
+    return _ACTIVE is not None and path in _ACTIVE
+
+
+def read_table(path: Path | str, **kwargs) -> pd.DataFrame:
+    """
+    Return the in-memory table for ``path`` if one was written, else read the CSV.
+
+    Floats are parsed with ``float_precision="round_trip"`` so a table read
+    back from disk holds the same values as the in-memory hand-off. A
+    ``usecols`` list also selects the columns of an in-memory table (which
+    keeps the dtypes it was written with).
+    """
+    if _ACTIVE is not None:
+        df = _ACTIVE.get(path)
+        if df is not None:
+            usecols = kwargs.get("usecols")
+            if usecols is not None and not callable(usecols):
+                wanted = set(usecols)
+                df = df[[column for column in df.columns if column in wanted]]
+            return df
+    kwargs.setdefault("float_precision", "round_trip")
+    return pd.read_csv(path, **kwargs)
+
+
+def write_table(df: pd.DataFrame, path: Path | str, index: bool = False, **kwargs) -> None:
+    """Publish ``df`` for downstream stages and write it to disk if ``path`` is a sink."""
+    if _ACTIVE is not None:
+        _ACTIVE.put(path, df)
+        if not _ACTIVE.is_sink(path):
+            return
+    df.to_csv(path, index=index, **kwargs)
+
+
+def table_digest(path: Path | str) -> bytes:
+    """Content hash of the table at ``path``, preferring the in-memory copy."""
+    if _ACTIVE is not None:
+        df = _ACTIVE.get(path)
+        if df is not None:
+            return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).digest()
+    return hashlib.sha256(Path(path).read_bytes()).digest()
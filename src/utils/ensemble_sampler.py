@@ -0,0 +1,218 @@
+"""
+Affine-invariant ensemble MCMC (Goodman & Weare 2010 stretch move) in NumPy.
+
+The log-probability is evaluated for a whole half-ensemble at once: it takes
+an array of shape (n_walkers, n_dim) and returns (n_walkers,). Each step
+updates the two halves of the ensemble in turn, each in one array operation.
+
+``run_ensembles`` runs independent ensembles in worker processes (each with
+its own spawned seed) and can checkpoint every ensemble to ``.npz`` so an
+interrupted run resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+LogProb = Callable[[np.ndarray], np.ndarray]
+STRETCH_SCALE = 2.0
+# Window constant for the integrated autocorrelation time (Sokal 1997).
+AUTOCORR_WINDOW_C = 5.0
+
+
+@dataclass
+class EnsembleRun:
+    """Chain of one ensemble with its timing."""
+
+    chain: np.ndarray  # (n_steps, n_walkers, n_dim)
+    log_prob: np.ndarray  # (n_steps, n_walkers)
+    accepted: np.ndarray  # (n_walkers,) accepted proposals
+    seconds: float
+
+
+def _stretch_step(
+    log_prob_fn: LogProb,
+    walkers: np.ndarray,
+    log_prob: np.ndarray,
+    rng: np.random.Generator,
+    a: float,
+) -> np.ndarray:
+    """Advance ``walkers``/``log_prob`` in place by one red-blue stretch move."""
+    n_walkers, n_dim = walkers.shape
+    half = n_walkers // 2
+    accepted = np.zeros(n_walkers, dtype=bool)
+    for active, other in ((slice(0, half), slice(half, None)), (slice(half, None), slice(0, half))):
+        # Basic slices are views, so updating ``current`` updates ``walkers``.
+        current = walkers[active]
+        complement = walkers[other]
+        n_active = len(current)
+        z = ((a - 1.0) * rng.random(n_active) + 1.0) ** 2 / a
+        partners = complement[rng.integers(0, len(complement), n_active)]
+        proposal = partners + z[:, None] * (current - partners)
+        proposal_lp = log_prob_fn(proposal)
+        log_ratio = (n_dim - 1) * np.log(z) + proposal_lp - log_prob[active]
+        accept = np.log(rng.random(n_active)) < log_ratio
+        current[accept] = proposal[accept]
+        log_prob[active] = np.where(accept, proposal_lp, log_prob[active])
+        accepted[active] = accept
+    return accepted
+
+
+def run_ensemble(
+    log_prob_fn: LogProb,
+    initial: np.ndarray,
+    n_steps: int,
+    rng: np.random.Generator,
+    checkpoint: Optional[Path] = None,
+    checkpoint_every: int = 500,
+    a: float = STRETCH_SCALE,
+) -> EnsembleRun:
+    """
+    Run one ensemble for ``n_steps`` steps from ``initial`` (n_walkers, n_dim).
+
+    With ``checkpoint`` set, the chain and generator state are saved every
+    ``checkpoint_every`` steps and a matching checkpoint is resumed.
+    """
+    n_walkers, n_dim = initial.shape
+    if n_walkers < 2 * n_dim or n_walkers % 2:
+        raise ValueError(f"need an even number of at least {2 * n_dim} walkers, got {n_walkers}")
+    chain = np.empty((n_steps, n_walkers, n_dim))
+    log_probs = np.empty((n_steps, n_walkers))
+    accepted = np.zeros(n_walkers, dtype=np.int64)
+    start = 0
+    seconds = 0.0
+    walkers = np.array(initial, dtype=np.float64)
+    if checkpoint is not None and checkpoint.exists():
+        with np.load(checkpoint, allow_pickle=True) as saved:
+            start = min(int(saved["step"]), n_steps)
+            chain[:start] = saved["chain"][:start]
+            log_probs[:start] = saved["log_prob"][:start]
+            accepted = saved["accepted"].copy()
+            seconds = float(saved["seconds"])
+            rng.bit_generator.state = saved["rng_state"].item()
+        if start:
+            walkers = chain[start - 1].copy()
+    log_prob = log_probs[start - 1].copy() if start else log_prob_fn(walkers)
+    if not np.all(np.isfinite(log_prob)):
+        raise ValueError("initial walkers must have finite log-probability")
+
+    began = time.perf_counter()
+    for step in range(start, n_steps):
+        accepted += _stretch_step(log_prob_fn, walkers, log_prob, rng, a)
+        chain[step] = walkers
+        log_probs[step] = log_prob
+        done = step + 1
+        if checkpoint is not None and (done % checkpoint_every == 0 or done == n_steps):
+            _save_checkpoint(
+                checkpoint, chain[:done], log_probs[:done], accepted, seconds + time.perf_counter() - began, rng
+            )
+    return EnsembleRun(chain, log_probs, accepted, seconds + time.perf_counter() - began)
+
+
+def _save_checkpoint(
+    path: Path,
+    chain: np.ndarray,
+    log_prob: np.ndarray,
+    accepted: np.ndarray,
+    seconds: float,
+    rng: np.random.Generator,
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial.npz")
+    np.savez(
+        partial,
+        step=len(chain),
+        chain=chain,
+        log_prob=log_prob,
+        accepted=accepted,
+        seconds=seconds,
+        rng_state=np.array(rng.bit_generator.state, dtype=object),
+    )
+    os.replace(partial, path)
+
+
+def _run_ensemble_task(args: tuple) -> EnsembleRun:
+    return run_ensemble(*args)
+
+
+def run_ensembles(
+    log_prob_fn: LogProb,
+    initial: Sequence[np.ndarray],
+    n_steps: int,
+    seed: int | Sequence[int],
+    workers: Optional[int] = 1,
+    checkpoints: Optional[Sequence[Path]] = None,
+    checkpoint_every: int = 500,
+) -> List[EnsembleRun]:
+    """
+    Run one independent ensemble per entry of ``initial``.
+
+    ``log_prob_fn`` must be picklable when ``workers`` is not 1. Each ensemble
+    draws from its own child of ``np.random.SeedSequence(seed)``, so results
+    do not depend on ``workers``.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(initial))
+    tasks = [
+        (
+            log_prob_fn,
+            walkers,
+            n_steps,
+            np.random.default_rng(child),
+            None if checkpoints is None else checkpoints[index],
+            checkpoint_every,
+        )
+        for index, (walkers, child) in enumerate(zip(initial, seeds))
+    ]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        return [_run_ensemble_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return list(executor.map(_run_ensemble_task, tasks))
+
+
+def _autocorrelation(series: np.ndarray) -> np.ndarray:
+    """Normalized autocorrelation of each column of ``series`` (n_steps, k) via FFT."""
+    n = len(series)
+    size = 1 << (2 * n - 1).bit_length()
+    centered = series - series.mean(axis=0)
+    spectrum = np.fft.rfft(centered, n=size, axis=0)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=0)[:n]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return acf / acf[0]
+
+
+def integrated_autocorr_time(chain: np.ndarray) -> np.ndarray:
+    """
+    Integrated autocorrelation time per parameter for a (n_steps, n_walkers, n_dim) chain.
+
+    The autocorrelation is averaged over walkers and summed up to Sokal's
+    automatic window (first M with M >= C * tau(M)).
+    """
+    n_steps, n_walkers, n_dim = chain.shape
+    rho = _autocorrelation(chain.reshape(n_steps, n_walkers * n_dim))
+    rho = np.nan_to_num(rho.reshape(n_steps, n_walkers, n_dim).mean(axis=1), nan=0.0)
+    tau = 2.0 * np.cumsum(rho, axis=0) - 1.0
+    window = np.arange(n_steps)[:, None] >= AUTOCORR_WINDOW_C * tau
+    first = np.where(window.any(axis=0), np.argmax(window, axis=0), n_steps - 1)
+    return np.maximum(tau[first, np.arange(n_dim)], 1.0)
+
+
+def gelman_rubin(chains: Sequence[np.ndarray]) -> np.ndarray:
+    """Potential scale reduction per parameter across ensembles (walkers pooled per ensemble)."""
+    if len(chains) < 2:
+        return np.full(chains[0].shape[-1], math.nan)
+    samples = np.stack([chain.reshape(-1, chain.shape[-1]) for chain in chains])
+    n = samples.shape[1]
+    within = samples.var(axis=1, ddof=1).mean(axis=0)
+    between = n * samples.mean(axis=1).var(axis=0, ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt(((n - 1) / n * within + between / n) / within)
@@ -0,0 +1,217 @@
+"""
+Columnar experiments/successes -> ESP kernel shared by the per-domain calculators.
+
+All inputs are coerced to float64 and handled the same way:
+
+- missing or non-positive trial counts, or missing successes, give NaN throughout;
+- zero successes give a NaN ESP (undefined) but a finite lower ESP bound and an
+  infinite upper bound from the success-rate interval;
+- successes above the trial count keep the ratio but get no interval.
+
+The ESP interval is the inverse of a Wilson score (default) or Jeffreys
+interval on the success rate. ``esp_batch`` concatenates any number of inputs
+and runs the kernel once over all of them.
+"""
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+INTERVALS = ("wilson", "jeffreys")
+CONFIDENCE = 0.95
+# Continued fraction and Newton settings for Beta quantiles (Jeffreys).
+BETACF_TOLERANCE = 1e-14
+BETACF_MAX_ITER = 10_000
+QUANTILE_STEPS = 12
+
+ArrayLike = np.ndarray | pd.Series | Sequence[float]
+
+
+def _as_float(values: ArrayLike) -> np.ndarray:
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _wilson(successes: np.ndarray, trials: np.ndarray, z: float) -> Tuple[np.ndarray, np.ndarray]:
+    rate = successes / trials
+    z2 = z * z
+    denominator = 1.0 + z2 / trials
+    center = (rate + z2 / (2.0 * trials)) / denominator
+    half = z * np.sqrt(rate * (1.0 - rate) / trials + z2 / (4.0 * trials * trials)) / denominator
+    low = np.clip(center - half, 0.0, 1.0)
+    high = np.clip(center + half, 0.0, 1.0)
+    return np.where(successes == 0, 0.0, low), np.where(successes == trials, 1.0, high)
+
+
+def _betacf(a: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Continued fraction for the incomplete beta function (modified Lentz)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 - qab * x / qap
+    d = 1.0 / np.where(np.abs(d) < tiny, tiny, d)
+    h = d.copy()
+    # Iterate only the entries that have not converged yet.
+    active = np.arange(len(x))
+    for m in range(1, BETACF_MAX_ITER):
+        m2 = 2 * m
+        aa_, bb_, xx_ = a[active], b[active], x[active]
+        cc, dd = c[active], d[active]
+        hh = h[active]
+        for aa in (
+            m * (bb_ - m) * xx_ / ((qam[active] + m2) * (aa_ + m2)),
+            -(aa_ + m) * (qab[active] + m) * xx_ / ((aa_ + m2) * (qap[active] + m2)),
+        ):
+            dd = 1.0 + aa * dd
+            dd = 1.0 / np.where(np.abs(dd) < tiny, tiny, dd)
+            cc = 1.0 + aa / cc
+            cc = np.where(np.abs(cc) < tiny, tiny, cc)
+            delta = dd * cc
+            hh = hh * delta
+        c[active], d[active], h[active] = cc, dd, hh
+        active = active[np.abs(delta - 1.0) > BETACF_TOLERANCE]
+        if not len(active):
+            break
+    return h
+
+
+def _betainc(a: np.ndarray, b: np.ndarray, x: np.ndarray, log_beta: np.ndarray) -> np.ndarray:
+    """Regularized incomplete beta I_x(a, b) for 0 < x < 1."""
+    front = np.exp(a * np.log(x) + b * np.log1p(-x) - log_beta)
+    # The continued fraction converges quickly below the mean; use symmetry above it.
+    direct = x < (a + 1.0) / (a + b + 2.0)
+    out = np.empty_like(x)
+    if direct.any():
+        out[direct] = front[direct] * _betacf(a[direct], b[direct], x[direct]) / a[direct]
+    if (~direct).any():
+        flip = ~direct
+        out[flip] = 1.0 - front[flip] * _betacf(b[flip], a[flip], 1.0 - x[flip]) / b[flip]
+    return out
+
+
+def _beta_quantile(q: float, a: np.ndarray, b: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """Quantile ``q`` of Beta(a, b) by safeguarded Newton steps from ``start``."""
+    log_beta = np.array([math.lgamma(x) + math.lgamma(y) - math.lgamma(x + y) for x, y in zip(a, b)])
+    low = np.zeros_like(a)
+    high = np.ones_like(a)
+    x = np.clip(start, 1e-300, 1.0 - 1e-16)
+    for _ in range(QUANTILE_STEPS):
+        error = _betainc(a, b, x, log_beta) - q
+        low = np.where(error < 0, x, low)
+        high = np.where(error < 0, high, x)
+        density = np.exp((a - 1.0) * np.log(x) + (b - 1.0) * np.log1p(-x) - log_beta)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            step = x - error / density
+        # Fall back to bisection whenever Newton leaves the bracket.
+        inside = np.isfinite(step) & (step > low) & (step < high)
+        x = np.where(inside, step, 0.5 * (low + high))
+    return x
+
+
+def _jeffreys(successes: np.ndarray, trials: np.ndarray, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    a = successes + 0.5
+    b = trials - successes + 0.5
+    # The Wilson bounds are close to the Jeffreys ones and make good Newton starts.
+    wilson_low, wilson_high = _wilson(successes, trials, NormalDist().inv_cdf(1.0 - alpha / 2.0))
+    low = _beta_quantile(alpha / 2.0, a, b, np.maximum(wilson_low, 0.5 * wilson_high / trials))
+    high = _beta_quantile(1.0 - alpha / 2.0, a, b, np.minimum(wilson_high, 1.0 - 0.5 / trials))
+    return np.where(successes == 0, 0.0, low), np.where(successes == trials, 1.0, high)
+
+
+def esp_kernel(
+    trials: ArrayLike,
+    successes: ArrayLike,
+    interval: str = "wilson",
+    confidence: float = CONFIDENCE,
+) -> Dict[str, np.ndarray]:
+    """
+    ESP = trials / successes with a confidence interval from the success rate.
+
+    Parameters
+    ----------
+    trials, successes : array-like
+        Experiment and success counts; non-numeric entries count as missing.
+    interval : {"wilson", "jeffreys"}
+        Binomial interval used for the success rate.
+    confidence : float
+        Two-sided confidence level.
+
+    Returns
+    -------
+    dict of np.ndarray
+        ``success_rate``, ``rate_ci_low``, ``rate_ci_high``, ``esp``,
+        ``log10_esp``, ``esp_ci_low`` and ``esp_ci_high``.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"interval must be one of {INTERVALS}, got {interval!r}")
+    trials = _as_float(trials)
+    successes = _as_float(successes)
+    valid = (trials > 0) & (successes >= 0)
+    n = np.where(valid, trials, np.nan)
+    k = np.where(valid, successes, np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = k / n
+        esp = np.where(k > 0, n / k, np.nan)
+        log10_esp = np.log10(esp)
+
+    rate_low = np.full(len(n), np.nan)
+    rate_high = np.full(len(n), np.nan)
+    binomial = valid & (successes <= trials)
+    if binomial.any():
+        if interval == "wilson":
+            z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+            low, high = _wilson(k[binomial], n[binomial], z)
+        else:
+            low, high = _jeffreys(k[binomial], n[binomial], 1.0 - confidence)
+        rate_low[binomial] = low
+        rate_high[binomial] = high
+    with np.errstate(divide="ignore"):
+        esp_low = 1.0 / rate_high
+        esp_high = 1.0 / rate_low
+    return {
+        "success_rate": rate,
+        "rate_ci_low": rate_low,
+        "rate_ci_high": rate_high,
+        "esp": esp,
+        "log10_esp": log10_esp,
+        "esp_ci_low": esp_low,
+        "esp_ci_high": esp_high,
+    }
+
+
+def esp_batch(
+    inputs: Sequence[Tuple[ArrayLike, ArrayLike]],
+    interval: str = "wilson",
+    confidence: float = CONFIDENCE,
+) -> List[Dict[str, np.ndarray]]:
+    """Run ``esp_kernel`` once over several (trials, successes) inputs and split the result."""
+    trials = [_as_float(pair[0]) for pair in inputs]
+    successes = [_as_float(pair[1]) for pair in inputs]
+    if not trials:
+        return []
+    result = esp_kernel(np.concatenate(trials), np.concatenate(successes), interval, confidence)
+    bounds = np.cumsum([len(part) for part in trials])[:-1]
+    split = {name: np.split(values, bounds) for name, values in result.items()}
+    return [{name: parts[index] for name, parts in split.items()} for index in range(len(trials))]
+
+
+def esp_columns(
+    trials: ArrayLike,
+    successes: ArrayLike,
+    name: str = "esp",
+    interval: str = "wilson",
+    confidence: float = CONFIDENCE,
+) -> Dict[str, np.ndarray]:
+    """``name``, ``log10_<name>``, ``<name>_ci_low`` and ``<name>_ci_high`` columns for ``DataFrame.assign``."""
+    result = esp_kernel(trials, successes, interval, confidence)
+    return {
+        name: result["esp"],
+        f"log10_{name}": result["log10_esp"],
+        f"{name}_ci_low": result["esp_ci_low"],
+        f"{name}_ci_high": result["esp_ci_high"],
+    }
@@ -0,0 +1,159 @@
+"""
+Monte Carlo uncertainty propagation for master-table ESP values.
+
+Row builders describe each ESP as a sampling distribution with an ``ESP_dist``
+kind and an ``ESP_dist_params`` tuple:
+
+``log_uniform`` (log10_low, log10_high)
+    ESP log-uniform between two bounds (literature ranges).
+``binomial`` (trials, successes)
+    ESP = 1 / p with p drawn from the Jeffreys posterior Beta(k + 1/2, n - k + 1/2).
+``binomial_difference`` (trials_t, successes_t, trials_c, successes_c)
+    NNT = 1 / (p_t - p_c) for two arms; draws without benefit count as ESP = inf.
+``speedup`` (trials, successes, speedup_min, speedup_max)
+    A binomial baseline ESP divided by a uniform speedup factor.
+
+Rows with no kind (``None``) are point estimates. ``esp_percentiles`` draws
+``samples`` values per row, up to ``ROW_BLOCK`` rows of a kind at once, in
+chunks of at most ``CHUNK_ELEMENTS`` values. Each chunk is folded into a fixed
+per-row histogram of log10 ESP, so memory does not grow with the sample count.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SEED = 20260211
+N_SAMPLES = 1_000_000
+CHUNK_ELEMENTS = 1 << 22
+# Histogram resolution per row; percentiles are interpolated within a bin.
+N_BINS = 8192
+# Rows sampled together; bounds the histogram memory to ROW_BLOCK x N_BINS counts.
+ROW_BLOCK = 256
+PILOT_SAMPLES = 16_384
+PERCENTILES = (2.5, 50.0, 97.5)
+PERCENTILE_COLUMNS = [f"log10_ESP_p{q:g}" for q in PERCENTILES]
+
+Sampler = Callable[[np.ndarray, np.random.Generator, int], np.ndarray]
+
+
+def _jeffreys_log10_esp(trials: np.ndarray, successes: np.ndarray, rng: np.random.Generator, size: int) -> np.ndarray:
+    rate = rng.beta((successes + 0.5)[:, None], (trials - successes + 0.5)[:, None], size=(len(trials), size))
+    return -np.log10(rate)
+
+
+def _sample_log_uniform(params: np.ndarray, rng: np.random.Generator, size: int) -> np.ndarray:
+    return rng.uniform(params[:, 0, None], params[:, 1, None], size=(len(params), size))
+
+
+def _sample_binomial(params: np.ndarray, rng: np.random.Generator, size: int) -> np.ndarray:
+    return _jeffreys_log10_esp(params[:, 0], params[:, 1], rng, size)
+
+
+def _sample_binomial_difference(params: np.ndarray, rng: np.random.Generator, size: int) -> np.ndarray:
+    shape = (len(params), size)
+    treatment = rng.beta((params[:, 1] + 0.5)[:, None], (params[:, 0] - params[:, 1] + 0.5)[:, None], size=shape)
+    control = rng.beta((params[:, 3] + 0.5)[:, None], (params[:, 2] - params[:, 3] + 0.5)[:, None], size=shape)
+    difference = treatment - control
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(difference > 0, -np.log10(difference), np.inf)
+
+
+def _sample_speedup(params: np.ndarray, rng: np.random.Generator, size: int) -> np.ndarray:
+    baseline = _jeffreys_log10_esp(params[:, 0], params[:, 1], rng, size)
+    speedup = rng.uniform(params[:, 2, None], params[:, 3, None], size=baseline.shape)
+    return baseline - np.log10(speedup)
+
+
+SAMPLERS: Dict[str, Sampler] = {
+    "log_uniform": _sample_log_uniform,
+    "binomial": _sample_binomial,
+    "binomial_difference": _sample_binomial_difference,
+    "speedup": _sample_speedup,
+}
+
+
+class _Histogram:
+    """Per-row log10 ESP histogram with underflow and overflow (incl. inf) bins."""
+
+    def __init__(self, pilot: np.ndarray) -> None:
+        finite = np.where(np.isfinite(pilot), pilot, np.nan)
+        with np.errstate(invalid="ignore"):
+            low = np.nan_to_num(np.nanmin(finite, axis=1))
+            high = np.nan_to_num(np.nanmax(finite, axis=1))
+        pad = 0.05 * (high - low) + 1e-9
+        self.low = low - pad
+        self.width = (high - low + 2 * pad) / N_BINS
+        self.counts = np.zeros((len(pilot), N_BINS + 2), dtype=np.int64)
+        self.add(pilot)
+
+    def add(self, samples: np.ndarray) -> None:
+        with np.errstate(invalid="ignore"):
+            position = np.floor((samples - self.low[:, None]) / self.width[:, None]) + 1
+        index = np.clip(np.nan_to_num(position, posinf=N_BINS + 1), 0, N_BINS + 1).astype(np.int64)
+        index += (np.arange(len(samples)) * (N_BINS + 2))[:, None]
+        self.counts += np.bincount(index.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+
+    def percentile(self, q: float) -> np.ndarray:
+        cumulative = np.cumsum(self.counts, axis=1)
+        target = q / 100.0 * cumulative[:, -1]
+        bins = np.argmax(cumulative >= target[:, None], axis=1)
+        rows = np.arange(len(bins))
+        before = np.where(bins > 0, cumulative[rows, np.maximum(bins - 1, 0)], 0)
+        inside = self.counts[rows, bins]
+        fraction = np.where(inside > 0, (target - before) / np.maximum(inside, 1), 0.0)
+        values = self.low + (bins - 1 + fraction) * self.width
+        values = np.where(bins == 0, self.low, values)
+        return np.where(bins == N_BINS + 1, np.inf, values)
+
+
+def _kind_rng(kind: str) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence([SEED, zlib.crc32(kind.encode("utf-8"))]))
+
+
+def sample_percentiles(
+    kind: str,
+    params: np.ndarray,
+    samples: int = N_SAMPLES,
+    percentiles: Sequence[float] = PERCENTILES,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Percentiles of log10 ESP (rows x percentiles) for rows sharing one ``kind``."""
+    params = np.asarray(params, dtype=np.float64).reshape(len(params), -1)
+    sampler = SAMPLERS[kind]
+    rng = rng or _kind_rng(kind)
+    out = np.empty((len(params), len(percentiles)))
+    for start in range(0, len(params), ROW_BLOCK):
+        block = params[start : start + ROW_BLOCK]
+        chunk = max(min(samples, CHUNK_ELEMENTS // len(block)), 1)
+        drawn = min(samples, PILOT_SAMPLES, chunk)
+        histogram = _Histogram(sampler(block, rng, drawn))
+        while drawn < samples:
+            size = min(chunk, samples - drawn)
+            histogram.add(sampler(block, rng, size))
+            drawn += size
+        out[start : start + len(block)] = np.column_stack([histogram.percentile(q) for q in percentiles])
+    return out
+
+
+def esp_percentiles(df: pd.DataFrame, samples: int = N_SAMPLES) -> pd.DataFrame:
+    """
+    ``PERCENTILE_COLUMNS`` for every row of ``df``.
+
+    Uses the ``ESP_dist``/``ESP_dist_params`` columns; point-estimate rows
+    (or frames without those columns) repeat ``log10_ESP``.
+    """
+    point = pd.to_numeric(df["log10_ESP"]).to_numpy(dtype=np.float64)
+    out = np.repeat(point[:, None], len(PERCENTILES), axis=1)
+    if "ESP_dist" in df.columns:
+        kinds = df["ESP_dist"].to_numpy(dtype=object)
+        for kind in SAMPLERS:
+            rows = np.flatnonzero(kinds == kind)
+            if len(rows):
+                params = np.array([df["ESP_dist_params"].iloc[row] for row in rows], dtype=np.float64)
+                out[rows] = sample_percentiles(kind, params, samples)
+    return pd.DataFrame(out, columns=PERCENTILE_COLUMNS, index=df.index)
@@ -0,0 +1,100 @@
+"""
+Shared store of learning-curve fit results.
+
+``f2_curve_fitting`` writes every fit it computes; ``f3_visualizations`` reads
+them back instead of refitting. Records are keyed by domain, model, the
+store's ``code_version`` (a hash of the fitting code) and a hash of the exact
+(x, y) data the fit used, so a stale fit is never served for changed data or
+changed fitting code. The store is held in memory per process, shared by
+threads under a lock, and persisted as JSON that is replaced atomically.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+FIT_STORE_PATH = ROOT / ".cache/fits/fit_store.json"
+
+_STORES: Dict[Tuple[Path, str], "FitStore"] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def dataset_hash(x: np.ndarray, y: np.ndarray) -> str:
+    """Hash the float64 bytes of a fit's inputs."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(x, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=float).tobytes())
+    return digest.hexdigest()[:20]
+
+
+def source_hash(*paths: Path) -> str:
+    """Hash the source files of the fitting code."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:20]
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return None if math.isnan(value) else value
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+class FitStore:
+    """In-memory fit records backed by a JSON file."""
+
+    def __init__(self, path: Path = FIT_STORE_PATH, code_version: str = "") -> None:
+        self.path = Path(path)
+        self.code_version = code_version
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self._records = json.loads(self.path.read_text())
+
+    def _key(self, domain: str, model: str, data_key: str) -> str:
+        return f"{domain}|{model}|{self.code_version}|{data_key}"
+
+    def get(self, domain: str, model: str, data_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._records.get(self._key(domain, model, data_key))
+
+    def put(self, domain: str, model: str, data_key: str, record: Dict[str, Any]) -> None:
+        # Keep only the newest dataset and code per (domain, model) so the file stays bounded.
+        prefix = f"{domain}|{model}|"
+        with self._lock:
+            for key in [key for key in self._records if key.startswith(prefix)]:
+                del self._records[key]
+            self._records[self._key(domain, model, data_key)] = _jsonable(record)
+
+    def save(self) -> None:
+        """Write the records to a temporary file and move it over ``path`` with ``os.replace``."""
+        # Held through the replace so an older snapshot never lands after a newer one.
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(f"{self.path.name}.{os.getpid()}.partial")
+            partial.write_text(json.dumps(self._records, indent=2, sort_keys=True))
+            os.replace(partial, self.path)
+
+
+def get_fit_store(path: Path = FIT_STORE_PATH, code_version: str = "") -> FitStore:
+    """Return the process-wide store for ``path`` and ``code_version``, loading it on first use."""
+    key = (Path(path), code_version)
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = FitStore(*key)
+        return _STORES[key]
@@ -0,0 +1,229 @@
+"""
+Concurrent HTTP fetching with keep-alive connections and an on-disk cache.
+
+Responses are cached under ``cache_dir`` keyed by URL. Cached entries are
+revalidated with ``If-None-Match``/``If-Modified-Since`` when the server sent an
+ETag or Last-Modified header, and a 304 reply serves the cached body. In offline
+mode only the cache is consulted, so builds are reproducible without network.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "Mozilla/5.0"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class OfflineCacheMiss(LookupError):
+    """Raised in offline mode when a URL has no cached response."""
+
+
+def _replace_atomically(path: Path, data: bytes) -> None:
+    # Per-thread temporary name: several threads may cache the same URL.
+    partial = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+    partial.write_bytes(data)
+    os.replace(partial, path)
+
+
+@dataclass
+class CachedResponse:
+    """A response body with the validators needed for revalidation."""
+
+    url: str
+    status: int
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    from_cache: bool = False
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="ignore")
+
+    def json(self) -> object:
+        return json.loads(self.body)
+
+
+class _ConnectionPool:
+    """One persistent connection per (thread, scheme, host, port)."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connections(self) -> Dict[Tuple[str, str, Optional[int]], http.client.HTTPConnection]:
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def get(self, scheme: str, host: str, port: Optional[int]) -> http.client.HTTPConnection:
+        key = (scheme, host, port)
+        connections = self._connections()
+        if key not in connections:
+            factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connections[key] = factory(host, port, timeout=self.timeout)
+        return connections[key]
+
+    def discard(self, scheme: str, host: str, port: Optional[int]) -> None:
+        connection = self._connections().pop((scheme, host, port), None)
+        if connection is not None:
+            connection.close()
+
+
+class CachedFetcher:
+    """
+    Fetch URLs through a disk cache with bounded concurrency.
+
+    Parameters
+    ----------
+    cache_dir : Path
+        Directory holding one ``<sha256(url)>.body``/``.json`` pair per URL.
+    offline : bool
+        Serve only from the cache; missing URLs raise ``OfflineCacheMiss``.
+    max_workers : int
+        Thread pool size used by ``fetch_many``.
+    retries : int
+        Extra attempts for connection errors and 429/5xx responses.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        offline: bool = False,
+        max_workers: int = 8,
+        retries: int = 2,
+        timeout: float = 30.0,
+        backoff: float = 0.5,
+        max_redirects: int = 5,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.offline = offline
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.max_redirects = max_redirects
+        self._pool = _ConnectionPool(timeout)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def _read_cache(self, url: str) -> Optional[CachedResponse]:
+        body_path, meta_path = self._paths(url)
+        if not body_path.exists() or not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text())
+        body = body_path.read_bytes()
+        if meta.get("body_sha256", hashlib.sha256(body).hexdigest()) != hashlib.sha256(body).hexdigest():
+            # Interrupted between replacing the body and the meta file: refetch.
+            return None
+        return CachedResponse(
+            url=url,
+            status=meta["status"],
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            from_cache=True,
+        )
+
+    def _write_cache(self, response: CachedResponse) -> None:
+        body_path, meta_path = self._paths(response.url)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "url": response.url,
+            "status": response.status,
+            "etag": response.etag,
+            "last_modified": response.last_modified,
+            "fetched_at": time.time(),
+            "body_sha256": hashlib.sha256(response.body).hexdigest(),
+        }
+        # Each file is written to a temporary name and renamed into place, body
+        # first, so an interrupted write never leaves a truncated file; the body
+        # hash in the meta file catches a new body paired with an old meta file.
+        _replace_atomically(body_path, response.body)
+        _replace_atomically(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes, str]:
+        """Issue a GET over a pooled connection, following redirects."""
+        for _ in range(self.max_redirects + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path = f"{path}?{parts.query}"
+            connection = self._pool.get(parts.scheme, parts.hostname or "", parts.port)
+            try:
+                connection.request("GET", path, headers=headers)
+                reply = connection.getresponse()
+                body = reply.read()
+            except (OSError, http.client.HTTPException):
+                self._pool.discard(parts.scheme, parts.hostname or "", parts.port)
+                raise
+            reply_headers = {key.lower(): value for key, value in reply.getheaders()}
+            if reply.will_close:
+                self._pool.discard(parts.scheme, parts.hostname or "", parts.port)
+            if reply.status in REDIRECT_STATUSES and "location" in reply_headers:
+                url = urljoin(url, reply_headers["location"])
+                continue
+            return reply.status, reply_headers, body, url
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def fetch(self, url: str) -> CachedResponse:
+        """Return the response for ``url``, revalidating any cached copy."""
+        cached = self._read_cache(url)
+        if self.offline:
+            if cached is None:
+                raise OfflineCacheMiss(f"No cached response for {url}")
+            return cached
+
+        headers = {"User-Agent": USER_AGENT, "Connection": "keep-alive"}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        for attempt in range(self.retries + 1):
+            try:
+                status, reply_headers, body, _ = self._request(url, headers)
+            except (OSError, http.client.HTTPException):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2**attempt)
+                continue
+            if status in RETRY_STATUSES and attempt < self.retries:
+                time.sleep(self.backoff * 2**attempt)
+                continue
+            break
+
+        if status == 304 and cached is not None:
+            return cached
+        if status >= 400:
+            raise http.client.HTTPException(f"HTTP {status} for {url}")
+        response = CachedResponse(
+            url=url,
+            status=status,
+            body=body,
+            etag=reply_headers.get("etag"),
+            last_modified=reply_headers.get("last-modified"),
+        )
+        self._write_cache(response)
+        return response
+
+    def fetch_many(self, urls: Iterable[str]) -> List[CachedResponse]:
+        """Fetch ``urls`` concurrently; results keep the input order."""
+        urls = list(urls)
+        if self.max_workers <= 1 or len(urls) <= 1:
+            return [self.fetch(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            return list(executor.map(self.fetch, urls))
@@ -0,0 +1,267 @@
+"""
+Secondary indexes over the master ESP table.
+
+``MasterIndex`` is built once per table and holds:
+
+- a sorted time index per column in ``INDEX_TIME_COLUMNS``: the non-missing
+  values in ascending order with their row positions, so a year range is two
+  binary searches whatever the span (10^0 to 10^9 years);
+- a bitmap index per column in ``INDEX_BITMAP_COLUMNS``: one packed bit per row
+  for every distinct value.
+
+Selections are ``Bitmap`` objects combined with ``&`` (AND), ``|`` (OR) and
+``~``; ``Bitmap.rows()`` gives ascending row positions for ``df.iloc``. Time
+values are parsed by ``parse_time_periods`` with its default ``present_year``,
+so ``years_bp`` is relative to ``BP_REFERENCE_YEAR``.
+
+Costs, for n rows and k matches: a ``select`` with a time range does two binary
+searches and probes each bitmap only at the rows in the range, O(log n + k).
+Bitmap-only selections combine packed bytes, O(n / 8) vectorized work per
+bitmap, and decode only the nonzero bytes into row positions.
+
+Example::
+
+    index = MasterIndex.build(df)
+    rows = index.select(Domain="Medicine", Quality_score=[4, 5], year_ce=(2000, None))
+    subset = df.iloc[rows]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.time_periods import parse_time_periods
+
+INDEX_TIME_COLUMNS = ("year_ce", "years_bp")
+INDEX_BITMAP_COLUMNS = ("Domain", "Subdomain", "PCS_level", "Quality_score")
+# Bitmap columns whose values are looked up as numbers (4 and "4" both match).
+NUMERIC_BITMAP_COLUMNS = ("PCS_level", "Quality_score")
+# Above this fraction of nonzero bytes, unpacking the whole bitmap is faster
+# than decoding the nonzero bytes one by one.
+DENSE_BYTE_FRACTION = 0.25
+
+
+class Bitmap:
+    """Packed row bitmap of a table with ``n_rows`` rows."""
+
+    __slots__ = ("bits", "n_rows")
+
+    def __init__(self, bits: np.ndarray, n_rows: int) -> None:
+        self.bits = bits
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "Bitmap":
+        return cls(np.packbits(np.asarray(mask, dtype=bool)), len(mask))
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray, n_rows: int) -> "Bitmap":
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) > n_rows // 8:
+            mask = np.zeros(n_rows, dtype=bool)
+            mask[rows] = True
+            return cls.from_mask(mask)
+        bits = np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+        np.bitwise_or.at(bits, rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8))
+        return cls(bits, n_rows)
+
+    @classmethod
+    def empty(cls, n_rows: int) -> "Bitmap":
+        return cls(np.zeros((n_rows + 7) // 8, dtype=np.uint8), n_rows)
+
+    @classmethod
+    def full(cls, n_rows: int) -> "Bitmap":
+        return cls.from_mask(np.ones(n_rows, dtype=bool))
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.bits & other.bits, self.n_rows)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.bits | other.bits, self.n_rows)
+
+    def __invert__(self) -> "Bitmap":
+        # XOR with a full bitmap keeps the padding bits of the last byte clear.
+        return Bitmap(self.bits ^ Bitmap.full(self.n_rows).bits, self.n_rows)
+
+    def count(self) -> int:
+        return int(np.bitwise_count(self.bits).sum())
+
+    def mask(self) -> np.ndarray:
+        return np.unpackbits(self.bits, count=self.n_rows).astype(bool)
+
+    def rows(self) -> np.ndarray:
+        """Ascending positions of the set rows (a sparse bitmap unpacks only its nonzero bytes)."""
+        if np.count_nonzero(self.bits) > DENSE_BYTE_FRACTION * len(self.bits):
+            return np.flatnonzero(np.unpackbits(self.bits, count=self.n_rows))
+        occupied = np.flatnonzero(self.bits)
+        set_bits = np.unpackbits(self.bits[occupied, None], axis=1).astype(bool)
+        return ((occupied[:, None] << 3) + np.arange(8))[set_bits]
+
+    def contains(self, rows: np.ndarray) -> np.ndarray:
+        """Whether each of ``rows`` is set, reading only their bytes."""
+        rows = np.asarray(rows, dtype=np.int64)
+        return ((self.bits[rows >> 3] >> (7 - (rows & 7))) & 1).astype(bool)
+
+
+def _lookup_key(column: str, value: object) -> object:
+    return float(value) if column in NUMERIC_BITMAP_COLUMNS else str(value)
+
+
+@dataclass
+class MasterIndex:
+    """
+    Sorted time indexes and bitmap indexes for one table.
+
+    Attributes
+    ----------
+    n_rows : int
+        Rows of the indexed table.
+    times : dict
+        Time column -> (ascending non-missing values, their row positions).
+    bitmaps : dict
+        Bitmap column -> value -> packed bits.
+    """
+
+    n_rows: int
+    times: Dict[str, Tuple[np.ndarray, np.ndarray]]
+    bitmaps: Dict[str, Dict[object, np.ndarray]]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "MasterIndex":
+        """Index ``df``; time columns are parsed from ``Time_period``."""
+        n_rows = len(df)
+        parsed = parse_time_periods(df["Time_period"].astype(object))
+        times = {}
+        for column in INDEX_TIME_COLUMNS:
+            values = parsed[column].to_numpy(dtype=np.float64)
+            rows = np.flatnonzero(~np.isnan(values))
+            order = rows[np.argsort(values[rows], kind="stable")]
+            times[column] = (values[order], order)
+        bitmaps: Dict[str, Dict[object, np.ndarray]] = {}
+        for column in INDEX_BITMAP_COLUMNS:
+            if column not in df.columns:
+                continue
+            series = df[column]
+            if column in NUMERIC_BITMAP_COLUMNS:
+                series = pd.to_numeric(series.astype(object)).astype(np.float64)
+            codes, uniques = pd.factorize(series)
+            bitmaps[column] = {
+                _lookup_key(column, value): np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+        return cls(n_rows, times, bitmaps)
+
+    def time_rows(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Row positions with ``low <= column <= high`` (bounds optional), in time order."""
+        values, rows = self.times[column]
+        start = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        stop = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+        return rows[start:stop]
+
+    def between(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> Bitmap:
+        """Rows with a time value in ``[low, high]``; no bounds means any parsed time."""
+        return Bitmap.from_rows(self.time_rows(column, low, high), self.n_rows)
+
+    def equals(self, column: str, *values: object) -> Bitmap:
+        """Rows where ``column`` equals any of ``values`` (OR)."""
+        index = self.bitmaps[column]
+        result = Bitmap.empty(self.n_rows)
+        for value in values:
+            bits = index.get(_lookup_key(column, value))
+            if bits is not None:
+                result = result | Bitmap(bits, self.n_rows)
+        return result
+
+    def values(self, column: str) -> Iterable[object]:
+        return self.bitmaps[column].keys()
+
+    def where(self, **criteria: object) -> Bitmap:
+        """
+        AND of one condition per column.
+
+        A time column takes a ``(low, high)`` pair (either may be ``None``); a
+        bitmap column takes a value or a list of values (OR).
+        """
+        result = Bitmap.full(self.n_rows)
+        for column, condition in criteria.items():
+            if column in self.times:
+                low, high = condition if condition is not None else (None, None)
+                result = result & self.between(column, low, high)
+            elif column in self.bitmaps:
+                values = condition if isinstance(condition, (list, tuple, set)) else [condition]
+                result = result & self.equals(column, *values)
+            else:
+                raise KeyError(f"{column!r} is not indexed")
+        return result
+
+    def select(self, **criteria: object) -> np.ndarray:
+        """
+        Ascending row positions matching ``where(**criteria)``.
+
+        When the narrowest time range matches at most ``n_rows / 8`` rows, the
+        other conditions are checked only at those rows; otherwise all
+        conditions are combined as bitmaps.
+        """
+        ranges = []
+        for column, condition in criteria.items():
+            if column in self.times:
+                low, high = condition if condition is not None else (None, None)
+                ranges.append(self.time_rows(column, low, high))
+        if not ranges:
+            return self.where(**criteria).rows()
+        ranges.sort(key=len)
+        if len(ranges[0]) > self.n_rows // 8 and len(criteria) > 1:
+            return self.where(**criteria).rows()
+        candidates = np.sort(ranges[0])
+        for rows in ranges[1:]:
+            candidates = candidates[Bitmap.from_rows(rows, self.n_rows).contains(candidates)]
+        others = {column: condition for column, condition in criteria.items() if column not in self.times}
+        for column, condition in others.items():
+            if column not in self.bitmaps:
+                raise KeyError(f"{column!r} is not indexed")
+            values = condition if isinstance(condition, (list, tuple, set)) else [condition]
+            keep = np.zeros(len(candidates), dtype=bool)
+            for value in values:
+                bits = self.bitmaps[column].get(_lookup_key(column, value))
+                if bits is not None:
+                    keep |= Bitmap(bits, self.n_rows).contains(candidates)
+            candidates = candidates[keep]
+        return candidates
+
+    def save(self, path: Path) -> None:
+        """Write the index to a ``.npz`` file (no pickled objects)."""
+        arrays: Dict[str, np.ndarray] = {"n_rows": np.array(self.n_rows)}
+        for column, (values, rows) in self.times.items():
+            arrays[f"time_values:{column}"] = values
+            arrays[f"time_rows:{column}"] = rows
+        for column, index in self.bitmaps.items():
+            keys = list(index)
+            dtype = np.float64 if column in NUMERIC_BITMAP_COLUMNS else np.str_
+            arrays[f"bitmap_values:{column}"] = np.array(keys, dtype=dtype)
+            arrays[f"bitmap_bits:{column}"] = (
+                np.stack([index[key] for key in keys]) if keys else np.zeros((0, (self.n_rows + 7) // 8), np.uint8)
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".partial.npz")
+        np.savez(partial, **arrays)
+        partial.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "MasterIndex":
+        with np.load(path) as saved:
+            times = {}
+            bitmaps: Dict[str, Dict[object, np.ndarray]] = {}
+            for name in saved.files:
+                kind, _, column = name.partition(":")
+                if kind == "time_values":
+                    times[column] = (saved[name], saved[f"time_rows:{column}"])
+                elif kind == "bitmap_values":
+                    bits = saved[f"bitmap_bits:{column}"]
+                    bitmaps[column] = {
+                        _lookup_key(column, value): bits[position] for position, value in enumerate(saved[name].tolist())
+                    }
+            return cls(int(saved["n_rows"]), times, bitmaps)
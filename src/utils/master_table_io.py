@@ -0,0 +1,226 @@
+"""
+Typed columnar storage for the master ESP table.
+
+The master table is written as Parquet with an explicit dtype schema next to
+the CSV export. Readers should use ``read_master_table``, which prefers the
+Parquet file (memory-mapped, no text parsing) and falls back to the CSV.
+Inside a pipeline run the typed table is handed to downstream stages in
+memory (see ``src/utils/artifacts.py``) and written only if it is a sink.
+
+Secondary indexes (``src/utils/master_index.py``) are written next to the
+table; ``read_master_index`` returns them, or builds them when they are stale.
+
+Repeated strings (``Source``, ``PCS_notes``, ``Subdomain``, ...) are interned
+as categoricals and scores are nullable Int8. ``compact_master_table`` keeps
+``log10_ESP`` as the primary numeric column: ``ESP`` is dropped in favour of a
+sparse ``ESP_override`` holding the exact value only where it differs from
+``10 ** log10_ESP``, and ``ESP_normalized`` and ``log10_ESP_normalized`` are
+dropped. ``expand_master_table`` restores all three bit for bit.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.artifacts import active_store, in_memory, read_table
+from src.utils.master_index import MasterIndex
+
+ROOT = Path(__file__).resolve().parents[2]
+MASTER_CSV_PATH = ROOT / "data/master_esp_table.csv"
+MASTER_PARQUET_PATH = ROOT / "data/master_esp_table.parquet"
+MASTER_INDEX_PATH = ROOT / "data/master_esp_table.index.npz"
+
+MASTER_SCHEMA: Dict[str, str] = {
+    "Domain": "category",
+    "Subdomain": "category",
+    "Time_period": "category",
+    "ESP": "float64",
+    "log10_ESP": "float64",
+    "log10_ESP_p2.5": "float64",
+    "log10_ESP_p50": "float64",
+    "log10_ESP_p97.5": "float64",
+    "PCS_level": "Int8",
+    "PCS_score": "float64",
+    "PCS_method": "category",
+    "PCS_notes": "category",
+    "ESP_normalized": "float64",
+    "log10_ESP_normalized": "float64",
+    "Quality_score": "Int8",
+    "Source": "category",
+}
+# CSV parse dtypes: categoricals are read as strings and interned by
+# ``apply_master_schema`` in first-appearance order.
+MASTER_CSV_DTYPES: Dict[str, object] = {
+    column: str if dtype in ("category", "string") else dtype for column, dtype in MASTER_SCHEMA.items()
+}
+# Columns computed from ESP and PCS_score by ``normalize_esp``; the compact
+# layout drops them.
+DERIVED_COLUMNS = ("ESP_normalized", "log10_ESP_normalized")
+# Exact ESP where ``10 ** log10_ESP`` does not reproduce it (rounding in the
+# last bits, or a source that reports a rounded log10_ESP); NaN elsewhere.
+ESP_OVERRIDE_COLUMN = "ESP_override"
+
+
+def apply_master_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast master table columns to ``MASTER_SCHEMA`` dtypes."""
+    df = df.copy()
+    for column, dtype in MASTER_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if dtype == "category":
+            # Keep first-appearance order so plots colour levels as before.
+            df[column] = pd.Categorical(values, categories=pd.unique(values.dropna()))
+            continue
+        if dtype.startswith(("float", "Int")):
+            values = pd.to_numeric(values)
+        df[column] = values.astype(dtype)
+    return df
+
+
+def normalize_esp(esp: np.ndarray, score: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """``ESP_normalized`` (ESP / PCS_score, NaN without a positive score) and its log10."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = np.where(score > 0, esp / score, np.nan)
+        return normalized, np.log10(normalized)
+
+
+def _esp_from_log10(log10_esp: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        return np.power(10.0, log10_esp)
+
+
+def _derived_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    normalized, log10_normalized = normalize_esp(
+        df["ESP"].to_numpy(dtype=np.float64), df["PCS_score"].to_numpy(dtype=np.float64)
+    )
+    return {"ESP_normalized": normalized, "log10_ESP_normalized": log10_normalized}
+
+
+def write_master_table(
+    df: pd.DataFrame,
+    csv_path: Path = MASTER_CSV_PATH,
+    parquet_path: Path = MASTER_PARQUET_PATH,
+    index_path: Path = MASTER_INDEX_PATH,
+) -> None:
+    """Write the typed Parquet table, the CSV export and the secondary indexes."""
+    typed = apply_master_schema(df)
+    store = active_store()
+    if store is not None:
+        store.put(csv_path, typed)
+        if not store.is_sink(csv_path):
+            return
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(csv_path, index=False)
+    typed.to_parquet(parquet_path, index=False, compression="zstd")
+    MasterIndex.build(typed).save(index_path)
+
+
+def master_table_available(
+    csv_path: Path = MASTER_CSV_PATH,
+    parquet_path: Path = MASTER_PARQUET_PATH,
+) -> bool:
+    """True if the master table is held in memory or exists on disk."""
+    return in_memory(csv_path) or parquet_path.exists() or csv_path.exists()
+
+
+def read_master_table(
+    csv_path: Path = MASTER_CSV_PATH,
+    parquet_path: Path = MASTER_PARQUET_PATH,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Load the master table with ``MASTER_SCHEMA`` dtypes.
+
+    A table published in memory by the current pipeline run is returned
+    first. Otherwise the Parquet file is used when it is at least as new as
+    the CSV, and the CSV is parsed with the schema applied as a fallback.
+    With ``compact`` the table is returned in the ``compact_master_table``
+    layout.
+    """
+    df = _read_master_table(csv_path, parquet_path)
+    return compact_master_table(df) if compact else df
+
+
+def _read_master_table(csv_path: Path, parquet_path: Path) -> pd.DataFrame:
+    if in_memory(csv_path):
+        return read_table(csv_path)
+    if parquet_path.exists() and (
+        not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        return pd.read_parquet(parquet_path, memory_map=True)
+    return apply_master_schema(pd.read_csv(csv_path, usecols=list(MASTER_CSV_DTYPES), dtype=MASTER_CSV_DTYPES))
+
+
+def compact_master_table(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compact in-memory layout of the master table.
+
+    Applies ``MASTER_SCHEMA``, drops each of the ``DERIVED_COLUMNS`` that
+    ``normalize_esp`` reproduces exactly and replaces ``ESP`` by the sparse
+    ``ESP_OVERRIDE_COLUMN``. A column that cannot be restored exactly is
+    kept, so ``expand_master_table`` restores the table without loss.
+    """
+    typed = apply_master_schema(df)
+    if not {"ESP", "PCS_score"} <= set(typed.columns):
+        return typed
+    derived = _derived_columns(typed)
+    dropped = [
+        column
+        for column in DERIVED_COLUMNS
+        if column in typed.columns
+        and np.array_equal(typed[column].to_numpy(dtype=np.float64), derived[column], equal_nan=True)
+    ]
+    if "log10_ESP" not in typed.columns:
+        return typed.drop(columns=dropped)
+    esp = typed["ESP"].to_numpy(dtype=np.float64)
+    restored = _esp_from_log10(typed["log10_ESP"].to_numpy(dtype=np.float64))
+    # NaN marks "no override", so a missing ESP must also be missing when restored.
+    if np.isnan(restored[np.isnan(esp)]).all():
+        override = np.where(restored == esp, np.nan, esp)
+        typed[ESP_OVERRIDE_COLUMN] = pd.arrays.SparseArray(override, fill_value=np.nan)
+        dropped.append("ESP")
+    return typed.drop(columns=dropped)
+
+
+def expand_master_table(compact: pd.DataFrame) -> pd.DataFrame:
+    """Master table with the ``ESP`` and ``DERIVED_COLUMNS`` a ``compact_master_table`` frame dropped."""
+    df = compact.copy()
+    if ESP_OVERRIDE_COLUMN in df.columns:
+        esp = _esp_from_log10(df["log10_ESP"].to_numpy(dtype=np.float64))
+        override = df.pop(ESP_OVERRIDE_COLUMN).to_numpy(dtype=np.float64)
+        df["ESP"] = np.where(np.isnan(override), esp, override)
+    missing = [column for column in DERIVED_COLUMNS if column not in df.columns]
+    if missing and {"ESP", "PCS_score"} <= set(df.columns):
+        derived = _derived_columns(df)
+        for column in missing:
+            df[column] = derived[column]
+    ordered = [column for column in MASTER_SCHEMA if column in df.columns]
+    return df[ordered + [column for column in df.columns if column not in MASTER_SCHEMA]]
+
+
+def read_master_index(
+    df: Optional[pd.DataFrame] = None,
+    csv_path: Path = MASTER_CSV_PATH,
+    parquet_path: Path = MASTER_PARQUET_PATH,
+    index_path: Path = MASTER_INDEX_PATH,
+) -> MasterIndex:
+    """
+    Secondary indexes for the master table.
+
+    The persisted index is used when it is at least as new as the table files
+    and covers as many rows as ``df``. Otherwise (no index yet, or a table
+    handed over in memory) the index is built from ``df``, or from the table
+    read from disk.
+    """
+    if not in_memory(csv_path) and index_path.exists():
+        tables = [path.stat().st_mtime for path in (csv_path, parquet_path) if path.exists()]
+        if index_path.stat().st_mtime >= max(tables, default=0.0):
+            index = MasterIndex.load(index_path)
+            if df is None or index.n_rows == len(df):
+                return index
+    return MasterIndex.build(read_master_table(csv_path, parquet_path) if df is None else df)
@@ -0,0 +1,480 @@
+"""
+Local read-only HTTP/JSON query service over the master table and f2 outputs.
+
+The master ESP table and the f2 result tables are loaded into memory once and
+queried without re-parsing. Encoded responses are kept in an LRU cache keyed by
+the request and the data version. At most every ``RELOAD_CHECK_SECONDS`` the
+source files are stat-ed; if any changed, every table is reloaded and the cache
+starts over. The server binds to localhost and makes no network calls.
+
+Endpoints (all ``GET``, JSON responses)
+--------------------------------------
+``/health``
+    Data version, loaded tables with row counts and cache statistics.
+``/tables``
+    Columns and dtypes of every table.
+``/rows/<table>``
+    Filtered rows. ``columns=a,b`` selects columns, ``sort=-col`` orders and
+    ``limit=N`` caps the rows returned (``count`` is the number matched).
+``/aggregate/<table>``
+    Grouped statistics: ``by=Domain,Subdomain`` and
+    ``metrics=log10_ESP:median,log10_ESP:count`` (statistics of
+    ``src/utils/summaries.py``), applied after the filters.
+``/fits``
+    Fit rows of ``tbl_f2_model_fits.csv`` with their non-empty parameters and
+    matching extrapolations; filter with ``domain=`` and ``model=``.
+
+Malformed queries get HTTP 400, unknown endpoints or tables 404 and any other
+failure 500, each with an ``{"error": ...}`` body.
+
+Filters are ``column=value`` (repeat for OR), or ``column__op=value`` with op in
+``ne``, ``lt``, ``le``, ``gt``, ``ge`` and ``in`` (comma-separated values).
+The master table has parsed ``year_ce`` and ``years_bp`` columns, e.g.
+``/rows/master?Domain=Medicine&year_ce__gt=2000&Quality_score__ge=4``.
+
+Usage: ``python -m src.utils.query_service --port 8765``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from src.utils.master_table_io import (
+    MASTER_CSV_DTYPES,
+    MASTER_CSV_PATH,
+    MASTER_PARQUET_PATH,
+    read_master_table,
+)
+from src.utils.summaries import GroupSpec, summarize
+from src.utils.time_periods import parse_time_periods
+
+ROOT = Path(__file__).resolve().parents[2]
+TABLES_DIR = ROOT / "results/tables"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_SIZE = 512
+RELOAD_CHECK_SECONDS = 1.0
+MAX_ROWS = 10_000
+
+# Table name -> files it is read from (a table with no existing file is skipped).
+TABLE_SOURCES: Dict[str, Tuple[Path, ...]] = {
+    "master": (MASTER_CSV_PATH, MASTER_PARQUET_PATH),
+    "analysis": (TABLES_DIR / "tbl_f2_analysis_dataset.csv",),
+    "fits": (TABLES_DIR / "tbl_f2_model_fits.csv",),
+    "extrapolations": (TABLES_DIR / "tbl_f2_extrapolations.csv",),
+    "piecewise": (TABLES_DIR / "tbl_f2_piecewise_fits.csv",),
+    "hierarchical_diagnostics": (TABLES_DIR / "tbl_f2_hierarchical_diagnostics.csv",),
+}
+# Parse dtypes of the f2 tables: the named text columns, float64 for the rest
+# (the fit tables have one column per model parameter).
+TABLE_DTYPES: Dict[str, Dict[str, object]] = {
+    "analysis": {**MASTER_CSV_DTYPES, "time_note": str},
+    "fits": {"domain": str, "model": str, "notes": str, "n": "int64"},
+    "extrapolations": {"domain": str, "model": str},
+    "piecewise": {"domain": str},
+    "hierarchical_diagnostics": {"parameter": str},
+}
+RESERVED_PARAMETERS = {"columns", "sort", "limit", "by", "metrics"}
+# Statistics that also apply to text columns; the others need a numeric column.
+ANY_COLUMN_STATISTICS = {"count", "nunique"}
+FILTER_OPERATORS: Dict[str, Callable[[pd.Series, object], pd.Series]] = {
+    "ne": lambda series, value: series != value,
+    "lt": lambda series, value: series < value,
+    "le": lambda series, value: series <= value,
+    "gt": lambda series, value: series > value,
+    "ge": lambda series, value: series >= value,
+}
+
+Params = List[Tuple[str, str]]
+
+
+class QueryError(ValueError):
+    """A malformed query; reported to the client as HTTP 400."""
+
+
+class NotFoundError(LookupError):
+    """An unknown endpoint or table; reported to the client as HTTP 404."""
+
+
+def _load_master(paths: Sequence[Path]) -> pd.DataFrame:
+    csv_path, parquet_path = paths
+    df = read_master_table(csv_path, parquet_path)
+    times = parse_time_periods(df["Time_period"])
+    df["year_ce"] = times["year_ce"].to_numpy()
+    df["years_bp"] = times["years_bp"].to_numpy()
+    return df
+
+
+def _load_table(name: str, paths: Sequence[Path]) -> pd.DataFrame:
+    if name == "master":
+        return _load_master(paths)
+    dtypes = defaultdict(lambda: "float64", TABLE_DTYPES.get(name, {}))
+    return pd.read_csv(paths[0], dtype=dtypes, float_precision="round_trip")
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    version: int
+    signature: Tuple[Tuple[str, int, int], ...]
+    tables: Dict[str, pd.DataFrame]
+    loaded_at: float
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry beyond ``maxsize``."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[object, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: object) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: object, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def _signature(sources: Dict[str, Tuple[Path, ...]]) -> Tuple[Tuple[str, int, int], ...]:
+    entries = []
+    for paths in sources.values():
+        for path in paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def _jsonable(value: object) -> object:
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, (np.bool_,)):
+        return bool(value)
+    if value is pd.NA or value is pd.NaT or value is None:
+        return None
+    return value
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, object]]:
+    """Rows as JSON-safe dicts; missing and non-finite values become ``null``."""
+    columns = list(df.columns)
+    return [
+        {column: _jsonable(value) for column, value in zip(columns, row)}
+        for row in df.itertuples(index=False, name=None)
+    ]
+
+
+def _coerce(series: pd.Series, value: str) -> object:
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        try:
+            return float(value)
+        except ValueError:
+            raise QueryError(f"{series.name}: {value!r} is not a number") from None
+    return value
+
+
+class QueryEngine:
+    """
+    In-memory tables with filter, aggregate and fit-lookup queries.
+
+    Parameters
+    ----------
+    sources : dict, optional
+        Table name -> source files; defaults to ``TABLE_SOURCES``.
+    cache_size : int
+        Maximum number of cached responses.
+    reload_interval : float
+        Minimum seconds between checks of the source files.
+    """
+
+    def __init__(
+        self,
+        sources: Optional[Dict[str, Tuple[Path, ...]]] = None,
+        cache_size: int = CACHE_SIZE,
+        reload_interval: float = RELOAD_CHECK_SECONDS,
+    ) -> None:
+        self.sources = dict(TABLE_SOURCES if sources is None else sources)
+        self.cache = LRUCache(cache_size)
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._snapshot = self._load(0, _signature(self.sources))
+
+    def _load(self, version: int, signature: Tuple[Tuple[str, int, int], ...]) -> _Snapshot:
+        tables = {}
+        for name, paths in self.sources.items():
+            existing = [path for path in paths if path.exists()]
+            if not existing:
+                continue
+            tables[name] = _load_table(name, paths)
+        return _Snapshot(version, signature, tables, time.time())
+
+    def snapshot(self) -> _Snapshot:
+        """Current tables, reloaded first if a source file changed since the last check."""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return self._snapshot
+        with self._lock:
+            if now - self._checked_at >= self.reload_interval:
+                signature = _signature(self.sources)
+                if signature != self._snapshot.signature:
+                    try:
+                        self._snapshot = self._load(self._snapshot.version + 1, signature)
+                    except Exception:
+                        # A file may be mid-write; keep serving the old data and retry later.
+                        pass
+                    else:
+                        self.cache.clear()
+                self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def handle(self, path: str, params: Params) -> bytes:
+        """Encoded JSON response for ``path``; raises ``QueryError`` or ``NotFoundError``."""
+        snapshot = self.snapshot()
+        if path == "/health":
+            return self._encode(self._health(snapshot))
+        key = (snapshot.version, path, tuple(sorted(params)))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        parts = [part for part in path.split("/") if part]
+        if parts == ["tables"]:
+            result = self._tables(snapshot)
+        elif parts == ["fits"]:
+            result = self._fits(snapshot, params)
+        elif len(parts) == 2 and parts[0] == "rows":
+            result = self.rows(self._table(snapshot, parts[1]), params)
+        elif len(parts) == 2 and parts[0] == "aggregate":
+            result = self.aggregate(self._table(snapshot, parts[1]), params)
+        else:
+            raise NotFoundError(f"unknown endpoint {path!r}")
+        body = self._encode(result)
+        self.cache.put(key, body)
+        return body
+
+    @staticmethod
+    def _encode(result: object) -> bytes:
+        return json.dumps(result, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    def _health(self, snapshot: _Snapshot) -> Dict[str, object]:
+        return {
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at,
+            "tables": {name: len(df) for name, df in snapshot.tables.items()},
+            "cache": self.cache.stats(),
+        }
+
+    @staticmethod
+    def _tables(snapshot: _Snapshot) -> Dict[str, object]:
+        return {
+            name: {"rows": len(df), "columns": {column: str(dtype) for column, dtype in df.dtypes.items()}}
+            for name, df in snapshot.tables.items()
+        }
+
+    @staticmethod
+    def _table(snapshot: _Snapshot, name: str) -> pd.DataFrame:
+        if name not in snapshot.tables:
+            raise NotFoundError(f"unknown table {name!r}; available: {', '.join(snapshot.tables)}")
+        return snapshot.tables[name]
+
+    @staticmethod
+    def _column(df: pd.DataFrame, column: str) -> pd.Series:
+        if column not in df.columns:
+            raise QueryError(f"unknown column {column!r}")
+        return df[column]
+
+    def filter(self, df: pd.DataFrame, params: Params) -> pd.DataFrame:
+        """Rows of ``df`` matching every filter in ``params``."""
+        equal: Dict[str, List[str]] = {}
+        mask = np.ones(len(df), dtype=bool)
+        for key, value in params:
+            if key in RESERVED_PARAMETERS:
+                continue
+            column, _, operator = key.partition("__")
+            series = self._column(df, column)
+            if not operator:
+                equal.setdefault(column, []).append(value)
+            elif operator == "in":
+                equal.setdefault(column, []).extend(item for item in value.split(",") if item)
+            elif operator in FILTER_OPERATORS:
+                target = _coerce(series, value)
+                if operator != "ne" and not isinstance(target, float):
+                    raise QueryError(f"{key}: ordering filters need a numeric column")
+                mask &= FILTER_OPERATORS[operator](series, target).fillna(False).to_numpy(dtype=bool)
+            else:
+                raise QueryError(f"{key}: unknown operator {operator!r}")
+        for column, values in equal.items():
+            series = df[column]
+            targets = [_coerce(series, value) for value in values]
+            mask &= series.isin(targets).to_numpy(dtype=bool)
+        return df if mask.all() else df[mask]
+
+    def rows(self, df: pd.DataFrame, params: Params) -> Dict[str, object]:
+        options = dict(params)
+        selected = self.filter(df, params)
+        if "sort" in options:
+            sort_keys = [key for key in options["sort"].split(",") if key]
+            columns = [key.lstrip("-") for key in sort_keys]
+            for column in columns:
+                self._column(df, column)
+            selected = selected.sort_values(
+                columns, ascending=[not key.startswith("-") for key in sort_keys], kind="stable"
+            )
+        try:
+            limit = min(int(options.get("limit", MAX_ROWS)), MAX_ROWS)
+        except ValueError:
+            raise QueryError(f"limit: {options['limit']!r} is not an integer") from None
+        if "columns" in options:
+            columns = [column for column in options["columns"].split(",") if column]
+            for column in columns:
+                self._column(df, column)
+            selected = selected[columns]
+        return {"count": len(selected), "rows": _records(selected.head(limit))}
+
+    def aggregate(self, df: pd.DataFrame, params: Params) -> Dict[str, object]:
+        options = dict(params)
+        keys = [key for key in options.get("by", "").split(",") if key]
+        metrics = [metric for metric in options.get("metrics", "").split(",") if metric]
+        if not metrics:
+            raise QueryError("metrics is required, e.g. metrics=log10_ESP:median")
+        stats = {}
+        for metric in metrics:
+            column, _, statistic = metric.partition(":")
+            statistic = statistic or "count"
+            series = self._column(df, column)
+            if statistic not in ANY_COLUMN_STATISTICS and not pd.api.types.is_numeric_dtype(series):
+                raise QueryError(f"{metric}: {statistic} needs a numeric column")
+            stats[f"{column}_{statistic}"] = (column, statistic)
+        for key in keys:
+            self._column(df, key)
+        try:
+            spec = GroupSpec(name="query", keys=keys, stats=stats)
+        except ValueError as error:
+            raise QueryError(str(error)) from None
+        selected = self.filter(df, params)
+        table = summarize(selected.reset_index(drop=True), [spec])["query"]
+        return {"count": len(selected), "groups": _records(table)}
+
+    def _fits(self, snapshot: _Snapshot, params: Params) -> Dict[str, object]:
+        filters = [(key, value) for key, value in params if key in ("domain", "model")]
+        fits = self.filter(self._table(snapshot, "fits"), filters)
+        extrapolations = snapshot.tables.get("extrapolations")
+        results = []
+        for record in _records(fits):
+            fit = {key: value for key, value in record.items() if value is not None}
+            if extrapolations is not None:
+                matches = extrapolations[
+                    (extrapolations["domain"] == record["domain"]) & (extrapolations["model"] == record["model"])
+                ]
+                fit["extrapolations"] = _records(matches.drop(columns=["domain", "model"]))
+            results.append(fit)
+        return {"count": len(results), "fits": results}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    engine: QueryEngine
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        url = urlsplit(self.path)
+        try:
+            body = self.engine.handle(unquote(url.path), parse_qsl(url.query, keep_blank_values=True))
+            status = HTTPStatus.OK
+        except QueryError as error:
+            body, status = self._error(error), HTTPStatus.BAD_REQUEST
+        except NotFoundError as error:
+            body, status = self._error(error), HTTPStatus.NOT_FOUND
+        except Exception as error:  # noqa: BLE001 - answer instead of dropping the connection
+            self.log_error("%s failed: %r", url.path, error)
+            body = json.dumps({"error": f"internal error: {type(error).__name__}"}).encode("utf-8")
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _error(error: Exception) -> bytes:
+        message = error.args[0] if error.args else str(error)
+        return json.dumps({"error": message}).encode("utf-8")
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - base class signature
+        if not self.server.quiet:  # type: ignore[attr-defined]
+            super().log_message(format, *args)
+
+
+def make_server(
+    engine: QueryEngine,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    quiet: bool = False,
+) -> ThreadingHTTPServer:
+    """A threaded HTTP server answering with ``engine`` (port 0 picks a free port)."""
+    handler = type("QueryHandler", (_Handler,), {"engine": engine})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet  # type: ignore[attr-defined]
+    return server
+
+
+def main(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, cache_size: int = CACHE_SIZE, quiet: bool = False) -> None:
+    engine = QueryEngine(cache_size=cache_size)
+    server = make_server(engine, host, port, quiet)
+    tables = ", ".join(f"{name} ({len(df)} rows)" for name, df in engine.snapshot().tables.items())
+    print(f"Serving {tables} on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the master table and f2 outputs over local HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind (default: localhost only).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="Cached responses kept (LRU).")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests.")
+    args = parser.parse_args()
+    main(host=args.host, port=args.port, cache_size=args.cache_size, quiet=args.quiet)
@@ -0,0 +1,259 @@
+"""
+Grouped summary tables computed from one pass over a DataFrame.
+
+A ``GroupSpec`` describes one output table: grouping keys, named statistics
+in the ``groupby().agg()`` style (``{"n": ("nnt", "count"), ...}``), rows to
+require and rounding. ``summarize`` builds every spec from shared work:
+
+- each key, item and value column is factorized, or argsorted, once;
+- a spec whose keys are a subset of an already built finer spec (over the same
+  rows) takes its group codes from the finer spec, and its count, sum, min and
+  max from the finer spec's per-group partials;
+- median, min and max are read off one value ordering per grouping, so the
+  rows are never passed through ``groupby``.
+
+Tables have the rows, groups (sorted by key, missing keys last) and counts of
+``df.groupby(keys, dropna=dropna).agg(...)``, so adding a summary table is one
+more spec. Sums and means are accumulated with ``np.bincount`` rather than
+pandas' compensated group sums, so they agree only to floating-point rounding
+(about 1e-12 relative); a value that sits on a rounding boundary can round to
+the neighbouring last digit.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.artifacts import write_table
+
+STATISTICS = ("count", "sum", "mean", "median", "min", "max", "nunique")
+# Statistics that can be merged from a finer grouping's per-group values.
+MERGEABLE = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+
+
+@dataclass
+class GroupSpec:
+    """
+    One summary table.
+
+    Parameters
+    ----------
+    name : str
+        Key of the table in the ``summarize`` result.
+    keys : sequence of str
+        Grouping columns.
+    stats : dict
+        Output column -> (input column, statistic), statistic in ``STATISTICS``.
+    require : sequence of str
+        Rows missing any of these columns are dropped first.
+    dropna : bool
+        Drop rows with missing keys (as ``groupby``); otherwise they form groups.
+    round : dict
+        Output column -> decimals.
+    path : str or Path, optional
+        Where ``write_summaries`` writes the table.
+    """
+
+    name: str
+    keys: Sequence[str]
+    stats: Dict[str, Tuple[str, str]]
+    require: Sequence[str] = ()
+    dropna: bool = True
+    round: Dict[str, int] = field(default_factory=dict)
+    path: Optional[Path | str] = None
+
+    def __post_init__(self) -> None:
+        for column, (_, statistic) in self.stats.items():
+            if statistic not in STATISTICS:
+                raise ValueError(f"{self.name}.{column}: unknown statistic {statistic!r}")
+
+
+@dataclass
+class _Grouping:
+    keys: Tuple[str, ...]
+    mask: np.ndarray
+    codes: np.ndarray  # row -> group code, -1 for rows outside ``mask``
+    levels: List[np.ndarray]  # per key: group -> index into the key's uniques
+    ngroups: int
+    partials: Dict[Tuple[str, str], np.ndarray] = field(default_factory=dict)
+
+
+class _Engine:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._factors: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+        self._orders: Dict[str, np.ndarray] = {}
+        self._notna: Dict[str, np.ndarray] = {}
+        self._items: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+        self._groupings: List[_Grouping] = []
+
+    def factor(self, column: str, sort: bool = True) -> Tuple[np.ndarray, pd.Index]:
+        """Codes and uniques of ``column``; unsorted factorizations only serve ``nunique``."""
+        if column in self._factors:
+            return self._factors[column]
+        codes, uniques = pd.factorize(self.df[column], sort=sort)
+        if sort:
+            self._factors[column] = (codes, pd.Index(uniques))
+        return codes, pd.Index(uniques)
+
+    def notna(self, column: str) -> np.ndarray:
+        if column not in self._notna:
+            self._notna[column] = self.df[column].notna().to_numpy()
+        return self._notna[column]
+
+    def order(self, column: str) -> np.ndarray:
+        """Row positions sorted by ``column`` (missing values last)."""
+        if column not in self._orders:
+            self._orders[column] = np.argsort(self.df[column].to_numpy(), kind="stable")
+        return self._orders[column]
+
+    def mask(self, spec: GroupSpec) -> np.ndarray:
+        mask = np.ones(len(self.df), dtype=bool)
+        for column in spec.require:
+            mask &= self.notna(column)
+        if spec.dropna:
+            for key in spec.keys:
+                mask &= self.factor(key)[0] >= 0
+        return mask
+
+    def grouping(self, spec: GroupSpec) -> _Grouping:
+        keys = tuple(spec.keys)
+        mask = self.mask(spec)
+        dims = [len(self.factor(key)[1]) + (0 if spec.dropna else 1) for key in keys]
+        finer = next(
+            (
+                grouping
+                for grouping in self._groupings
+                if set(keys) <= set(grouping.keys) and np.array_equal(grouping.mask, mask)
+            ),
+            None,
+        )
+        if finer is not None:
+            fine_levels = [finer.levels[finer.keys.index(key)] for key in keys]
+            combined = np.ravel_multi_index(fine_levels, dims) if keys else np.zeros(finer.ngroups, dtype=np.int64)
+            observed, lookup = np.unique(combined, return_inverse=True)
+            codes = np.where(finer.codes >= 0, lookup.reshape(-1)[finer.codes], -1)
+        else:
+            levels = []
+            for key, dim in zip(keys, dims):
+                key_codes = self.factor(key)[0]
+                # Missing keys (-1) become the last level, sorting after real values.
+                levels.append(np.where(key_codes >= 0, key_codes, dim - 1)[mask])
+            combined = np.ravel_multi_index(levels, dims) if keys else np.zeros(int(mask.sum()), dtype=np.int64)
+            observed, inverse = np.unique(combined, return_inverse=True)
+            codes = np.full(len(self.df), -1, dtype=np.int64)
+            codes[mask] = inverse.reshape(-1)
+            lookup = None
+        levels = list(np.unravel_index(observed, dims)) if keys else []
+        grouping = _Grouping(keys, mask, codes, levels, len(observed))
+        if finer is not None:
+            for (column, statistic), values in finer.partials.items():
+                if statistic in MERGEABLE:
+                    merged = pd.Series(values).groupby(lookup.reshape(-1)).agg(MERGEABLE[statistic])
+                    grouping.partials[(column, statistic)] = merged.to_numpy()
+        self._groupings.append(grouping)
+        return grouping
+
+    def key_frame(self, grouping: _Grouping) -> pd.DataFrame:
+        columns = {}
+        for key, level in zip(grouping.keys, grouping.levels):
+            uniques = self.factor(key)[1]
+            # Index.take with fill maps the extra "missing" level to NaN.
+            present = level < len(uniques)
+            taken = uniques.take(np.where(present, level, -1), allow_fill=not present.all(), fill_value=np.nan)
+            columns[key] = taken.to_numpy()
+        return pd.DataFrame(columns)
+
+    def statistic(self, grouping: _Grouping, column: str, statistic: str) -> np.ndarray:
+        cache_key = (column, statistic)
+        if statistic == "mean":
+            count = self.statistic(grouping, column, "count")
+            total = self.statistic(grouping, column, "sum")
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return total / np.where(count > 0, count, np.nan)
+        if cache_key in grouping.partials:
+            return grouping.partials[cache_key]
+        valid = (grouping.codes >= 0) & self.notna(column)
+        if statistic == "count":
+            result = np.bincount(grouping.codes[valid], minlength=grouping.ngroups).astype(np.int64)
+        elif statistic == "sum":
+            values = self.df[column].to_numpy()[valid].astype(np.float64)
+            result = np.bincount(grouping.codes[valid], weights=values, minlength=grouping.ngroups)
+        elif statistic == "nunique":
+            item_codes, uniques = self._items.get(column) or self.factor(column, sort=False)
+            self._items[column] = (item_codes, uniques)
+            valid &= item_codes >= 0
+            pairs = np.unique(grouping.codes[valid] * max(len(uniques), 1) + item_codes[valid])
+            result = np.bincount(pairs // max(len(uniques), 1), minlength=grouping.ngroups).astype(np.int64)
+        else:
+            self._order_statistics(grouping, column)
+            return grouping.partials[cache_key]
+        grouping.partials[cache_key] = result
+        return result
+
+    def _order_statistics(self, grouping: _Grouping, column: str) -> None:
+        """Median, min and max for every group from one ordering of ``column``."""
+        order = self.order(column)
+        order = order[(grouping.codes[order] >= 0) & self.notna(column)[order]]
+        # Stable sort by group keeps values ascending inside each group; numpy
+        # radix-sorts 16-bit integers, so narrow the codes when they fit.
+        group_codes = grouping.codes[order]
+        if grouping.ngroups <= np.iinfo(np.uint16).max:
+            group_codes = group_codes.astype(np.uint16)
+        order = order[np.argsort(group_codes, kind="stable")]
+        values = self.df[column].to_numpy()[order]
+        counts = np.bincount(grouping.codes[order], minlength=grouping.ngroups)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        present = counts > 0
+        lower = starts + (counts - 1) // 2
+        upper = starts + counts // 2
+        if present.all():
+            low, high = values[starts], values[ends - 1]
+            median = (values[lower] + values[upper]) / 2.0
+        else:
+            low = np.full(grouping.ngroups, np.nan)
+            high = np.full(grouping.ngroups, np.nan)
+            median = np.full(grouping.ngroups, np.nan)
+            low[present] = values[starts[present]]
+            high[present] = values[ends[present] - 1]
+            median[present] = (values[lower[present]] + values[upper[present]]) / 2.0
+        grouping.partials[(column, "min")] = low
+        grouping.partials[(column, "max")] = high
+        grouping.partials[(column, "median")] = median
+        grouping.partials.setdefault((column, "count"), counts.astype(np.int64))
+
+
+def _specs_finest_first(specs: Sequence[GroupSpec]) -> List[GroupSpec]:
+    return sorted(specs, key=lambda spec: -len(spec.keys))
+
+
+def summarize(df: pd.DataFrame, specs: Iterable[GroupSpec]) -> Dict[str, pd.DataFrame]:
+    """Compute every spec over ``df``; returns tables keyed by ``spec.name`` in spec order."""
+    specs = list(specs)
+    engine = _Engine(df)
+    tables = {}
+    for spec in _specs_finest_first(specs):
+        grouping = engine.grouping(spec)
+        table = engine.key_frame(grouping)
+        for output, (column, statistic) in spec.stats.items():
+            table[output] = engine.statistic(grouping, column, statistic)
+        for output, decimals in spec.round.items():
+            table[output] = table[output].round(decimals)
+        tables[spec.name] = table
+    return {spec.name: tables[spec.name] for spec in specs}
+
+
+def write_summaries(df: pd.DataFrame, specs: Iterable[GroupSpec]) -> Dict[str, pd.DataFrame]:
+    """``summarize`` and write each table with a ``path`` through ``write_table``."""
+    specs = list(specs)
+    tables = summarize(df, specs)
+    for spec in specs:
+        if spec.path is not None:
+            write_table(tables[spec.name], spec.path)
+    return tables
@@ -0,0 +1,131 @@
+"""
+Parse free-text ``Time_period`` strings into numeric calendar years.
+
+Strings are normalized once per distinct value: the common ``YYYY`` and
+``YYYY-YYYY`` forms are handled with a vectorized ``Series.str.extract`` and
+the remainder (BP, kya, Ma, Ga) fall back to a memoized scalar parser, so cost
+scales with the number of distinct strings rather than rows.
+
+Conventions
+-----------
+- ``year_ce`` is a calendar year (negative = BCE); ranges map to their midpoint.
+- ``years_bp`` is ``present_year - year_ce``. Deep-time units (BP, kya, Ma, Ga)
+  are interpreted relative to the same ``present_year``.
+- ``year_uncertainty`` is the half-width of a stated range in years (0 for
+  point values).
+- "modern", "unknown" and unparseable strings yield NaN.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Radiocarbon "Before Present" reference year.
+BP_REFERENCE_YEAR = 1950.0
+
+TIME_COLUMNS = ["year_ce", "years_bp", "year_uncertainty"]
+
+_UNIT_SCALES = {
+    "bp": 1.0,
+    "kya": 1e3,
+    "ka": 1e3,
+    "ma": 1e6,
+    "mya": 1e6,
+    "ga": 1e9,
+    "gya": 1e9,
+}
+_UNIT_PATTERN = re.compile(r"\b(bp|kya|ka|mya|ma|gya|ga)\b", flags=re.I)
+_NUMBER_PATTERN = re.compile(r"\d+\.\d+|\d+")
+_YEAR_RANGE_PATTERN = r"^(\d{3,4})(?:\s*-\s*(\d{3,4}))?$"
+_EMBEDDED_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def _clean(text: str) -> str:
+    return text.replace("~", "").replace("ca.", "").strip()
+
+
+@lru_cache(maxsize=4096)
+def _parse_cleaned(text: str, present_year: float) -> Tuple[float, float]:
+    """Return (year_ce, half-width) for a cleaned, non-fast-path string."""
+    lowered = text.lower()
+    if not lowered or "unknown" in lowered or "modern" in lowered:
+        return np.nan, np.nan
+    unit = _UNIT_PATTERN.search(text)
+    if unit:
+        numbers = [float(value) for value in _NUMBER_PATTERN.findall(text[: unit.start()])]
+        if not numbers:
+            return np.nan, np.nan
+        low, high = min(numbers[:2]), max(numbers[:2])
+        scale = _UNIT_SCALES[unit.group(1).lower()]
+        years_bp = (low + high) / 2.0 * scale
+        return present_year - years_bp, (high - low) / 2.0 * scale
+    match = re.fullmatch(_YEAR_RANGE_PATTERN, text)
+    if match:
+        start = float(match.group(1))
+        end = float(match.group(2) or match.group(1))
+        return (start + end) / 2.0, abs(end - start) / 2.0
+    match = _EMBEDDED_YEAR_PATTERN.search(text)
+    if match:
+        return float(match.group(0)), 0.0
+    return np.nan, np.nan
+
+
+def parse_time_period(value: object, present_year: float = BP_REFERENCE_YEAR) -> Optional[float]:
+    """Parse a single time period string into a calendar year (None if unparsed)."""
+    if not isinstance(value, str):
+        return None
+    year, _ = _parse_cleaned(_clean(value), float(present_year))
+    return None if np.isnan(year) else year
+
+
+def parse_time_periods(
+    values: pd.Series | Iterable[object],
+    present_year: float = BP_REFERENCE_YEAR,
+) -> pd.DataFrame:
+    """
+    Parse a column of time period strings.
+
+    Parameters
+    ----------
+    values : pd.Series or iterable
+        Raw ``Time_period`` values; non-strings are treated as unparsed.
+    present_year : float
+        Reference year for ``years_bp`` and for BP/kya/Ma/Ga inputs.
+
+    Returns
+    -------
+    pd.DataFrame
+        ``year_ce``, ``years_bp`` and ``year_uncertainty`` aligned to the
+        input index.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    strings = pd.Series([value if isinstance(value, str) else None for value in uniques], dtype=object)
+    cleaned = strings.str.replace("~", "", regex=False).str.replace("ca.", "", regex=False).str.strip()
+
+    extracted = cleaned.str.extract(_YEAR_RANGE_PATTERN).astype(float)
+    start = extracted[0].to_numpy()
+    end = extracted[1].fillna(extracted[0]).to_numpy()
+    year = (start + end) / 2.0
+    uncertainty = np.abs(end - start) / 2.0
+
+    slow = np.flatnonzero(np.isnan(year) & cleaned.notna().to_numpy())
+    for pos in slow:
+        year[pos], uncertainty[pos] = _parse_cleaned(cleaned.iat[pos], float(present_year))
+
+    # Factorize marks missing values with -1, which indexes the trailing NaN.
+    year = np.append(year, np.nan)[codes]
+    uncertainty = np.append(uncertainty, np.nan)[codes]
+    return pd.DataFrame(
+        {
+            "year_ce": year,
+            "years_bp": present_year - year,
+            "year_uncertainty": uncertainty,
+        },
+        index=series.index,
+    )
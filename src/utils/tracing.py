@@ -0,0 +1,240 @@
+"""
+Opt-in timing and resource tracing for pipeline stages.
+
+Set ``ESP_TRACE=1`` to record a span for every traced call: wall time, CPU
+time, resident memory and row count, together with its parent span. Memory is
+the process RSS when the span starts and ends (``rss_start_mb``,
+``rss_end_mb``) and the process high-water mark so far
+(``process_peak_rss_mb``). These are process-wide, not per-span: spans running
+concurrently in threads (``--jobs``) share one process and see each other's
+allocations. Each process
+appends one JSON object per finished span to ``trace-<pid>.jsonl`` under
+``ESP_TRACE_DIR`` (default ``.cache/trace``), so spans from process-pool workers
+are kept as well. ``python -m src.utils.tracing`` merges the files into
+``trace.csv``. With ``ESP_TRACE_PROFILE=1`` spans opened with ``profile=True``
+(one per pipeline stage) also dump a cProfile ``.prof`` file.
+
+When ``ESP_TRACE`` is unset, ``traced`` returns the function unchanged and
+``span`` returns a shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import functools
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+ROOT = Path(__file__).resolve().parents[2]
+ENABLED = os.environ.get("ESP_TRACE", "") not in ("", "0")
+PROFILE = os.environ.get("ESP_TRACE_PROFILE", "") not in ("", "0")
+TRACE_DIR = Path(os.environ.get("ESP_TRACE_DIR", ROOT / ".cache/trace"))
+TRACE_COLUMNS = [
+    "name",
+    "parent",
+    "pid",
+    "thread",
+    "start",
+    "wall_s",
+    "cpu_s",
+    "rss_start_mb",
+    "rss_end_mb",
+    "process_peak_rss_mb",
+    "rows",
+    "error",
+]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def _stack() -> List[str]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+_STATM_PATH = Path("/proc/self/statm")
+_PAGE_MB = os.sysconf("SC_PAGE_SIZE") / 2**20 if hasattr(os, "sysconf") else None
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size of this process (Linux only)."""
+    if _PAGE_MB is None:
+        return None
+    try:
+        return int(_STATM_PATH.read_text().split()[1]) * _PAGE_MB
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _process_peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux; this is the process high-water mark.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _count_rows(value: Any) -> Optional[int]:
+    if hasattr(value, "shape") and len(getattr(value, "shape")) > 0:
+        return int(value.shape[0])
+    if isinstance(value, (list, tuple, dict)):
+        return len(value)
+    return None
+
+
+class _NullSpan:
+    """Stand-in returned by ``span`` when tracing is off."""
+
+    rows: Optional[int] = None
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def __setattr__(self, name: str, value: object) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed region; set ``rows`` inside the block to record a row count."""
+
+    def __init__(self, name: str, rows: Optional[int] = None, profile: bool = False) -> None:
+        self.name = name
+        self.rows = rows
+        self.profile = profile and PROFILE
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> "Span":
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        # cProfile hooks are per thread; only the outermost profiled span records.
+        if self.profile and not getattr(_local, "profiling", False):
+            _local.profiling = True
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.time()
+        self._rss_start = _rss_mb()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc: object, tb: object) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        if self._profiler is not None:
+            self._profiler.disable()
+            _local.profiling = False
+            TRACE_DIR.mkdir(parents=True, exist_ok=True)
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.name)
+            self._profiler.dump_stats(TRACE_DIR / f"{safe_name}-{os.getpid()}.prof")
+        _stack().pop()
+        _emit(
+            {
+                "name": self.name,
+                "parent": self.parent,
+                "pid": os.getpid(),
+                "thread": threading.current_thread().name,
+                "start": self._start,
+                "wall_s": wall,
+                "cpu_s": cpu,
+                "rss_start_mb": self._rss_start,
+                "rss_end_mb": _rss_mb(),
+                "process_peak_rss_mb": _process_peak_rss_mb(),
+                "rows": self.rows,
+                "error": None if exc_type is None else exc_type.__name__,
+            }
+        )
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    # Append per span: pool workers exit via os._exit, so atexit hooks never run.
+    line = json.dumps(record) + "\n"
+    with _write_lock:
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(TRACE_DIR / f"trace-{os.getpid()}.jsonl", "a") as handle:
+            handle.write(line)
+
+
+def span(name: str, rows: Optional[int] = None, profile: bool = False) -> Span | _NullSpan:
+    """Context manager timing the enclosed block as ``name``."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, rows=rows, profile=profile)
+
+
+def traced(
+    name: Optional[str] = None,
+    rows: Optional[Callable[[Any], Optional[int]]] = None,
+) -> Callable[[F], F]:
+    """
+    Decorate a function so each call is recorded as a span.
+
+    Parameters
+    ----------
+    name : str, optional
+        Span name; defaults to ``module.qualname``.
+    rows : callable, optional
+        Maps the return value to a row count. By default the length of a
+        DataFrame, array, list or dict result is used.
+    """
+
+    def decorate(func: F) -> F:
+        if not ENABLED:
+            return func
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+        count = rows or _count_rows
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with Span(span_name) as current:
+                result = func(*args, **kwargs)
+                current.rows = count(result)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def collect_trace(trace_dir: Path = TRACE_DIR) -> "pd.DataFrame":
+    """Merge every ``trace-*.jsonl`` file in ``trace_dir`` into one table."""
+    import pandas as pd
+
+    records = []
+    for path in sorted(trace_dir.glob("trace-*.jsonl")):
+        with open(path) as handle:
+            records.extend(json.loads(line) for line in handle if line.strip())
+    return pd.DataFrame(records, columns=TRACE_COLUMNS).sort_values("start", kind="stable")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge ESP trace files into a CSV.")
+    parser.add_argument("--trace-dir", type=Path, default=TRACE_DIR, help="Directory of trace-*.jsonl files.")
+    parser.add_argument("--output", type=Path, default=None, help="CSV path (default: <trace-dir>/trace.csv).")
+    args = parser.parse_args()
+    trace = collect_trace(args.trace_dir)
+    output = args.output or args.trace_dir / "trace.csv"
+    trace.to_csv(output, index=False)
+    summary = trace.groupby("name", sort=False).agg(calls=("wall_s", "size"), wall_s=("wall_s", "sum"))
+    print(summary.sort_values("wall_s", ascending=False).head(20).to_string())
+    print(f"Wrote {len(trace)} spans to {output}")
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from src.utils.ensemble_sampler import gelman_rubin, integrated_autocorr_time, run_ensemble, run_ensembles
+
+SCALES = np.array([1.0, 3.0])
+
+
+def gaussian(walkers):
+    return -0.5 * np.sum((walkers / SCALES) ** 2, axis=1)
+
+
+def _initial(seed=0, n_walkers=8):
+    return np.random.default_rng(seed).normal(0.0, 0.1, (n_walkers, len(SCALES)))
+
+
+def test_ensemble_samples_the_target():
+    run = run_ensemble(gaussian, _initial(), 3000, np.random.default_rng(1))
+    assert run.chain.shape == (3000, 8, 2) and run.log_prob.shape == (3000, 8)
+    np.testing.assert_allclose(run.log_prob, gaussian(run.chain.reshape(-1, 2)).reshape(3000, 8))
+    samples = run.chain[1000:].reshape(-1, 2)
+    np.testing.assert_allclose(samples.mean(axis=0), [0.0, 0.0], atol=0.3)
+    np.testing.assert_allclose(samples.std(axis=0), SCALES, rtol=0.15)
+    assert 0.2 < run.accepted.mean() / 3000 < 0.9
+    assert run.seconds > 0
+
+
+def test_resumed_run_matches_an_uninterrupted_run(tmp_path):
+    whole = run_ensemble(gaussian, _initial(), 300, np.random.default_rng(4))
+    checkpoint = tmp_path / "chain.npz"
+    first = run_ensemble(gaussian, _initial(), 120, np.random.default_rng(4), checkpoint, checkpoint_every=50)
+    # A different generator: the saved state must take over.
+    resumed = run_ensemble(gaussian, _initial(), 300, np.random.default_rng(99), checkpoint, checkpoint_every=50)
+    np.testing.assert_array_equal(resumed.chain, whole.chain)
+    np.testing.assert_array_equal(resumed.log_prob, whole.log_prob)
+    np.testing.assert_array_equal(resumed.accepted, whole.accepted)
+    assert resumed.seconds >= first.seconds
+    assert [path.name for path in tmp_path.iterdir()] == ["chain.npz"]
+
+
+def test_ensembles_do_not_depend_on_worker_count():
+    initial = [_initial(seed) for seed in range(3)]
+    serial = run_ensembles(gaussian, initial, 50, seed=7, workers=1)
+    parallel = run_ensembles(gaussian, initial, 50, seed=7, workers=2)
+    for left, right in zip(serial, parallel):
+        np.testing.assert_array_equal(left.chain, right.chain)
+    assert not np.array_equal(serial[0].chain, serial[1].chain)
+
+
+def test_walker_count_is_checked():
+    with pytest.raises(ValueError, match="even number"):
+        run_ensemble(gaussian, _initial(n_walkers=3), 10, np.random.default_rng(0))
+
+
+def test_diagnostics_on_independent_draws():
+    rng = np.random.default_rng(5)
+    chains = [rng.normal(size=(2000, 4, 2)) for _ in range(3)]
+    np.testing.assert_allclose(integrated_autocorr_time(chains[0]), 1.0, atol=0.2)
+    np.testing.assert_allclose(gelman_rubin(chains), 1.0, atol=0.01)
+    shifted = [chains[0], chains[1] + 3.0]
+    assert (gelman_rubin(shifted) > 1.5).all()
+    assert np.isnan(gelman_rubin(chains[:1])).all()
+
+
+def test_autocorr_time_grows_with_correlation():
+    rng = np.random.default_rng(6)
+    noise = rng.normal(size=(5000, 4, 1))
+    ar = np.empty_like(noise)
+    ar[0] = noise[0]
+    for step in range(1, len(noise)):
+        ar[step] = 0.9 * ar[step - 1] + noise[step]
+    # tau = (1 + phi) / (1 - phi) for an AR(1) process.
+    assert integrated_autocorr_time(ar)[0] == pytest.approx(19.0, rel=0.25)
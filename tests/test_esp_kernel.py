@@ -0,0 +1,72 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.esp_kernel import esp_batch, esp_columns, esp_kernel
+
+
+def _beta_cdf(x, a, b, points=200_001):
+    """I_x(a, b) by the trapezoid rule in t = sqrt(x), which removes the a = 1/2 singularity."""
+    if a > b:
+        # Keep the large exponent on t, where the trapezoid grid resolves the peak.
+        return 1.0 - _beta_cdf(1.0 - x, b, a, points)
+    t = np.linspace(0.0, math.sqrt(x), points)
+    density = 2.0 * t ** (2.0 * a - 1.0) * (1.0 - t * t) ** (b - 1.0)
+    log_beta = math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b)
+    return float(np.trapezoid(density, t)) / math.exp(log_beta)
+
+
+def test_esp_and_interval_follow_the_success_rate():
+    result = esp_kernel([100, 40, "n/a", 0, -5, 20], [4, 0, 3, 1, 2, 25])
+    np.testing.assert_array_equal(result["esp"][:2], [25.0, np.nan])
+    assert result["log10_esp"][0] == pytest.approx(math.log10(25.0))
+    assert 0 < result["rate_ci_low"][0] < 0.04 < result["rate_ci_high"][0]
+    np.testing.assert_allclose(result["esp_ci_low"], 1.0 / result["rate_ci_high"])
+    # Zero successes: undefined ESP, finite lower bound, unbounded upper bound.
+    assert np.isfinite(result["esp_ci_low"][1]) and result["esp_ci_high"][1] == np.inf
+    # Missing or non-positive trials give NaN throughout.
+    for name, values in result.items():
+        assert np.isnan(values[2:5]).all(), name
+    # More successes than trials keep the ratio but get no interval.
+    assert result["esp"][5] == pytest.approx(0.8)
+    assert np.isnan([result["esp_ci_low"][5], result["esp_ci_high"][5]]).all()
+
+
+@pytest.mark.parametrize("successes, trials", [(1, 10), (5, 20), (37, 1000), (2, 100_000), (999, 1000)])
+def test_jeffreys_bounds_are_beta_quantiles(successes, trials):
+    result = esp_kernel([trials], [successes], interval="jeffreys")
+    a, b = successes + 0.5, trials - successes + 0.5
+    assert _beta_cdf(result["rate_ci_low"][0], a, b) == pytest.approx(0.025, abs=1e-6)
+    assert _beta_cdf(result["rate_ci_high"][0], a, b) == pytest.approx(0.975, abs=1e-6)
+
+
+def test_jeffreys_bounds_at_the_edges_of_the_rate():
+    result = esp_kernel([50, 30], [0, 30], interval="jeffreys")
+    assert result["rate_ci_low"][0] == 0.0 and result["rate_ci_high"][1] == 1.0
+    assert _beta_cdf(result["rate_ci_high"][0], 0.5, 50.5) == pytest.approx(0.975, abs=1e-6)
+
+
+def test_jeffreys_is_close_to_wilson_for_moderate_counts():
+    trials, successes = [200, 5000], [40, 120]
+    wilson = esp_kernel(trials, successes)
+    jeffreys = esp_kernel(trials, successes, interval="jeffreys")
+    for name in ("esp_ci_low", "esp_ci_high"):
+        np.testing.assert_allclose(jeffreys[name], wilson[name], rtol=0.02)
+
+
+def test_batch_matches_separate_calls():
+    inputs = [([10, 20], [1, 0]), ([], []), ([1000], [7])]
+    for interval in ("wilson", "jeffreys"):
+        batched = esp_batch(inputs, interval=interval)
+        assert len(batched) == len(inputs)
+        for pair, result in zip(inputs, batched):
+            expected = esp_kernel(*pair, interval=interval)
+            for name, values in expected.items():
+                np.testing.assert_array_equal(result[name], values)
+
+
+def test_columns_are_named_after_the_prefix_and_bad_interval_is_rejected():
+    assert list(esp_columns([10], [2], name="nnt")) == ["nnt", "log10_nnt", "nnt_ci_low", "nnt_ci_high"]
+    with pytest.raises(ValueError, match="interval"):
+        esp_kernel([10], [2], interval="exact")
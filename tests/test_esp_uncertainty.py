@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import esp_uncertainty as uncertainty
+from src.utils.esp_kernel import esp_kernel
+
+
+def test_histogram_percentiles_match_the_drawn_samples():
+    params = np.array([[100.0, 3.0], [20.0, 10.0], [1e6, 1.0]])
+    samples = uncertainty.PILOT_SAMPLES
+    estimated = uncertainty.sample_percentiles("binomial", params, samples, rng=np.random.default_rng(5))
+    drawn = uncertainty._sample_binomial(params, np.random.default_rng(5), samples)
+    exact = np.percentile(drawn, uncertainty.PERCENTILES, axis=1).T
+    bin_width = (drawn.max(axis=1) - drawn.min(axis=1)) / uncertainty.N_BINS
+    assert (np.abs(estimated - exact) <= 2 * bin_width[:, None]).all()
+
+
+def test_log_uniform_percentiles_are_linear_in_log10():
+    params = np.array([[0.0, 2.0], [1.0, 1.5]])
+    estimated = uncertainty.sample_percentiles("log_uniform", params, 200_000)
+    expected = params[:, :1] + np.array(uncertainty.PERCENTILES) / 100 * (params[:, 1:] - params[:, :1])
+    np.testing.assert_allclose(estimated, expected, atol=0.01)
+
+
+def test_binomial_percentiles_agree_with_the_jeffreys_interval():
+    trials, successes = np.array([50.0, 2000.0]), np.array([4.0, 35.0])
+    estimated = uncertainty.sample_percentiles("binomial", np.column_stack([trials, successes]), 400_000)
+    interval = esp_kernel(trials, successes, interval="jeffreys")
+    np.testing.assert_allclose(estimated[:, 0], np.log10(interval["esp_ci_low"]), atol=0.01)
+    np.testing.assert_allclose(estimated[:, 2], np.log10(interval["esp_ci_high"]), atol=0.01)
+
+
+def test_percentiles_do_not_depend_on_chunk_size(monkeypatch):
+    params = np.array([[30.0, 5.0, 2.0, 4.0]])
+    whole = uncertainty.sample_percentiles("speedup", params, 50_000, rng=np.random.default_rng(2))
+    monkeypatch.setattr(uncertainty, "CHUNK_ELEMENTS", 4096)
+    chunked = uncertainty.sample_percentiles("speedup", params, 50_000, rng=np.random.default_rng(3))
+    np.testing.assert_allclose(chunked, whole, atol=0.02)
+
+
+def test_differences_without_benefit_have_an_infinite_upper_percentile():
+    # The arms barely differ, so well over 2.5% of draws show no benefit.
+    params = np.array([[100.0, 12.0, 100.0, 10.0], [1000.0, 300.0, 1000.0, 100.0]])
+    estimated = uncertainty.sample_percentiles("binomial_difference", params, 50_000)
+    assert estimated[0, 2] == np.inf and np.isfinite(estimated[0, :2]).all()
+    np.testing.assert_allclose(estimated[1, 1], -np.log10(0.2), atol=0.01)
+
+
+def test_esp_percentiles_repeat_point_estimates_and_are_reproducible():
+    df = pd.DataFrame(
+        {
+            "log10_ESP": [1.0, 2.0, 0.5],
+            "ESP_dist": [None, "log_uniform", None],
+            "ESP_dist_params": [None, (1.5, 2.5), None],
+        },
+        index=[7, 8, 9],
+    )
+    first = uncertainty.esp_percentiles(df, samples=20_000)
+    assert list(first.columns) == uncertainty.PERCENTILE_COLUMNS
+    assert list(first.index) == [7, 8, 9]
+    np.testing.assert_array_equal(first.loc[[7, 9]].to_numpy(), [[1.0] * 3, [0.5] * 3])
+    assert first.loc[8, "log10_ESP_p50"] == pytest.approx(2.0, abs=0.02)
+    pd.testing.assert_frame_equal(uncertainty.esp_percentiles(df, samples=20_000), first)
+    point_only = uncertainty.esp_percentiles(df[["log10_ESP"]], samples=20_000)
+    np.testing.assert_array_equal(point_only.to_numpy(), np.repeat(df[["log10_ESP"]].to_numpy(), 3, axis=1))
@@ -0,0 +1,35 @@
+import pytest
+
+from src.preprocessing.extract_thennt_nnt import extract_benefit_harm_rows, extract_page_rows
+
+PAGE = """<html><body><p>filler &amp; more</p>
+<article class="ben_har ben_har_A card"><h2>Benefits</h2>
+<div class="info__container">
+<div class="row__container">
+  <div><strong>12</strong></div>
+  <div>Heart attack avoided over 5&nbsp;years &#8211; statin</div>
+</div>
+<div class="row__container"><div>n/a</div><div>Not a number</div></div>
+<div class="row__container"><div>45</div><div>Stroke avoided</div></div>
+</div>
+<!-- create info container but with % --><div class="pct">3%</div>
+</article>
+<article class="ben_har ben_har_B card"><h2>Harms</h2>
+<div class="info__container">
+<div class="row__container"><div>50</div><div>Muscle damage — mild</div></div>
+</div>
+<!-- create info container but with % -->
+</article></body></html>"""
+
+
+def test_regex_path_extracts_numeric_rows_per_label():
+    rows = extract_benefit_harm_rows(PAGE)
+    assert [row["nnt_value"] for row in rows["A"]] == [12, 45]
+    assert rows["A"][0]["outcome_text"] == "Heart attack avoided over 5 years - statin"
+    assert rows["B"] == [{"nnt_value": 50, "outcome_text": "Muscle damage - mild"}]
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, len(PAGE)])
+def test_streaming_parser_matches_regex_path_for_any_chunking(chunk):
+    chunks = (PAGE[start : start + chunk] for start in range(0, len(PAGE), chunk))
+    assert extract_page_rows(chunks) == extract_benefit_harm_rows(PAGE)
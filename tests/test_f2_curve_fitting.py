@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis import f2_curve_fitting as f2
+
+
+def _linear_data(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.sort(rng.uniform(1950, 2020, n))
+    y = 30.0 - 0.012 * x + rng.normal(0, 0.2, n)
+    return x, y
+
+
+def _domains_frame(per_domain=12):
+    frames = []
+    for offset, domain in enumerate(("B", "A")):
+        x, y = _linear_data(n=per_domain, seed=offset)
+        frames.append(pd.DataFrame({"Domain": domain, "year": x, "log10_ESP": y + offset}))
+    return pd.concat(frames, ignore_index=True).astype({"Domain": "category"})
+
+
+def test_bootstrap_ci_is_reproducible_and_independent_of_chunking():
+    x, y = _linear_data()
+    whole = f2._bootstrap_linear_ci(x, y, rng=np.random.default_rng(7))
+    chunked = f2._bootstrap_linear_ci(x, y, chunk_size=3 * len(x), rng=np.random.default_rng(7))
+    assert whole == chunked
+    assert f2._bootstrap_linear_ci(x, y, rng=np.random.default_rng(8)) != whole
+
+
+def test_bootstrap_ci_matches_per_replicate_refits():
+    x, y = _linear_data(n=25)
+    n_boot = 60
+    low, high = f2._bootstrap_linear_ci(x, y, n_boot=n_boot, rng=np.random.default_rng(3))
+    idx = np.random.default_rng(3).integers(0, len(x), (n_boot, len(x)))
+    refits = np.array([np.polyfit(x[row], y[row], 1)[::-1] for row in idx])
+    np.testing.assert_allclose(
+        [low["intercept"], low["slope"]], np.percentile(refits, 2.5, axis=0), rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        [high["intercept"], high["slope"]], np.percentile(refits, 97.5, axis=0), rtol=1e-6
+    )
+
+
+def test_bootstrap_ci_brackets_the_fit():
+    x, y = _linear_data()
+    fit = f2.fit_exponential("Test", x, y, rng=np.random.default_rng(1))
+    for name, value in fit.params.items():
+        assert fit.param_ci_low[name] < value < fit.param_ci_high[name]
+
+
+def test_bootstrap_ci_without_spread_is_nan():
+    x = np.full(6, 2000.0)
+    low, high = f2._bootstrap_linear_ci(x, np.arange(6.0), n_boot=20, rng=np.random.default_rng(0))
+    assert all(np.isnan(value) for value in (*low.values(), *high.values()))
+
+
+@pytest.mark.parametrize("domain, model", [("Medicine", "exponential"), ("Breeding", "wright")])
+def test_task_rng_is_stable_per_task(domain, model):
+    first = f2._task_rng(domain, model).integers(0, 2**32, 4)
+    assert np.array_equal(first, f2._task_rng(domain, model).integers(0, 2**32, 4))
+    assert not np.array_equal(first, f2._task_rng(domain, model + "_other").integers(0, 2**32, 4))
+
+
+def test_fits_do_not_depend_on_worker_count():
+    df = _domains_frame()
+    serial = f2.fit_all_domains(df, workers=1)
+    assert [(fit.domain, fit.model) for fit in serial[:2]] == [("A", "exponential"), ("A", "wright")]
+    expected = f2._results_to_frame(serial)
+    pd.testing.assert_frame_equal(f2._results_to_frame(f2.fit_all_domains(df, workers=2)), expected)
+    pd.testing.assert_frame_equal(f2._results_to_frame(f2.fit_all_domains(df)), expected)
+
+
+def test_small_datasets_fit_serially_by_default(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(f2, "ProcessPoolExecutor", no_pool)
+    df = _domains_frame()
+    assert len(df) < f2.PARALLEL_MIN_ROWS
+    assert f2.fit_all_domains(df)
+    with pytest.raises(AssertionError, match="process pool"):
+        f2.fit_all_domains(df, workers=2)
+
+
+def _logistic_data(x0=1985.0, k=0.05, l_max=6.0, seed=0):
+    x = np.linspace(1950, 2020, 60)
+    noise = np.random.default_rng(seed).normal(0, 0.01, len(x))
+    return x, l_max / (1 + np.exp(k * (x - x0))) * (1 + noise)
+
+
+def test_logistic_fit_recovers_parameters_with_bounded_ci():
+    x, y = _logistic_data()
+    fit = f2.fit_logistic("Test", x, y)
+    truth = {"l_max": 6.0, "k": 0.05, "x0": 1985.0}
+    for name, value in truth.items():
+        assert fit.param_ci_low[name] <= value <= fit.param_ci_high[name]
+        assert fit.params[name] == pytest.approx(value, rel=0.05)
+    assert fit.param_ci_low["k"] >= f2.LOGISTIC_K_BOUNDS[0]
+    assert "CIs not reported" not in fit.notes
+
+
+def test_logistic_fit_without_inflection_in_range_is_flagged():
+    x, y = _logistic_data(x0=1900.0, k=0.03)
+    fit = f2.fit_logistic("Test", x, y)
+    assert not x.min() < fit.params["x0"] < x.max()
+    assert "no inflection in range" in fit.notes
+    assert all(np.isnan(value) for value in (*fit.param_ci_low.values(), *fit.param_ci_high.values()))
+
+
+def test_logistic_fit_rejects_negative_values():
+    x, y = _logistic_data()
+    assert f2.fit_logistic("Test", x, y - 10) is None
+
+
+def _segment_sse(x, y):
+    coef = np.polyfit(x, y, 1)
+    return float(np.sum((y - np.polyval(coef, x)) ** 2))
+
+
+def test_two_segment_breakpoint_matches_brute_force():
+    x, y = _linear_data(n=30, seed=4)
+    y = np.where(x < 1990, y, y + 0.03 * (x - 1990))
+    fit = f2.fit_piecewise("Test", x, y, min_points=3)
+    splits = range(3, len(x) - 2)
+    best = min(splits, key=lambda split: _segment_sse(x[:split], y[:split]) + _segment_sse(x[split:], y[split:]))
+    assert fit.params["breakpoint"] == x[best]
+    sse = _segment_sse(x[:best], y[:best]) + _segment_sse(x[best:], y[best:])
+    assert fit.aic == pytest.approx(f2._aic_bic_from_sse(sse, len(x), 4)[0])
+
+
+def test_three_segment_fit_finds_known_breakpoints():
+    x = np.arange(1960.0, 2020.0)
+    segments = [x < 1980, (x >= 1980) & (x < 2000), x >= 2000]
+    lines = [lambda t: 5 - 0.05 * (t - 1960), lambda t: 3 + 0.02 * (t - 1980), lambda t: 5 - 0.1 * (t - 2000)]
+    y = np.piecewise(x, segments, lines)
+    fit = f2.fit_piecewise("Test", x, y, n_segments=3)
+    assert fit.model == "piecewise_exponential_3seg"
+    assert (fit.params["breakpoint_1"], fit.params["breakpoint_2"]) == (1980.0, 2000.0)
+    slopes = [fit.params[f"segment{idx}_slope"] for idx in (1, 2, 3)]
+    np.testing.assert_allclose(slopes, [-0.05, 0.02, -0.1], atol=1e-9)
+
+
+def test_piecewise_respects_min_points_and_rejects_one_segment():
+    x, y = _linear_data(n=5)
+    assert f2.fit_piecewise("Test", x, y, min_points=3) is None
+    with pytest.raises(ValueError, match="at least 2"):
+        f2.fit_piecewise("Test", x, y, n_segments=1)
+
+
+def test_hierarchical_ess_rate_counts_sampling_before_a_resume(tmp_path):
+    df = _domains_frame(per_domain=15).assign(Quality_score=3)
+    kwargs = dict(n_steps=200, n_ensembles=2, workers=1, checkpoint_dir=tmp_path)
+    fits, first = f2.fit_hierarchical(df, **kwargs)
+    assert [fit.domain for fit in fits] == ["A", "B", "All domains"]
+    # Every checkpoint is complete, so the second call samples nothing new.
+    _, resumed = f2.fit_hierarchical(df, **kwargs)
+    pd.testing.assert_series_equal(resumed["ess"], first["ess"])
+    np.testing.assert_allclose(resumed["ess_per_second"], first["ess_per_second"], rtol=0.2)
@@ -0,0 +1,39 @@
+import json
+import threading
+
+import numpy as np
+
+from src.utils.fit_store import FitStore, dataset_hash, get_fit_store
+
+
+def test_records_are_keyed_by_data_and_code_version(tmp_path):
+    path = tmp_path / "fits.json"
+    key = dataset_hash(np.arange(3.0), np.ones(3))
+    store = FitStore(path, code_version="v1")
+    store.put("Medicine", "exponential", key, {"slope": np.float64(-0.1), "ci": float("nan")})
+    store.save()
+
+    assert FitStore(path, code_version="v1").get("Medicine", "exponential", key) == {"slope": -0.1, "ci": None}
+    assert FitStore(path, code_version="v2").get("Medicine", "exponential", key) is None
+    assert FitStore(path, code_version="v1").get("Medicine", "exponential", "other") is None
+
+
+def test_concurrent_puts_and_saves_leave_a_complete_file(tmp_path):
+    path = tmp_path / "fits.json"
+    store = get_fit_store(path, "v1")
+    assert get_fit_store(path, "v1") is store
+
+    def work(domain):
+        for step in range(50):
+            store.put(domain, "exponential", str(step), {"step": step})
+            store.save()
+
+    threads = [threading.Thread(target=work, args=(f"D{index}",)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = json.loads(path.read_text())
+    assert sorted(records) == [f"D{index}|exponential|v1|49" for index in range(8)]
+    assert [p.name for p in tmp_path.iterdir()] == ["fits.json"]
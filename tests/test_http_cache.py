@@ -0,0 +1,23 @@
+from src.utils.http_cache import CachedFetcher, CachedResponse
+
+URL = "https://example.org/page"
+
+
+def _response(body):
+    return CachedResponse(url=URL, status=200, body=body, etag='"v1"', last_modified=None, from_cache=False)
+
+
+def test_cache_entry_round_trip_leaves_no_temporary_files(tmp_path):
+    fetcher = CachedFetcher(tmp_path, offline=True)
+    fetcher._write_cache(_response(b"first"))
+    fetcher._write_cache(_response(b"second"))
+    assert fetcher.fetch(URL).body == b"second"
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".body", ".json"]
+
+
+def test_body_not_matching_meta_is_a_cache_miss(tmp_path):
+    fetcher = CachedFetcher(tmp_path, offline=True)
+    fetcher._write_cache(_response(b"complete body"))
+    body_path, _ = fetcher._paths(URL)
+    body_path.write_bytes(b"complete")
+    assert fetcher._read_cache(URL) is None
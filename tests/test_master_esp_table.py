@@ -0,0 +1,88 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.analysis import master_esp_table as master
+
+
+def _assignment(domain, pattern, level, score):
+    return {
+        "domain": domain,
+        "pattern": re.compile(pattern),
+        "pcs_level": level,
+        "pcs_score": float(score),
+        "pcs_method": "rubric",
+        "pcs_notes": f"{domain} {pattern}",
+    }
+
+
+ASSIGNMENTS = [
+    _assignment("Evolution", "^Major transition:", 7, 64),
+    _assignment("Medicine", "oncology", 2, 2),
+    _assignment("*", "wheat", 3, 4),
+    _assignment("Breeding", ".*", 1, 1),
+]
+
+
+def _reference_match(domain, subdomain):
+    for position, assignment in enumerate(ASSIGNMENTS):
+        domain_ok = assignment["domain"] in master._ANY_DOMAIN or assignment["domain"] == domain
+        if domain_ok and assignment["pattern"].search(subdomain):
+            return position
+    return -1
+
+
+def test_pair_matching_is_first_match_in_priority_order():
+    pairs = pd.DataFrame(
+        {
+            "Domain": ["Evolution", "Breeding", "Breeding", "Medicine", "Medicine", "Domestication", "Evolution"],
+            "Subdomain": [
+                "Major transition: Sex",
+                "CIMMYT wheat",
+                "CIMMYT maize",
+                "oncology (wheat allergy)",
+                "cardiology",
+                "Domestication: wheat",
+                "Mutation rate baseline: E. coli",
+            ],
+        }
+    )
+    matched = master._match_pcs_pairs(pairs, ASSIGNMENTS)
+    assert matched.tolist() == [0, 2, 3, 1, -1, 2, -1]
+    assert matched.tolist() == [_reference_match(*pair) for pair in pairs.itertuples(index=False)]
+
+
+def test_assignments_are_gathered_back_to_every_row(monkeypatch):
+    monkeypatch.setattr(master, "_load_pcs_assignments", lambda: ASSIGNMENTS)
+    df = pd.DataFrame(
+        {
+            "Domain": ["Evolution", "Medicine", "Evolution", "Breeding"],
+            "Subdomain": ["Major transition: Sex", "cardiology", "Major transition: Sex", "CIMMYT wheat"],
+            "ESP": [6400.0, 20.0, 128.0, 1000.0],
+        },
+        index=[10, 11, 12, 13],
+    )
+    out = master._apply_pcs_assignments(df)
+    assert list(out.index) == [10, 11, 12, 13]
+    assert out["PCS_level"].tolist() == [7, pd.NA, 7, 3]
+    np.testing.assert_array_equal(out["ESP_normalized"], [100.0, np.nan, 2.0, 250.0])
+    np.testing.assert_allclose(out["log10_ESP_normalized"], np.log10([100.0, np.nan, 2.0, 250.0]))
+    assert out["PCS_notes"].iloc[1] is None
+
+
+def test_incremental_build_reuses_parquet_fragments(tmp_path, monkeypatch):
+    full = master.build_master_table(samples=50)
+    (tmp_path / "e_medicine-0000000000000000.pkl").write_bytes(b"stale")
+    first = master.build_master_table(incremental=True, cache_dir=tmp_path, samples=50)
+    pd.testing.assert_frame_equal(first, full, check_exact=True)
+    fragments = sorted(path.name for path in tmp_path.iterdir())
+    assert len(fragments) == len(master.DOMAIN_BLOCKS)
+    assert all(name.endswith(".parquet") for name in fragments)
+
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("block rebuilt")
+
+    monkeypatch.setattr(master, "_build_block", no_rebuild)
+    second = master.build_master_table(incremental=True, cache_dir=tmp_path, samples=50)
+    pd.testing.assert_frame_equal(second, full, check_exact=True)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.utils.master_index import Bitmap, MasterIndex
+from src.utils.master_table_io import read_master_table
+
+
+@pytest.mark.parametrize("n_rows", [0, 1, 9, 1000, 50_000])
+@pytest.mark.parametrize("density", [0.001, 0.3, 0.9])
+def test_bitmap_matches_mask(n_rows, density):
+    rng = np.random.default_rng(n_rows)
+    mask = rng.random(n_rows) < density
+    bitmap = Bitmap.from_mask(mask)
+    rows = np.flatnonzero(mask)
+    assert np.array_equal(bitmap.rows(), rows)
+    assert np.array_equal(Bitmap.from_rows(rng.permutation(rows), n_rows).bits, bitmap.bits)
+    assert np.array_equal(bitmap.contains(np.arange(n_rows)), mask)
+    assert np.array_equal((~bitmap).rows(), np.flatnonzero(~mask))
+
+
+def test_select_matches_bitmap_combination():
+    master = read_master_table()
+    df = master.iloc[np.random.default_rng(0).integers(0, len(master), 20_000)].reset_index(drop=True)
+    index = MasterIndex.build(df)
+    for criteria in (
+        {"Domain": "Medicine"},
+        {"Domain": "Medicine", "Quality_score": [4, 5], "year_ce": (2000, None)},
+        {"year_ce": (2020, 2021), "Domain": "Medicine", "Quality_score": 4},
+        {"year_ce": (2020, 2022), "years_bp": (0, 10)},
+        {"Domain": ["Breeding", "Evolution"], "years_bp": None},
+        {"Domain": "missing", "year_ce": None},
+    ):
+        assert np.array_equal(index.select(**criteria), index.where(**criteria).rows()), criteria
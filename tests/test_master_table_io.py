@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.f2_curve_fitting import _prepare_dataset
+from src.utils.master_table_io import (
+    DERIVED_COLUMNS,
+    ESP_OVERRIDE_COLUMN,
+    compact_master_table,
+    expand_master_table,
+    read_master_table,
+)
+
+
+def test_compact_round_trip_is_lossless():
+    typed = read_master_table()
+    compact = compact_master_table(typed)
+    assert not {"ESP", *DERIVED_COLUMNS} & set(compact.columns)
+    override = compact[ESP_OVERRIDE_COLUMN]
+    assert isinstance(override.dtype, pd.SparseDtype)
+    # Overrides are stored only where 10 ** log10_ESP misses the exact ESP.
+    stored = override.notna().to_numpy()
+    np.testing.assert_array_equal(stored, 10.0 ** typed["log10_ESP"].to_numpy() != typed["ESP"].to_numpy())
+    assert 0 < stored.sum() < len(typed)
+    expanded = expand_master_table(compact)
+    pd.testing.assert_frame_equal(expanded, typed, check_exact=True)
+    for column in ("ESP", *DERIVED_COLUMNS):
+        assert expanded[column].to_numpy().tobytes() == typed[column].to_numpy().tobytes()
+
+
+def test_compact_keeps_columns_it_cannot_reproduce():
+    typed = read_master_table()
+    typed.loc[typed.index[0], "ESP_normalized"] = np.nextafter(typed["ESP_normalized"].iloc[0], np.inf)
+    compact = compact_master_table(typed)
+    assert "ESP_normalized" in compact.columns
+    assert "log10_ESP_normalized" not in compact.columns
+    pd.testing.assert_frame_equal(expand_master_table(compact), typed, check_exact=True)
+
+
+def test_compact_keeps_esp_when_a_missing_value_cannot_be_restored():
+    typed = read_master_table()
+    typed.loc[typed.index[0], "ESP"] = np.nan
+    compact = compact_master_table(typed)
+    assert "ESP" in compact.columns and ESP_OVERRIDE_COLUMN not in compact.columns
+    pd.testing.assert_frame_equal(expand_master_table(compact), typed, check_exact=True)
+
+
+def test_analysis_dataset_accepts_the_compact_layout():
+    typed = read_master_table()
+    compact = read_master_table(compact=True)
+    pd.testing.assert_frame_equal(_prepare_dataset(compact), _prepare_dataset(typed), check_exact=True)
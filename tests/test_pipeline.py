@@ -0,0 +1,38 @@
+from src.pipeline import (
+    BUILD_STAGES,
+    FIT_STAGE,
+    MASTER_STAGE,
+    PLOT_STAGE,
+    ROOT,
+    STAGES,
+    VALIDATE_STAGE,
+    final_outputs,
+    stage_dependencies,
+)
+from src.utils.validate_outputs import REQUIRED_COLUMNS
+
+
+def test_stage_sources_include_shared_utils():
+    def names(stage):
+        return {path.relative_to(ROOT).as_posix() for path in STAGES[stage].sources}
+
+    assert {"src/analysis/c2_cimmyt_esp.py", "src/utils/esp_kernel.py", "src/utils/artifacts.py"} <= names("c2")
+    assert {"src/utils/summaries.py"} <= names("e1")
+    assert {"src/utils/esp_uncertainty.py", "src/utils/master_table_io.py"} <= names("master")
+    assert {"src/utils/time_periods.py", "src/utils/fit_store.py"} <= names("fit")
+
+
+def test_every_e1_table_is_declared_and_final():
+    outputs = set(STAGES["e1"].outputs)
+    assert "results/tables/tbl_e1_nnt_summary_by_area_time.csv" in outputs
+    assert outputs <= final_outputs(BUILD_STAGES)
+
+
+def test_validate_runs_after_the_tables_it_checks():
+    stages = [*BUILD_STAGES, MASTER_STAGE, FIT_STAGE, PLOT_STAGE, VALIDATE_STAGE]
+    assert {"master", "fit", "e1"} <= stage_dependencies(stages)["validate"]
+    assert set(REQUIRED_COLUMNS) <= set(VALIDATE_STAGE.inputs)
+    # Validation checks files on disk, so its reads do not keep tables in memory.
+    final = final_outputs(stages)
+    assert set(FIT_STAGE.outputs) <= final
+    assert "data/master_esp_table.csv" not in final
@@ -0,0 +1,63 @@
+import json
+import threading
+from http.client import HTTPConnection
+
+import pandas as pd
+import pytest
+
+from src.utils.query_service import QueryEngine, make_server
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = tmp_path / "fits.csv"
+    pd.DataFrame(
+        {
+            "domain": ["Medicine", "Medicine", "Breeding"],
+            "model": ["exponential", "logistic", "exponential"],
+            "notes": ["", "", ""],
+            "n": [10, 10, 6],
+            "half_life_years": [-190.8, 12.5, -40.0],
+        }
+    ).to_csv(path, index=False)
+    engine = QueryEngine(sources={"fits": (path,)})
+    httpd = make_server(engine, port=0, quiet=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield engine, httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(httpd, path):
+    connection = HTTPConnection(*httpd.server_address, timeout=10)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_numeric_statistic_on_text_column_is_bad_request(server):
+    _, httpd = server
+    for statistic in ("median", "mean", "sum", "min"):
+        status, body = _get(httpd, f"/aggregate/fits?by=domain&metrics=model:{statistic}")
+        assert status == 400
+        assert "numeric" in body["error"]
+    status, body = _get(httpd, "/aggregate/fits?by=domain&metrics=model:nunique,half_life_years:median")
+    assert status == 200
+    assert [group["model_nunique"] for group in body["groups"]] == [1, 2]
+
+
+def test_internal_error_is_server_error(server, monkeypatch):
+    engine, httpd = server
+
+    def broken(df, params):
+        raise KeyError("half_life_years")
+
+    monkeypatch.setattr(engine, "aggregate", broken)
+    status, body = _get(httpd, "/aggregate/fits?metrics=half_life_years:median")
+    assert status == 500
+    assert body == {"error": "internal error: KeyError"}
+    assert _get(httpd, "/aggregate/missing?metrics=n:sum")[0] == 404
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.summaries import GroupSpec, summarize
+
+
+def _frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    area = rng.choice(["Cardiology", "Oncology", "Neurology", None], n)
+    return pd.DataFrame(
+        {
+            "area": area,
+            "bucket": rng.choice(["short", "long"], n),
+            "intervention": rng.choice(list("abcdefg"), n),
+            "nnt": np.where(rng.random(n) < 0.1, np.nan, rng.lognormal(3, 1, n)),
+        }
+    )
+
+
+STATS = {
+    "n": ("nnt", "count"),
+    "nnt_sum": ("nnt", "sum"),
+    "nnt_mean": ("nnt", "mean"),
+    "nnt_median": ("nnt", "median"),
+    "nnt_min": ("nnt", "min"),
+    "nnt_max": ("nnt", "max"),
+    "n_interventions": ("intervention", "nunique"),
+}
+
+
+def test_tables_match_groupby_agg_up_to_summation_order():
+    df = _frame()
+    specs = [
+        GroupSpec("area", ["area"], STATS, require=["nnt"]),
+        GroupSpec("area_bucket", ["area", "bucket"], STATS, require=["nnt"], dropna=False),
+    ]
+    tables = summarize(df, specs)
+    assert list(tables) == ["area", "area_bucket"]
+    for spec in specs:
+        expected = (
+            df.dropna(subset=["nnt"])
+            .groupby(list(spec.keys), dropna=spec.dropna)
+            .agg(**spec.stats)
+            .reset_index()
+        )
+        pd.testing.assert_frame_equal(tables[spec.name], expected, check_dtype=False, rtol=1e-12)
+
+
+def test_rounding_is_applied_per_output_column():
+    df = _frame(n=50, seed=1)
+    spec = GroupSpec("area", ["area"], {"nnt_mean": ("nnt", "mean")}, require=["nnt"], round={"nnt_mean": 2})
+    means = summarize(df, [spec])["area"]["nnt_mean"].to_numpy()
+    np.testing.assert_array_equal(means, np.round(means, 2))
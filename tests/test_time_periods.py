@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.time_periods import BP_REFERENCE_YEAR, parse_time_period, parse_time_periods
+
+
+@pytest.mark.parametrize(
+    "text, year_ce, uncertainty",
+    [
+        ("1998", 1998.0, 0.0),
+        ("1966-2000", 1983.0, 17.0),
+        ("10500 BP", BP_REFERENCE_YEAR - 10_500, 0.0),
+        ("27-40 kya", BP_REFERENCE_YEAR - 33_500, 6_500.0),
+        ("~150-100 Ma", BP_REFERENCE_YEAR - 125e6, 25e6),
+        ("~0.2-0.05 Ma", BP_REFERENCE_YEAR - 125_000, 75_000.0),
+        ("~4.0-3.5 Ga", BP_REFERENCE_YEAR - 3.75e9, 0.25e9),
+        ("ca. 2.1 Gya", BP_REFERENCE_YEAR - 2.1e9, 0.0),
+        ("Phase 3 trial (2019)", 2019.0, 0.0),
+    ],
+)
+def test_parses_calendar_and_deep_time_units(text, year_ce, uncertainty):
+    parsed = parse_time_periods([text]).iloc[0]
+    assert parsed["year_ce"] == pytest.approx(year_ce)
+    assert parsed["year_uncertainty"] == pytest.approx(uncertainty)
+    assert parsed["years_bp"] == pytest.approx(BP_REFERENCE_YEAR - year_ce)
+    assert parse_time_period(text) == pytest.approx(year_ce)
+
+
+@pytest.mark.parametrize("value", ["modern", "Unknown", "", "no date", None, np.nan, 1998])
+def test_unparseable_values_are_missing(value):
+    assert np.isnan(parse_time_periods([value])["year_ce"].iloc[0])
+    assert parse_time_period(value) is None
+
+
+def test_vectorized_parse_matches_scalar_parse_and_keeps_index():
+    values = pd.Series(["1998", "27-40 kya", None, "1998", "~1.8-1.2 Ga", "modern"], index=list("abcdef"))
+    parsed = parse_time_periods(values, present_year=2000.0)
+    assert list(parsed.columns) == ["year_ce", "years_bp", "year_uncertainty"]
+    assert list(parsed.index) == list("abcdef")
+    expected = [parse_time_period(value, present_year=2000.0) for value in values]
+    assert parsed["year_ce"].tolist() == pytest.approx([np.nan if v is None else v for v in expected], nan_ok=True)
@@ -0,0 +1,25 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from src.utils import tracing
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RSS is read from /proc")
+def test_span_records_rss_around_the_block(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_DIR", tmp_path)
+    with tracing.Span("alloc") as current:
+        block = np.ones(64 * 2**20 // 8)
+        current.rows = len(block)
+    with tracing.Span("idle"):
+        pass
+    (path,) = tmp_path.glob("trace-*.jsonl")
+    alloc, idle = (json.loads(line) for line in path.read_text().splitlines())
+    assert list(alloc) == tracing.TRACE_COLUMNS
+    assert alloc["rss_end_mb"] - alloc["rss_start_mb"] > 32
+    assert abs(idle["rss_end_mb"] - idle["rss_start_mb"]) < 32
+    # The kernel updates the high-water mark lazily, so it can trail statm by a few pages.
+    assert idle["process_peak_rss_mb"] > alloc["rss_start_mb"] + 32
+    assert alloc["rows"] == len(block)